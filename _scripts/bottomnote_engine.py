@@ -0,0 +1,249 @@
+"""
+Bottomnote engine for all 48 lessons.
+
+Inserts or updates \\bottomnote{} calls from per-lesson JSON tables in
+_scripts/bottomnotes/ (one file per lesson, frame title -> note). Each
+lesson is parsed once with frame_model, all edits are applied in that
+single pass, and the \\bottomnote command definition is added if the
+preamble lacks it. Lessons are processed in parallel worker processes.
+
+Runs are idempotent: the SHA-256 of each lesson and its table after the
+last run is kept in .bottomnote_state.json, so an unchanged lesson costs
+one hash comparison.
+
+Replaces the per-module scanners (add_bottomnotes_module01.py,
+add_bottomnotes_all_modules.py, add_bottomnotes_to_frames.py,
+customize_module03_bottomnotes.py).
+
+Usage:
+    python _scripts/bottomnote_engine.py                # Apply tables to all lessons
+    python _scripts/bottomnote_engine.py --dry-run      # Report changes only
+    python _scripts/bottomnote_engine.py --export       # Write tables from current lessons
+    python _scripts/bottomnote_engine.py --module module_03_ai_ml
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from frame_model import BOTTOMNOTE, parse_frames
+
+
+PROJECT_DIR = Path(__file__).parent.parent
+TABLE_DIR = Path(__file__).parent / 'bottomnotes'
+STATE_FILE = Path(__file__).parent / '.bottomnote_state.json'
+MODULE_DIRS = [
+    PROJECT_DIR / 'module_01_fintech',
+    PROJECT_DIR / 'module_02_blockchain',
+    PROJECT_DIR / 'module_03_ai_ml',
+    PROJECT_DIR / 'module_04_traditional',
+]
+
+# Template bottomnote command (from template_beamer_final.tex)
+BOTTOMNOTE_COMMAND = r'''% Bottom note command for key takeaways
+\newcommand{\bottomnote}[1]{%
+\vfill
+\vspace{-2mm}
+\textcolor{mllavender2}{\rule{\textwidth}{0.4pt}}
+\vspace{1mm}
+\footnotesize
+\textbf{#1}
+}
+'''
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def table_path(tex_path):
+    return TABLE_DIR / f'{tex_path.stem}.json'
+
+
+def frame_keys(frames):
+    """Table key per frame: the title, with ' [n]' for repeated titles."""
+    seen = {}
+    keys = []
+    for frame in frames:
+        title = frame.title.strip()
+        seen[title] = seen.get(title, 0) + 1
+        keys.append(title if seen[title] == 1 else f'{title} [{seen[title]}]')
+    return keys
+
+
+def has_bottomnote_command(content):
+    return r'\newcommand{\bottomnote}' in content
+
+
+def apply_table(content, notes):
+    """Return (new_content, inserted, updated) for one lesson."""
+    lines = content.split('\n')
+    frames = parse_frames(content)
+    inserted = updated = 0
+    edits = []   # (line index, operation, text) applied bottom-up
+
+    for frame, key in zip(frames, frame_keys(frames)):
+        note = notes.get(key)
+        if note is None:
+            continue
+        new_line = f'\\bottomnote{{{note}}}'
+
+        existing = [n - 1 for n, text in frame.lines if BOTTOMNOTE.search(text)]
+        if existing:
+            # Keep the last bottomnote, drop duplicates left by earlier scripts
+            stale = existing[:-1]
+            if stale or lines[existing[-1]].strip() != new_line:
+                edits.append((existing[-1], 'replace', new_line))
+                edits.extend((i, 'delete', None) for i in stale)
+                updated += 1
+        else:
+            edits.append((frame.end - 1, 'insert', new_line))
+            inserted += 1
+
+    for index, operation, text in sorted(edits, key=lambda e: e[0], reverse=True):
+        if operation == 'replace':
+            lines[index] = text
+        elif operation == 'delete':
+            del lines[index]
+        else:
+            lines.insert(index, text)
+
+    content = '\n'.join(lines)
+    if inserted and not has_bottomnote_command(content):
+        content = re.sub(r'\n(\\title\{)', lambda m: '\n' + BOTTOMNOTE_COMMAND + m.group(1),
+                         content, count=1)
+
+    return content, inserted, updated
+
+
+def process_lesson(job):
+    """Apply one lesson's table. Runs in a worker process."""
+    tex_path, table_file, state, dry_run = job
+    result = {'lesson': tex_path, 'status': 'unchanged', 'inserted': 0, 'updated': 0}
+
+    if not table_file.exists():
+        result['status'] = 'no table'
+        return result
+
+    source = tex_path.read_bytes()
+    table = table_file.read_bytes()
+    source_hash, table_hash = sha256(source), sha256(table)
+    if state == {'source': source_hash, 'table': table_hash}:
+        result['status'] = 'cached'
+        result['state'] = state
+        return result
+
+    notes = json.loads(table).get('notes', {})
+    content = source.decode('utf-8')
+    new_content, inserted, updated = apply_table(content, notes)
+    result.update(inserted=inserted, updated=updated)
+
+    if new_content != content:
+        result['status'] = 'would change' if dry_run else 'changed'
+        if not dry_run:
+            data = new_content.encode('utf-8')
+            tex_path.write_bytes(data)
+            source_hash = sha256(data)
+
+    if not dry_run or new_content == content:
+        result['state'] = {'source': source_hash, 'table': table_hash}
+    return result
+
+
+def export_tables(lessons):
+    """Write one table per lesson from the bottomnotes currently in the source."""
+    TABLE_DIR.mkdir(exist_ok=True)
+    total = 0
+    for tex_path in lessons:
+        frames = parse_frames(tex_path.read_text(encoding='utf-8'))
+        notes = {key: frame.bottomnote
+                 for frame, key in zip(frames, frame_keys(frames))
+                 if frame.bottomnote is not None}
+        table = {'lesson': tex_path.stem, 'module': tex_path.parent.name, 'notes': notes}
+        with open(table_path(tex_path), 'w', encoding='utf-8', newline='\n') as f:
+            json.dump(table, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        total += len(notes)
+        print(f"  {tex_path.name}: {len(notes)} notes")
+    return total
+
+
+def find_lessons(module_filter=None):
+    lessons = []
+    for module_dir in MODULE_DIRS:
+        if module_filter and module_dir.name != module_filter:
+            continue
+        lessons.extend(sorted(module_dir.glob('lesson_*.tex')))
+    return lessons
+
+
+def load_state():
+    if STATE_FILE.exists():
+        with open(STATE_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Insert or update bottomnotes from lesson tables')
+    parser.add_argument('--module', type=str, help='Process a specific module only')
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without writing')
+    parser.add_argument('--export', action='store_true',
+                        help='Write tables from the bottomnotes currently in the lessons')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: CPUs)')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("BOTTOMNOTE ENGINE")
+    print("=" * 70)
+
+    lessons = find_lessons(args.module)
+
+    if args.export:
+        total = export_tables(lessons)
+        print(f"\nExported {total} bottomnotes to {TABLE_DIR.relative_to(PROJECT_DIR)}/")
+        return
+
+    state = load_state()
+    jobs = []
+    for tex_path in lessons:
+        rel = tex_path.relative_to(PROJECT_DIR).as_posix()
+        jobs.append((tex_path, table_path(tex_path), state.get(rel), args.dry_run))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(process_lesson, jobs))
+    elapsed = time.perf_counter() - start
+
+    totals = {'inserted': 0, 'updated': 0}
+    for result in results:
+        rel = result['lesson'].relative_to(PROJECT_DIR).as_posix()
+        if 'state' in result:
+            state[rel] = result['state']
+        totals['inserted'] += result['inserted']
+        totals['updated'] += result['updated']
+        if result['status'] in ('changed', 'would change', 'no table'):
+            detail = f"{result['inserted']} inserted, {result['updated']} updated"
+            print(f"  [{result['status'].upper()}] {result['lesson'].name}: {detail}")
+
+    if not args.dry_run:
+        with open(STATE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=1, sort_keys=True)
+
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+
+    print("\n" + "=" * 70)
+    print(f"Lessons: {len(results)} ({', '.join(f'{v} {k}' for k, v in sorted(counts.items()))})")
+    print(f"Bottomnotes inserted: {totals['inserted']}, updated: {totals['updated']}")
+    print(f"Duration: {elapsed * 1000:.0f} ms")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+Chart registry: page geometry and file size for every figure PDF.
+
+Entries are cached in chart_registry.json next to this script and are
+re-read only when a PDF's size or mtime changes, so layout tools
+(predict_overflow.py, width fixers) can query aspect ratios cheaply.
+
+Usage:
+    python _scripts/chart_registry.py               # Refresh and summarize
+    python _scripts/chart_registry.py --rebuild     # Ignore the cache
+    python _scripts/chart_registry.py --show module_04_traditional/figures/order_book/order_book.pdf
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+from pdf_geometry import PdfGeometryError, read_geometry
+
+
+PROJECT_DIR = Path(__file__).parent.parent
+REGISTRY_FILE = Path(__file__).parent / 'chart_registry.json'
+CHART_GLOBS = [
+    'module_*/figures/*.pdf',
+    'module_*/figures/*/*.pdf',
+    'module_*/charts/*/*.pdf',
+    'charts/module_*/*/*.pdf',
+]
+
+_registry = None
+
+
+def discover_chart_pdfs():
+    """List all figure PDFs as project-relative POSIX paths."""
+    found = set()
+    for pattern in CHART_GLOBS:
+        for path in PROJECT_DIR.glob(pattern):
+            found.add(path.relative_to(PROJECT_DIR).as_posix())
+    return sorted(found)
+
+
+def _geometry_entry(path):
+    geometry = read_geometry(path)
+    return {
+        'size': geometry.file_size,
+        'width_pt': round(geometry.width_pt, 3),
+        'height_pt': round(geometry.height_pt, 3),
+        'aspect': round(geometry.aspect, 5),
+        'media_box': list(geometry.media_box),
+        'crop_box': list(geometry.crop_box),
+        'pages': geometry.pages,
+    }
+
+
+def _entry(rel_path, stat):
+    entry = _geometry_entry(PROJECT_DIR / rel_path)
+    entry['size'] = stat.st_size
+    entry['mtime_ns'] = stat.st_mtime_ns
+    return entry
+
+
+def refresh_registry(rebuild=False):
+    """Update the cached registry, re-reading only changed PDFs.
+
+    Returns (registry, stats) where stats counts reused, read, removed and
+    unreadable entries.
+    """
+    cached = {}
+    if REGISTRY_FILE.exists() and not rebuild:
+        with open(REGISTRY_FILE, encoding='utf-8') as f:
+            cached = json.load(f)
+
+    registry = {}
+    stats = {'reused': 0, 'read': 0, 'removed': 0, 'errors': []}
+
+    for rel_path in discover_chart_pdfs():
+        stat = os.stat(PROJECT_DIR / rel_path)
+        old = cached.get(rel_path)
+        if old and old['size'] == stat.st_size and old['mtime_ns'] == stat.st_mtime_ns:
+            registry[rel_path] = old
+            stats['reused'] += 1
+            continue
+        try:
+            registry[rel_path] = _entry(rel_path, stat)
+            stats['read'] += 1
+        except (OSError, PdfGeometryError) as e:
+            stats['errors'].append((rel_path, str(e)))
+
+    stats['removed'] = len(set(cached) - set(registry))
+
+    if registry != cached:
+        with open(REGISTRY_FILE, 'w', encoding='utf-8') as f:
+            json.dump(registry, f, indent=1, sort_keys=True)
+
+    return registry, stats
+
+
+def get_registry():
+    """Return the process-wide registry, refreshing it on first use."""
+    global _registry
+    if _registry is None:
+        _registry, _ = refresh_registry()
+    return _registry
+
+
+def lookup(pdf_path):
+    """Return the registry entry for a chart PDF, or None.
+
+    Paths outside the registry (e.g. demo PDFs) are read directly.
+    """
+    path = Path(pdf_path).resolve()
+    try:
+        rel_path = path.relative_to(PROJECT_DIR.resolve()).as_posix()
+    except ValueError:
+        rel_path = None
+
+    registry = get_registry()
+    if rel_path in registry:
+        return registry[rel_path]
+    if path.exists():
+        try:
+            return _geometry_entry(path)
+        except (OSError, PdfGeometryError):
+            return None
+    return None
+
+
+def aspect_ratio(pdf_path, default=None):
+    """Width/height ratio of a chart PDF, or default if unknown."""
+    entry = lookup(pdf_path)
+    if entry is None or not entry['aspect']:
+        return default
+    return entry['aspect']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh the chart geometry registry')
+    parser.add_argument('--rebuild', action='store_true', help='Re-read every PDF')
+    parser.add_argument('--show', type=str, help='Print the entry for one chart PDF')
+    args = parser.parse_args()
+
+    if args.show:
+        entry = lookup(PROJECT_DIR / args.show)
+        print(json.dumps(entry, indent=2) if entry else f"Not found: {args.show}")
+        return
+
+    print("=" * 70)
+    print("CHART REGISTRY")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    registry, stats = refresh_registry(rebuild=args.rebuild)
+    elapsed = time.perf_counter() - start
+
+    print(f"Charts:     {len(registry)}")
+    print(f"Read:       {stats['read']}")
+    print(f"Cached:     {stats['reused']}")
+    print(f"Removed:    {stats['removed']}")
+    print(f"Duration:   {elapsed * 1000:.0f} ms")
+
+    if registry:
+        total = sum(e['size'] for e in registry.values())
+        aspects = sorted(e['aspect'] for e in registry.values())
+        print(f"Total size: {total / 1024 / 1024:.1f} MB")
+        print(f"Aspect:     min {aspects[0]:.2f}, median {aspects[len(aspects) // 2]:.2f}, "
+              f"max {aspects[-1]:.2f}")
+
+        print("\nLargest charts:")
+        for rel_path, entry in sorted(registry.items(), key=lambda kv: -kv[1]['size'])[:5]:
+            print(f"  {entry['size'] / 1024:8.0f} KB  {rel_path}")
+
+    if stats['errors']:
+        print(f"\nUnreadable PDFs ({len(stats['errors'])}):")
+        for rel_path, error in stats['errors'][:10]:
+            print(f"  {rel_path}: {error}")
+
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,319 @@
+"""
+Visual regression check for chart PDFs.
+
+Every chart PDF (the set in chart_registry.py) is rasterized to a small
+grayscale thumbnail and compared with its golden thumbnail in
+_scripts/chart_goldens/ using SSIM (structural similarity). Charts whose
+score drops below the threshold are reported, so a refactor of the chart
+build can be validated without opening ~480 figures by hand.
+
+Rasterizing uses PyMuPDF (pip install pymupdf) or, if that is missing,
+pdftoppm from poppler. Charts are processed in parallel worker processes.
+
+Goldens must come from a fresh build, not from the committed PDFs, which
+were made at different times on different machines. --rebuild first runs
+generate_all_charts.py --deterministic, so goldens and the build under
+test are made the same way. Thumbnails also depend on the fonts, the
+matplotlib version and the rasterizer they were made with. --update
+records that environment in chart_goldens/environment.json, and a
+comparison in a different environment prints a warning. The goldens are
+therefore not committed (chart_goldens/ is in .gitignore). CI builds them
+from the base commit of each pull request and compares the head against
+them (.github/workflows/chart-regression.yml).
+
+Usage:
+    python _scripts/chart_regression.py --rebuild --update   # Goldens from a fresh build
+    python _scripts/chart_regression.py --rebuild            # Rebuild and compare
+    python _scripts/chart_regression.py --module module_04_traditional
+    python _scripts/chart_regression.py --diff-dir /tmp/chart_diffs --threshold 0.99
+"""
+
+import argparse
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from chart_registry import discover_chart_pdfs
+
+
+PROJECT_DIR = Path(__file__).parent.parent
+GOLDEN_DIR = Path(__file__).parent / 'chart_goldens'
+ENVIRONMENT_FILE = GOLDEN_DIR / 'environment.json'
+THUMBNAIL_WIDTH = 160
+DEFAULT_THRESHOLD = 0.98
+SSIM_WINDOW = 7
+
+# SSIM constants for 8-bit images (Wang et al. 2004)
+C1 = (0.01 * 255) ** 2
+C2 = (0.03 * 255) ** 2
+
+
+class RasterizeError(Exception):
+    pass
+
+
+def rasterize(pdf_path, width=THUMBNAIL_WIDTH):
+    """First page of a PDF as a grayscale uint8 array, width pixels wide."""
+    try:
+        import pymupdf
+    except ImportError:
+        try:
+            import fitz as pymupdf
+        except ImportError:
+            return _rasterize_pdftoppm(pdf_path, width)
+
+    try:
+        with pymupdf.open(pdf_path) as doc:
+            page = doc[0]
+            zoom = width / page.rect.width
+            pix = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom),
+                                  colorspace=pymupdf.csGRAY, alpha=False)
+            pixels = np.frombuffer(pix.samples, dtype=np.uint8)
+            return pixels.reshape(pix.height, pix.width).copy()
+    except Exception as e:
+        raise RasterizeError(f"{pdf_path}: {e}") from e
+
+
+def _rasterize_pdftoppm(pdf_path, width):
+    if shutil.which('pdftoppm') is None:
+        raise RasterizeError("No PDF rasterizer: pip install pymupdf, "
+                             "or install poppler (pdftoppm)")
+    proc = subprocess.run(['pdftoppm', '-gray', '-singlefile', '-scale-to-x', str(width),
+                           '-scale-to-y', '-1', str(pdf_path)], capture_output=True)
+    if proc.returncode != 0:
+        raise RasterizeError(f"{pdf_path}: {proc.stderr.decode(errors='replace').strip()}")
+    return read_pgm(proc.stdout)
+
+
+def read_pgm(data):
+    """Decode a binary PGM (P5) image."""
+    fields = []
+    pos = 0
+    while len(fields) < 4:
+        while data[pos:pos + 1].isspace():
+            pos += 1
+        if data[pos:pos + 1] == b'#':
+            pos = data.index(b'\n', pos) + 1
+            continue
+        end = pos
+        while not data[end:end + 1].isspace():
+            end += 1
+        fields.append(data[pos:end])
+        pos = end
+    if fields[0] != b'P5':
+        raise RasterizeError(f"Unexpected image format {fields[0]!r}")
+    width, height = int(fields[1]), int(fields[2])
+    pixels = np.frombuffer(data, dtype=np.uint8, count=width * height, offset=pos + 1)
+    return pixels.reshape(height, width)
+
+
+def write_png(path, image):
+    """Save an 8-bit grayscale PNG (Pillow ships with matplotlib)."""
+    from PIL import Image
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(image, mode='L').save(path, optimize=True)
+
+
+def read_png(path):
+    from PIL import Image
+    with Image.open(path) as image:
+        return np.asarray(image.convert('L'))
+
+
+def _box_mean(image, size):
+    """Mean over every size x size window (valid region) via an integral image."""
+    integral = np.pad(image, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+    total = (integral[size:, size:] - integral[:-size, size:]
+             - integral[size:, :-size] + integral[:-size, :-size])
+    return total / (size * size)
+
+
+def ssim(a, b, window=SSIM_WINDOW):
+    """Mean structural similarity of two equally sized grayscale images."""
+    a = a.astype(np.float64)
+    b = b.astype(np.float64)
+    if min(a.shape) < window:
+        return 1.0 if np.array_equal(a, b) else 0.0
+    mu_a = _box_mean(a, window)
+    mu_b = _box_mean(b, window)
+    var_a = _box_mean(a * a, window) - mu_a ** 2
+    var_b = _box_mean(b * b, window) - mu_b ** 2
+    cov = _box_mean(a * b, window) - mu_a * mu_b
+    score = ((2 * mu_a * mu_b + C1) * (2 * cov + C2)
+             / ((mu_a ** 2 + mu_b ** 2 + C1) * (var_a + var_b + C2)))
+    return float(score.mean())
+
+
+def compare_images(current, golden):
+    """SSIM of two thumbnails; thumbnails of different height (aspect
+    change) are compared over their common area with a size penalty."""
+    if current.shape == golden.shape:
+        return ssim(current, golden)
+    h = min(current.shape[0], golden.shape[0])
+    w = min(current.shape[1], golden.shape[1])
+    overlap = (h * w) / max(current.size, golden.size)
+    return ssim(current[:h, :w], golden[:h, :w]) * overlap
+
+
+def environment():
+    """What chart thumbnails depend on besides the chart code."""
+    import matplotlib
+    from matplotlib import font_manager
+
+    try:
+        import pymupdf
+        rasterizer = f"pymupdf {pymupdf.VersionBind}"
+    except ImportError:
+        rasterizer = 'pdftoppm'
+    return {
+        'python': platform.python_version(),
+        'platform': platform.system(),
+        'matplotlib': matplotlib.__version__,
+        'numpy': np.__version__,
+        'rasterizer': rasterizer,
+        'default font': Path(font_manager.findfont(font_manager.FontProperties())).name,
+    }
+
+
+def rebuild(module=None):
+    """Rebuild chart PDFs with generate_all_charts.py --deterministic."""
+    command = [sys.executable, str(PROJECT_DIR / 'generate_all_charts.py'), '--deterministic']
+    if module:
+        command += ['--module', module]
+    print(f"Rebuilding charts: {' '.join(command[1:])}")
+    proc = subprocess.run(command, cwd=PROJECT_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        # Charts that fail keep their committed PDF on both sides of a comparison
+        print("  Some charts failed to build; their committed PDFs are compared")
+
+
+def golden_path(rel_pdf):
+    return GOLDEN_DIR / (rel_pdf[:-4] + '.png')
+
+
+def check_chart(job):
+    """Rasterize one chart and compare (or update). Runs in a worker."""
+    rel_pdf, update, threshold, diff_dir = job
+    result = {'chart': rel_pdf, 'status': 'ok', 'ssim': None, 'error': None}
+    try:
+        current = rasterize(PROJECT_DIR / rel_pdf)
+    except RasterizeError as e:
+        result.update(status='error', error=str(e))
+        return result
+
+    golden_file = golden_path(rel_pdf)
+    if update:
+        if golden_file.exists() and np.array_equal(read_png(golden_file), current):
+            result['status'] = 'unchanged'
+        else:
+            write_png(golden_file, current)
+            result['status'] = 'updated'
+        return result
+
+    if not golden_file.exists():
+        result['status'] = 'new'
+        return result
+
+    golden = read_png(golden_file)
+    score = compare_images(current, golden)
+    result['ssim'] = round(score, 5)
+    if score < threshold:
+        result['status'] = 'changed'
+        if diff_dir:
+            write_png(Path(diff_dir) / (rel_pdf[:-4] + '.png'), diff_image(golden, current))
+    return result
+
+
+def diff_image(golden, current):
+    """golden | current | difference, padded with white to a common size."""
+    h = max(current.shape[0], golden.shape[0])
+    w = max(current.shape[1], golden.shape[1])
+
+    def pad(image):
+        return np.pad(image, ((0, h - image.shape[0]), (0, w - image.shape[1])),
+                      constant_values=255)
+
+    diff = 255 - np.abs(pad(current).astype(int) - pad(golden).astype(int))
+    return np.hstack([pad(golden), pad(current), diff.astype(np.uint8)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Visual regression check for chart PDFs')
+    parser.add_argument('--module', type=str, help='Check one module only')
+    parser.add_argument('--update', action='store_true', help='Write golden thumbnails')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Rebuild the charts deterministically first')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Minimum SSIM (default {DEFAULT_THRESHOLD})')
+    parser.add_argument('--diff-dir', type=str,
+                        help='Write golden | current | difference images for changed charts')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: CPUs)')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("CHART VISUAL REGRESSION" + (" (UPDATE GOLDENS)" if args.update else ""))
+    print("=" * 70)
+
+    if args.rebuild:
+        rebuild(args.module)
+    elif args.update:
+        print("Note: goldens from the PDFs on disk; use --rebuild for a fresh build")
+    current_env = environment()
+    if not args.update and ENVIRONMENT_FILE.exists():
+        golden_env = json.loads(ENVIRONMENT_FILE.read_text(encoding='utf-8'))
+        for key, value in golden_env.items():
+            if current_env.get(key) != value:
+                print(f"  Warning: goldens were made with {key} {value}, "
+                      f"this run uses {current_env.get(key)}")
+
+    charts = discover_chart_pdfs()
+    if args.module:
+        charts = [c for c in charts if c.startswith(args.module + '/')
+                  or c.startswith(f'charts/{args.module}/')]
+    jobs = [(rel, args.update, args.threshold, args.diff_dir) for rel in charts]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(check_chart, jobs, chunksize=8))
+    elapsed = time.perf_counter() - start
+    if args.update:
+        ENVIRONMENT_FILE.parent.mkdir(parents=True, exist_ok=True)
+        ENVIRONMENT_FILE.write_text(json.dumps(current_env, indent=2) + '\n', encoding='utf-8')
+
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+
+    changed = sorted((r for r in results if r['status'] == 'changed'), key=lambda r: r['ssim'])
+    for result in changed:
+        print(f"  [CHANGED] {result['chart']}  SSIM {result['ssim']:.4f}")
+    for result in results:
+        if result['status'] == 'error':
+            print(f"  [ERROR]   {result['error']}")
+    new = [r['chart'] for r in results if r['status'] == 'new']
+    if new:
+        print(f"  {len(new)} charts have no golden (run with --update): {', '.join(new[:5])}"
+              f"{' ...' if len(new) > 5 else ''}")
+
+    print("\n" + "=" * 70)
+    print(f"Charts: {len(results)} ({', '.join(f'{v} {k}' for k, v in sorted(counts.items()))})")
+    scores = [r['ssim'] for r in results if r['ssim'] is not None]
+    if scores:
+        print(f"SSIM:   min {min(scores):.4f}, mean {sum(scores) / len(scores):.4f}")
+    print(f"Duration: {elapsed:.1f} s")
+    if args.diff_dir and changed:
+        print(f"Diff images: {args.diff_dir}")
+    print("=" * 70)
+
+    return 1 if changed or counts.get('error') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,106 +1,302 @@
 """
-Check status of all lessons: overflows and missing charts.
+Course status dashboard: lessons, PDFs, charts, stale artifacts and
+broken references, derived from one filesystem snapshot.
+
+The tree is scanned once (parallel scandir, stat-only; files are hashed
+only when their size or mtime changed) and every check below is a pure
+function of that snapshot. \\includegraphics references are extracted per
+.tex file and cached by content hash, so a warm run does not re-read any
+lesson source.
+
+Usage:
+    python _scripts/check_status.py                 # Full dashboard
+    python _scripts/check_status.py --overflows     # Add static overflow prediction
+    python _scripts/check_status.py --json          # Machine-readable output
 """
 
+import argparse
+import json
+import posixpath
+import sys
+import time
 from pathlib import Path
-import subprocess
-import re
+
+from frame_model import INCLUDEGRAPHICS, strip_comment
+from fs_snapshot import build_snapshot
+
 
 PROJECT_DIR = Path(__file__).parent.parent
-MODULE_DIRS = [
-    PROJECT_DIR / 'module_01_fintech',
-    PROJECT_DIR / 'module_02_blockchain',
-    PROJECT_DIR / 'module_03_ai_ml',
-    PROJECT_DIR / 'module_04_traditional',
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.append(str(PROJECT_DIR))  # charts._shared, when run as a script
+STATUS_CACHE = Path(__file__).parent / '.status_cache.json'
+MODULES = [
+    'module_01_fintech',
+    'module_02_blockchain',
+    'module_03_ai_ml',
+    'module_04_traditional',
 ]
 
-def check_overflows(tex_path):
-    """Compile and count overflow warnings."""
-    try:
-        result = subprocess.run(
-            ['pdflatex', '-interaction=nonstopmode', str(tex_path)],
-            capture_output=True,
-            text=True,
-            timeout=60,
-            cwd=tex_path.parent
-        )
-        output = result.stdout + result.stderr
-        overflows = len(re.findall(r'Overfull', output))
-        return overflows
-    except Exception as e:
-        return -1  # Error
-
-def count_missing_charts(tex_path):
-    """Count charts referenced but potentially missing."""
-    with open(tex_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Find all includegraphics references
-    charts = re.findall(r'\\includegraphics[^{]*\{([^}]+)\}', content)
-    missing = 0
-    synthetic = 0
-
-    for chart in charts:
-        chart_path = tex_path.parent / chart
-        if not chart_path.exists():
-            missing += 1
-        else:
-            # Check if it's a placeholder/synthetic
-            py_path = chart_path.parent / (chart_path.stem + '.py')
-            if py_path.exists():
-                with open(py_path, 'r', encoding='utf-8') as f:
-                    py_content = f.read()
-                    if 'SYNTHETIC' in py_content or 'placeholder' in py_content.lower():
-                        synthetic += 1
-
-    return missing, synthetic, len(charts)
+# Compilation artifacts that belong in temp/ (see compile_all_lessons.py)
+TEMP_EXTENSIONS = ('.aux', '.log', '.nav', '.snm', '.toc', '.out', '.vrb')
+ARTIFACT_EXEMPT_DIRS = ('temp', 'previous')
+
+
+def extract_references(text):
+    """Return the \\includegraphics targets of a LaTeX source."""
+    refs = []
+    for line in text.split('\n'):
+        for match in INCLUDEGRAPHICS.finditer(strip_comment(line)):
+            refs.append(match.group(2))
+    return refs
+
+
+def load_reference_cache():
+    if STATUS_CACHE.exists():
+        try:
+            with open(STATUS_CACHE, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return {}
 
-def main():
-    print("Checking lesson status...")
-    print("=" * 80)
 
-    total_overflows = 0
-    total_missing = 0
-    total_synthetic = 0
-    total_charts = 0
+def lesson_references(snapshot, tex_files, cache):
+    """Map each .tex file to its references, re-reading only changed sources."""
+    references = {}
+    for rel in tex_files:
+        digest = snapshot.files[rel].sha256
+        if digest not in cache:
+            cache[digest] = extract_references(snapshot.read_text(rel))
+        references[rel] = cache[digest]
+    return references
 
-    for module_dir in MODULE_DIRS:
-        if not module_dir.exists():
+
+def check_lessons(snapshot):
+    """Lesson sources, compiled PDFs and out-of-date PDFs per module."""
+    modules = {}
+    for module in MODULES:
+        tex_files = snapshot.glob(f'{module}/lesson_*.tex')
+        missing, stale = [], []
+        for tex in tex_files:
+            pdf = tex[:-4] + '.pdf'
+            if pdf not in snapshot:
+                missing.append(tex)
+            elif snapshot.newer(tex, pdf):
+                stale.append(pdf)
+        modules[module] = {'tex': tex_files, 'missing_pdf': missing, 'stale_pdf': stale}
+    return modules
+
+
+def check_copies(snapshot):
+    """Organized copies in slides/ and docs/slides/ that differ from the source."""
+    out_of_sync, missing = [], []
+    for module in MODULES:
+        for src in snapshot.glob(f'{module}/lesson_*.tex') + snapshot.glob(f'{module}/lesson_*.pdf'):
+            name = posixpath.basename(src)
+            targets = [f'slides/{module}/{name}']
+            if name.endswith('.pdf'):
+                targets.append(f'docs/slides/{module}/{name}')
+            for target in targets:
+                if target not in snapshot:
+                    missing.append(target)
+                elif snapshot.files[target].sha256 != snapshot.files[src].sha256:
+                    out_of_sync.append(target)
+    return {'out_of_sync': out_of_sync, 'missing': missing}
+
+
+def check_charts(snapshot):
+    """Chart scripts (or chart specs, <name>.chart.yaml) without a PDF, or
+    whose PDF is older than the source."""
+    from charts._shared.specs import SPEC_SUFFIXES
+
+    charts = {}
+    for module in MODULES:
+        scripts = []
+        for suffix in ('.py',) + SPEC_SUFFIXES:
+            scripts += [s for s in snapshot.glob(f'{module}/figures/*/*{suffix}')
+                        if posixpath.basename(posixpath.dirname(s)) + suffix
+                        == posixpath.basename(s)]
+        missing, stale = [], []
+        for script in scripts:
+            folder = posixpath.dirname(script)
+            pdf = f'{folder}/{posixpath.basename(folder)}.pdf'
+            if pdf not in snapshot:
+                missing.append(script)
+            elif snapshot.newer(script, pdf):
+                stale.append(pdf)
+        pdfs = snapshot.glob(f'{module}/figures/**/*.pdf')
+        charts[module] = {'scripts': len(scripts), 'pdfs': len(pdfs),
+                          'missing_pdf': missing, 'stale_pdf': stale}
+    return charts
+
+
+def check_artifacts(snapshot):
+    """LaTeX compilation artifacts left outside temp/ and previous/."""
+    artifacts = []
+    for rel in snapshot.files:
+        if not rel.endswith(TEMP_EXTENSIONS):
             continue
+        if any(part in ARTIFACT_EXEMPT_DIRS for part in rel.split('/')[:-1]):
+            continue
+        artifacts.append(rel)
+    return sorted(artifacts)
 
-        print(f"\n{module_dir.name}:")
-        print("-" * 60)
 
-        tex_files = sorted(module_dir.glob('lesson_*.tex'))
+def check_references(snapshot, references):
+    """\\includegraphics targets that do not exist in the snapshot."""
+    broken = {}
+    total = 0
+    for tex, refs in references.items():
+        base = posixpath.dirname(tex)
+        for ref in refs:
+            total += 1
+            target = posixpath.normpath(posixpath.join(base, ref))
+            if not posixpath.splitext(target)[1]:
+                target += '.pdf'
+            if target not in snapshot:
+                broken.setdefault(tex, []).append(ref)
+    return broken, total
 
-        for tex_file in tex_files:
-            overflows = check_overflows(tex_file)
-            missing, synthetic, charts = count_missing_charts(tex_file)
 
-            status = []
-            if overflows > 0:
-                status.append(f"{overflows} overflows")
-                total_overflows += overflows
-            if missing > 0:
-                status.append(f"{missing} missing charts")
-                total_missing += missing
-            if synthetic > 0:
-                status.append(f"{synthetic} synthetic")
-                total_synthetic += synthetic
+def build_status(overflows=False):
+    """Compute the full status report from a single snapshot."""
+    timings = {}
+    start = time.perf_counter()
+    snapshot = build_snapshot()
+    timings['snapshot'] = time.perf_counter() - start
 
-            total_charts += charts
+    start = time.perf_counter()
+    cache = load_reference_cache()
+    cache_size = len(cache)
+    tex_files = [t for m in MODULES for t in snapshot.glob(f'{m}/lesson_*.tex')]
+    references = lesson_references(snapshot, tex_files, cache)
+    if len(cache) != cache_size:
+        live = {snapshot.files[t].sha256 for t in tex_files}
+        with open(STATUS_CACHE, 'w', encoding='utf-8') as f:
+            json.dump({k: v for k, v in cache.items() if k in live}, f)
 
-            if status:
-                print(f"  {tex_file.name}: {', '.join(status)}")
-            else:
-                print(f"  {tex_file.name}: OK ({charts} charts)")
+    broken, total_refs = check_references(snapshot, references)
+    status = {
+        'snapshot': snapshot.stats,
+        'lessons': check_lessons(snapshot),
+        'copies': check_copies(snapshot),
+        'charts': check_charts(snapshot),
+        'artifacts': check_artifacts(snapshot),
+        'references': {'total': total_refs, 'broken': broken},
+    }
+    timings['derive'] = time.perf_counter() - start
+
+    if overflows:
+        from predict_overflow import estimate_lesson, load_calibration
+        start = time.perf_counter()
+        calibration = load_calibration()
+        predicted = {}
+        for tex in tex_files:
+            frames = [e for e in estimate_lesson(PROJECT_DIR / tex) if e.fill(calibration) > 1.0]
+            if frames:
+                predicted[tex] = [(e.start, e.title) for e in frames]
+        status['predicted_overflows'] = predicted
+        timings['overflows'] = time.perf_counter() - start
+
+    status['timings'] = {k: round(v, 4) for k, v in timings.items()}
+    return status
+
+
+def print_status(status):
+    print("Course status")
+    print("=" * 80)
+
+    snap = status['snapshot']
+    print(f"Snapshot: {snap['files']} files ({snap['hashed']} hashed, {snap['reused']} cached)")
+
+    print("\nLESSONS")
+    print("-" * 60)
+    total_tex = total_missing = total_stale = 0
+    for module, info in status['lessons'].items():
+        tex, missing, stale = len(info['tex']), len(info['missing_pdf']), len(info['stale_pdf'])
+        total_tex += tex
+        total_missing += missing
+        total_stale += stale
+        print(f"  {module:24s} {tex:3d} lessons, {tex - missing:3d} PDFs"
+              f"{f', {missing} missing' if missing else ''}{f', {stale} stale' if stale else ''}")
+        for rel in info['missing_pdf'] + info['stale_pdf']:
+            print(f"    - {rel}")
+
+    copies = status['copies']
+    print(f"\n  slides/ + docs/ copies: {len(copies['out_of_sync'])} out of sync, "
+          f"{len(copies['missing'])} missing")
+    for rel in (copies['out_of_sync'] + copies['missing'])[:10]:
+        print(f"    - {rel}")
+
+    print("\nCHARTS")
+    print("-" * 60)
+    total_scripts = total_pdfs = 0
+    for module, info in status['charts'].items():
+        total_scripts += info['scripts']
+        total_pdfs += info['pdfs']
+        extra = []
+        if info['missing_pdf']:
+            extra.append(f"{len(info['missing_pdf'])} without PDF")
+        if info['stale_pdf']:
+            extra.append(f"{len(info['stale_pdf'])} stale")
+        print(f"  {module:24s} {info['scripts']:3d} scripts, {info['pdfs']:3d} PDFs"
+              f"{', ' + ', '.join(extra) if extra else ''}")
+
+    print("\nSTALE ARTIFACTS")
+    print("-" * 60)
+    artifacts = status['artifacts']
+    if artifacts:
+        for rel in artifacts[:10]:
+            print(f"  {rel}")
+        if len(artifacts) > 10:
+            print(f"  ... and {len(artifacts) - 10} more")
+    else:
+        print("  OK: no compilation artifacts outside temp/")
+
+    print("\nREFERENCES")
+    print("-" * 60)
+    refs = status['references']
+    broken_count = sum(len(v) for v in refs['broken'].values())
+    print(f"  {refs['total']} \\includegraphics references, {broken_count} broken")
+    for tex, targets in refs['broken'].items():
+        print(f"  {tex}:")
+        for target in targets:
+            print(f"    - {target}")
+
+    if 'predicted_overflows' in status:
+        print("\nPREDICTED OVERFLOWS (static estimate)")
+        print("-" * 60)
+        for tex, frames in status['predicted_overflows'].items():
+            print(f"  {tex}: {len(frames)} frames")
 
     print("\n" + "=" * 80)
-    print(f"SUMMARY:")
-    print(f"  Total overflows: {total_overflows}")
-    print(f"  Missing charts: {total_missing}")
-    print(f"  Synthetic/placeholder: {total_synthetic}")
-    print(f"  Total charts: {total_charts}")
+    print("SUMMARY:")
+    print(f"  Lessons: {total_tex} ({total_missing} missing PDFs, {total_stale} stale)")
+    print(f"  Charts: {total_scripts} scripts, {total_pdfs} PDFs")
+    print(f"  Stale artifacts: {len(artifacts)}")
+    print(f"  Broken references: {broken_count}")
+    timings = status['timings']
+    print(f"  Time: {sum(timings.values()) * 1000:.0f} ms "
+          f"({', '.join(f'{k} {v * 1000:.0f} ms' for k, v in timings.items())})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Course status dashboard')
+    parser.add_argument('--overflows', action='store_true',
+                        help='Include static overflow prediction (predict_overflow.py)')
+    parser.add_argument('--json', action='store_true', help='Print the status as JSON')
+    args = parser.parse_args()
+
+    status = build_status(overflows=args.overflows)
+    if args.json:
+        print(json.dumps(status, indent=2))
+    else:
+        print_status(status)
+
+    problems = (sum(len(i['missing_pdf']) for i in status['lessons'].values())
+                + sum(len(v) for v in status['references']['broken'].values()))
+    return 1 if problems else 0
+
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Parsed frame model for Beamer lesson files.
+
+Splits a lesson .tex file into frames and each frame into layout blocks
+(full-width runs and column groups) so that tools can reason about slide
+content without running pdflatex.
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+FRAME_BEGIN = re.compile(r'\\begin\{frame\}(?:\[([^\]]*)\])?(?:\{(.*?)\})?')
+FRAME_END = re.compile(r'\\end\{frame\}')
+FRAMETITLE = re.compile(r'\\frametitle\{([^}]*)\}')
+INCLUDEGRAPHICS = re.compile(r'\\includegraphics(?:\[([^\]]*)\])?\{([^}]+)\}')
+BOTTOMNOTE = re.compile(r'\\bottomnote\{(.*)\}')
+COLUMN = re.compile(r'\\column\{([\d.]*)\\(?:textwidth|linewidth)\}')
+
+
+@dataclass
+class Frame:
+    title: str
+    options: str
+    start: int          # 1-based line of \begin{frame}
+    end: int            # 1-based line of \end{frame}
+    lines: list         # (line_number, text) pairs strictly inside the frame
+    figures: list = field(default_factory=list)
+    bottomnote: str = None
+
+    @property
+    def body(self):
+        return '\n'.join(text for _, text in self.lines)
+
+    @property
+    def is_title_frame(self):
+        return any('\\titlepage' in text for _, text in self.lines)
+
+
+@dataclass
+class Column:
+    width: float        # fraction of \textwidth
+    lines: list         # (line_number, text) pairs
+
+
+@dataclass
+class Block:
+    columns: list       # one Column for full-width runs, several for columns
+    preamble: list = field(default_factory=list)  # lines before the first \column
+
+
+def strip_comment(line):
+    """Remove a LaTeX comment (unescaped %) from a line."""
+    match = re.search(r'(?<!\\)%', line)
+    return line[:match.start()] if match else line
+
+
+def parse_frames(text):
+    """Parse LaTeX source into a list of Frame objects."""
+    frames = []
+    current = None
+
+    for number, raw in enumerate(text.split('\n'), 1):
+        line = strip_comment(raw)
+
+        if current is None:
+            match = FRAME_BEGIN.search(line)
+            if match:
+                current = Frame(
+                    title=match.group(2) or '',
+                    options=match.group(1) or '',
+                    start=number,
+                    end=number,
+                    lines=[],
+                )
+                rest = line[match.end():]
+                if FRAME_END.search(rest):
+                    current.end = number
+                    frames.append(current)
+                    current = None
+            continue
+
+        if FRAME_END.search(line):
+            current.end = number
+            frames.append(current)
+            current = None
+            continue
+
+        current.lines.append((number, line))
+
+        title_match = FRAMETITLE.search(line)
+        if title_match and not current.title:
+            current.title = title_match.group(1)
+        for fig_match in INCLUDEGRAPHICS.finditer(line):
+            current.figures.append(fig_match.group(2))
+        note_match = BOTTOMNOTE.search(line)
+        if note_match:
+            current.bottomnote = note_match.group(1)
+
+    return frames
+
+
+def parse_tex_file(tex_path):
+    """Read and parse a lesson file, returning its frames."""
+    return parse_frames(Path(tex_path).read_text(encoding='utf-8'))
+
+
+def frame_at_line(frames, line_number):
+    """Return the frame containing a source line, or None."""
+    for frame in frames:
+        if frame.start <= line_number <= frame.end:
+            return frame
+    return None
+
+
+def layout_blocks(frame):
+    """Split a frame body into full-width blocks and column groups.
+
+    The \\bottomnote line is left out; it is always placed at the foot of
+    the frame and is accounted for separately.
+    """
+    blocks = []
+    full = []
+    columns = None
+    preamble = []
+
+    for number, line in frame.lines:
+        if BOTTOMNOTE.search(line):
+            continue
+
+        if '\\begin{columns}' in line:
+            if full:
+                blocks.append(Block([Column(1.0, full)]))
+                full = []
+            columns = []
+            preamble = []
+            continue
+
+        if '\\end{columns}' in line and columns is not None:
+            if columns:
+                blocks.append(Block(columns, preamble))
+            columns = None
+            continue
+
+        if columns is not None:
+            match = COLUMN.search(line)
+            if match:
+                columns.append(Column(float(match.group(1) or 1.0), []))
+            elif columns:
+                columns[-1].lines.append((number, line))
+            else:
+                preamble.append((number, line))
+            continue
+
+        full.append((number, line))
+
+    if columns:
+        blocks.append(Block(columns, preamble))
+    if full:
+        blocks.append(Block([Column(1.0, full)]))
+
+    return blocks
+
+
+def figure_width(options):
+    """Return the \\includegraphics width as a fraction of \\textwidth."""
+    if not options:
+        return None
+    match = re.search(r'width\s*=\s*([\d.]*)\s*\\(?:textwidth|linewidth|columnwidth)', options)
+    if not match:
+        return None
+    return float(match.group(1) or 1.0)
+
+
+def resolve_figure(tex_path, fig_path):
+    """Resolve an \\includegraphics path relative to the lesson file."""
+    full_path = Path(fig_path)
+    if not full_path.is_absolute():
+        full_path = Path(tex_path).parent / fig_path
+    if not full_path.suffix:
+        full_path = full_path.with_suffix('.pdf')
+    return full_path
@@ -0,0 +1,219 @@
+"""
+Filesystem snapshot of the course tree.
+
+Walks the project once with os.scandir (directories in parallel threads,
+stat-only) and records size, mtime and SHA-256 for every file. Hashes are
+cached in .fs_snapshot.json next to this script and recomputed only for
+files whose size or mtime changed, so warm snapshots cost one stat per
+file. Status, manifest and deployment tools derive everything they need
+from a single Snapshot instead of re-walking the tree.
+"""
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+
+PROJECT_DIR = Path(__file__).parent.parent
+CACHE_FILE = Path(__file__).parent / '.fs_snapshot.json'
+CACHE_VERSION = 1
+
+SKIP_DIRS = {'.git', '__pycache__', '.pytest_cache', '.mypy_cache', '.ruff_cache',
+             '.tox', '.nox', '.venv', 'venv'}
+SKIP_FILES = {CACHE_FILE.name}
+HASH_CHUNK = 1 << 20
+MAX_WORKERS = 8
+
+
+@dataclass
+class FileInfo:
+    size: int
+    mtime_ns: int
+    sha256: str = None
+
+
+def _walk(root, top):
+    """Recursively scandir one directory; returns (files, dirs) relative to root."""
+    files = []
+    dirs = []
+    stack = [top]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            stack.append(entry.path)
+                            dirs.append(os.path.relpath(entry.path, root).replace(os.sep, '/'))
+                    elif entry.is_file(follow_symlinks=False):
+                        if entry.name in SKIP_FILES:
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                        rel = os.path.relpath(entry.path, root).replace(os.sep, '/')
+                        files.append((rel, st.st_size, st.st_mtime_ns))
+        except OSError:
+            continue
+    return files, dirs
+
+
+def scan_tree(root=PROJECT_DIR, workers=MAX_WORKERS):
+    """Stat every file under root, walking top-level directories in parallel.
+
+    Returns (files, dirs): files maps relative path -> (size, mtime_ns).
+    """
+    root = str(root)
+    files = {}
+    dirs = set()
+    tops = []
+
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS:
+                    tops.append(entry.path)
+                    dirs.add(entry.name)
+            elif entry.is_file(follow_symlinks=False) and entry.name not in SKIP_FILES:
+                st = entry.stat(follow_symlinks=False)
+                files[entry.name] = (st.st_size, st.st_mtime_ns)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for sub_files, sub_dirs in pool.map(lambda top: _walk(root, top), tops):
+            for rel, size, mtime_ns in sub_files:
+                files[rel] = (size, mtime_ns)
+            dirs.update(sub_dirs)
+
+    return files, dirs
+
+
+def hash_file(path):
+    """SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Snapshot:
+    """Immutable view of the tree: files, directories and per-file metadata."""
+
+    def __init__(self, root, files, dirs, stats):
+        self.root = Path(root)
+        self.files = files          # relative path -> FileInfo
+        self.dirs = dirs            # set of relative directory paths
+        self.stats = stats          # {'files', 'hashed', 'reused'}
+
+    def __contains__(self, rel_path):
+        return rel_path in self.files
+
+    def exists(self, rel_path):
+        rel_path = rel_path.rstrip('/')
+        return rel_path in self.files or rel_path in self.dirs
+
+    def glob(self, pattern):
+        """Sorted relative paths matching a glob ('*' does not cross '/')."""
+        regex = _glob_regex(pattern)
+        return sorted(p for p in self.files if regex.match(p))
+
+    def under(self, prefix):
+        """Sorted relative paths below a directory prefix."""
+        prefix = prefix.rstrip('/') + '/'
+        return sorted(p for p in self.files if p.startswith(prefix))
+
+    def newer(self, a, b):
+        """True if file a was modified after file b (both must exist)."""
+        return self.files[a].mtime_ns > self.files[b].mtime_ns
+
+    def read_text(self, rel_path):
+        return (self.root / rel_path).read_text(encoding='utf-8', errors='replace')
+
+
+def glob_to_regex(pattern):
+    """Translate a path glob to a regex: '*' and '?' stay within one path
+    segment, '**/' matches any number of leading directories."""
+    parts = []
+    for token in re.split(r'(\*\*/|\*\*|\*|\?)', pattern):
+        if token == '**/':
+            parts.append(r'(?:.*/)?')
+        elif token == '**':
+            parts.append(r'.*')
+        elif token == '*':
+            parts.append(r'[^/]*')
+        elif token == '?':
+            parts.append(r'[^/]')
+        else:
+            parts.append(re.escape(token))
+    return ''.join(parts)
+
+
+def compile_globs(patterns):
+    """Compile several path globs into one matcher (a single regex)."""
+    if not patterns:
+        return re.compile(r'(?!)')
+    return re.compile('|'.join(f'(?:{glob_to_regex(p)})' for p in patterns) + r'\Z')
+
+
+_GLOB_CACHE = {}
+
+
+def _glob_regex(pattern):
+    regex = _GLOB_CACHE.get(pattern)
+    if regex is None:
+        regex = _GLOB_CACHE[pattern] = compile_globs([pattern])
+    return regex
+
+
+def _load_cache(cache_file):
+    if not cache_file.exists():
+        return {}
+    try:
+        with open(cache_file, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != CACHE_VERSION:
+        return {}
+    return data.get('files', {})
+
+
+def build_snapshot(root=PROJECT_DIR, cache_file=CACHE_FILE, hash_files=True, workers=MAX_WORKERS):
+    """Scan the tree and return a Snapshot, hashing only changed files."""
+    root = Path(root)
+    stat_map, dirs = scan_tree(root, workers)
+    cached = _load_cache(cache_file) if hash_files else {}
+
+    files = {}
+    to_hash = []
+    reused = 0
+    for rel, (size, mtime_ns) in stat_map.items():
+        old = cached.get(rel)
+        if old and old[0] == size and old[1] == mtime_ns:
+            files[rel] = FileInfo(size, mtime_ns, old[2])
+            reused += 1
+        else:
+            files[rel] = FileInfo(size, mtime_ns)
+            if hash_files:
+                to_hash.append(rel)
+
+    if to_hash:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            digests = pool.map(lambda rel: hash_file(root / rel), to_hash)
+            for rel, digest in zip(to_hash, digests):
+                files[rel].sha256 = digest
+
+    if hash_files and (to_hash or len(cached) != len(files)):
+        payload = {
+            'version': CACHE_VERSION,
+            'files': {rel: [i.size, i.mtime_ns, i.sha256] for rel, i in sorted(files.items())},
+        }
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, separators=(',', ':'))
+
+    stats = {'files': len(files), 'hashed': len(to_hash), 'reused': reused}
+    return Snapshot(root, files, dirs, stats)
+
@@ -1,41 +1,98 @@
 #!/usr/bin/env python3
 """
 Generate file manifest for GitHub deployment.
+
+The manifest is incremental: manifest.json records size, mtime and
+SHA-256 for every deployable file (hashes come from the cached
+fs_snapshot, so only changed files are re-hashed), and each run writes
+manifest_delta.txt listing files added (A), modified (M) or deleted (D)
+since the previous manifest. Deployment can upload just the delta.
 """
 
-import os
+import json
 from pathlib import Path
 from datetime import datetime
 
-BASE_DIR = Path(r"D:\Joerg\Research\slides\DigitalFinance_3")
+from fs_snapshot import build_snapshot, compile_globs
+
+BASE_DIR = Path(__file__).parent.parent
+MANIFEST_JSON = BASE_DIR / "manifest.json"
+DELTA_FILE = BASE_DIR / "manifest_delta.txt"
 
-# Patterns to exclude
+# Paths to exclude (globs: '*' stays within a folder, '**/' spans folders)
 EXCLUDE_PATTERNS = [
-    'temp/',
-    'previous/',
-    '__pycache__/',
-    '.aux',
-    '.log',
-    '.nav',
-    '.snm',
-    '.toc',
-    '.out',
+    '**/temp/**',
+    '**/previous/**',
+    '**/__pycache__/**',
+    '**/*.aux',
+    '**/*.log',
+    '**/*.nav',
+    '**/*.snm',
+    '**/*.toc',
+    '**/*.out',
+    '**/*.pyc',
     'manifest.txt',
-    'reorganize_for_github.py',
-    'compile_all_pdfs.py',
-    'organize_slides_simple.py',
-    'generate_manifest.py',
-    'nul',
-    '.pyc'
+    'manifest.json',
+    'manifest_delta.txt',
+    '**/reorganize_for_github.py',
+    '**/compile_all_pdfs.py',
+    '**/organize_slides_simple.py',
+    '**/generate_manifest.py',
+    '**/nul',
+    '_scripts/chart_registry.json',
+    '_scripts/overflow_calibration.json',
+    '_scripts/.*.json',
+    # Generated caches (gitignored, rebuilt locally)
+    '_scripts/chart_goldens/**',
+    'charts/_shared/.data_cache/**',
+    '**/.sweep_cache/**',
 ]
+EXCLUDE = compile_globs(EXCLUDE_PATTERNS)
 
 
 def should_exclude(path_str):
     """Check if path should be excluded."""
-    for pattern in EXCLUDE_PATTERNS:
-        if pattern in path_str:
-            return True
-    return False
+    return EXCLUDE.match(path_str) is not None
+
+
+def collect_entries(snapshot):
+    """Manifest entries (size, mtime, sha256) for every deployable file."""
+    return {
+        rel: {'size': info.size, 'mtime_ns': info.mtime_ns, 'sha256': info.sha256}
+        for rel, info in sorted(snapshot.files.items())
+        if not should_exclude(rel)
+    }
+
+
+def load_previous_manifest():
+    """Entries from the last manifest.json, or {} on first run."""
+    if not MANIFEST_JSON.exists():
+        return {}
+    with open(MANIFEST_JSON, encoding='utf-8') as f:
+        return json.load(f).get('files', {})
+
+
+def diff_manifest(old, new):
+    """Return (added, modified, deleted) path lists; modified means content changed."""
+    added = sorted(set(new) - set(old))
+    deleted = sorted(set(old) - set(new))
+    modified = sorted(p for p in set(new) & set(old) if new[p]['sha256'] != old[p]['sha256'])
+    return added, modified, deleted
+
+
+def write_manifest_json(entries):
+    """Write manifest.json with one size/mtime/sha256 record per file."""
+    with open(MANIFEST_JSON, 'w', encoding='utf-8') as f:
+        json.dump({'generated': datetime.now().isoformat(timespec='seconds'),
+                   'files': entries}, f, indent=1, sort_keys=True)
+
+
+def write_delta(added, modified, deleted):
+    """Write manifest_delta.txt: one 'A|M|D path' line per changed file."""
+    with open(DELTA_FILE, 'w', encoding='utf-8') as f:
+        for code, paths in (('A', added), ('M', modified), ('D', deleted)):
+            for path in paths:
+                f.write(f"{code} {path}\n")
 
 
 def generate_manifest():
@@ -46,26 +103,15 @@ def generate_manifest():
 
     manifest_path = BASE_DIR / "manifest.txt"
 
-    files_to_commit = []
-
-    # Walk through all files
-    for root, dirs, files in os.walk(BASE_DIR):
-        # Skip excluded directories
-        dirs[:] = [d for d in dirs if not any(excl.rstrip('/') in d for excl in EXCLUDE_PATTERNS)]
-
-        for file in files:
-            file_path = Path(root) / file
-            rel_path = file_path.relative_to(BASE_DIR)
-            rel_path_str = str(rel_path).replace('\\', '/')
-
-            # Skip excluded files
-            if should_exclude(rel_path_str):
-                continue
+    snapshot = build_snapshot()
+    entries = collect_entries(snapshot)
+    previous = load_previous_manifest()
+    added, modified, deleted = diff_manifest(previous, entries)
 
-            files_to_commit.append(rel_path_str)
+    write_manifest_json(entries)
+    write_delta(added, modified, deleted)
 
-    # Sort files
-    files_to_commit.sort()
+    files_to_commit = list(entries)
 
     # Group by category
     categories = {
@@ -146,11 +192,15 @@ def generate_manifest():
         f.write("- Module folders contain source TEX and some compiled PDFs\n")
         f.write("- slides/ folder contains organized lesson files\n")
         f.write("- docs/slides/ contains PDFs for GitHub Pages deployment\n")
-        f.write("- 31 TEX files need compilation (missing PDFs)\n")
+        f.write("- manifest.json holds size/mtime/SHA-256 per file; manifest_delta.txt\n")
+        f.write("  lists files changed since the previous manifest\n")
         f.write("\n")
 
     print(f"\nGenerated: {manifest_path}")
     print(f"Total files: {total_files}")
+    print(f"Snapshot: {snapshot.stats['hashed']} files hashed, {snapshot.stats['reused']} cached")
+    print(f"Delta ({DELTA_FILE.name}): {len(added)} added, {len(modified)} modified, "
+          f"{len(deleted)} deleted")
 
     # Print summary
     print("\nFile count by category:")
@@ -0,0 +1,200 @@
+"""
+Dependency-free PDF page geometry reader.
+
+Reads MediaBox/CropBox of the first page of a PDF by following
+startxref -> xref table -> trailer /Root -> /Pages -> first page, seeking
+only to the few objects involved instead of loading the whole file.
+Files with cross-reference streams (PDF 1.5+) fall back to scanning the
+head of the file for the first page dictionary.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+
+
+TAIL_BYTES = 1024
+OBJECT_BYTES = 2048
+SCAN_BYTES = 65536
+
+STARTXREF = re.compile(rb'startxref\s+(\d+)')
+TRAILER_ROOT = re.compile(rb'trailer\s*<<.*?/Root\s+(\d+)\s+\d+\s+R', re.DOTALL)
+REF = r'\s+(\d+)\s+\d+\s+R'
+NUMBER = rb'[-+]?(?:\d+\.?\d*|\.\d+)'
+BOX = rb'/%s\s*\[\s*(' + NUMBER + rb')\s+(' + NUMBER + rb')\s+(' + NUMBER + rb')\s+(' + NUMBER + rb')\s*\]'
+
+
+class PdfGeometryError(Exception):
+    """Raised when a PDF's page geometry cannot be determined."""
+
+
+@dataclass
+class PdfGeometry:
+    path: str
+    file_size: int
+    media_box: tuple
+    crop_box: tuple
+    rotate: int = 0
+    pages: int = 1
+    method: str = 'xref'    # 'xref' or 'scan'
+
+    @property
+    def width_pt(self):
+        """Displayed page width in points (CropBox, after /Rotate)."""
+        width, height = self._raw_size()
+        return height if self.rotate % 180 else width
+
+    @property
+    def height_pt(self):
+        """Displayed page height in points (CropBox, after /Rotate)."""
+        width, height = self._raw_size()
+        return width if self.rotate % 180 else height
+
+    @property
+    def aspect(self):
+        """Displayed width / height of the first page."""
+        return self.width_pt / self.height_pt if self.height_pt else 0.0
+
+    def _raw_size(self):
+        x0, y0, x1, y1 = self.crop_box
+        return abs(x1 - x0), abs(y1 - y0)
+
+
+def _box(data, name):
+    match = re.search(BOX % name, data)
+    return tuple(float(v) for v in match.groups()) if match else None
+
+
+def _ref(data, key):
+    match = re.search(rb'/' + key + REF.encode(), data)
+    return int(match.group(1)) if match else None
+
+
+def _int(data, key):
+    match = re.search(rb'/' + key + rb'\s+(-?\d+)', data)
+    return int(match.group(1)) if match else None
+
+
+class _XrefReader:
+    """Random access to objects through a classic cross-reference table."""
+
+    def __init__(self, f, xref_offset):
+        self.f = f
+        self.sections = []   # (first object number, count, file position of first entry)
+
+        f.seek(xref_offset)
+        if f.readline().strip() != b'xref':
+            raise PdfGeometryError('cross-reference stream, no xref table')
+        while True:
+            position = f.tell()
+            header = f.readline().split()
+            if len(header) != 2 or not all(h.isdigit() for h in header):
+                f.seek(position)
+                break
+            first, count = int(header[0]), int(header[1])
+            self.sections.append((first, count, f.tell()))
+            f.seek(f.tell() + count * 20)
+
+    def offset(self, number):
+        for first, count, position in self.sections:
+            if first <= number < first + count:
+                self.f.seek(position + (number - first) * 20)
+                entry = self.f.read(20).split()
+                if len(entry) < 3 or entry[2] != b'n':
+                    raise PdfGeometryError(f'object {number} is not in use')
+                return int(entry[0])
+        raise PdfGeometryError(f'object {number} not in xref table')
+
+    def read(self, number):
+        self.f.seek(self.offset(number))
+        data = self.f.read(OBJECT_BYTES)
+        for terminator in (b'stream', b'endobj'):
+            cut = data.find(terminator)
+            if cut != -1:
+                data = data[:cut]
+        return data
+
+
+def _read_via_xref(f, file_size):
+    f.seek(max(0, file_size - TAIL_BYTES))
+    tail = f.read()
+    starts = STARTXREF.findall(tail)
+    if not starts:
+        raise PdfGeometryError('startxref not found')
+    root_match = TRAILER_ROOT.search(tail)
+    if not root_match:
+        raise PdfGeometryError('trailer /Root not found in file tail')
+
+    xref = _XrefReader(f, int(starts[-1]))
+    catalog = xref.read(int(root_match.group(1)))
+    node_number = _ref(catalog, b'Pages')
+    if node_number is None:
+        raise PdfGeometryError('catalog has no /Pages')
+
+    # Walk down the first /Kids entry, collecting inheritable attributes
+    inherited = {}
+    pages = None
+    for _ in range(32):
+        node = xref.read(node_number)
+        if pages is None:
+            pages = _int(node, b'Count')
+        for key in (b'MediaBox', b'CropBox'):
+            box = _box(node, key)
+            if box:
+                inherited[key] = box
+        rotate = _int(node, b'Rotate')
+        if rotate is not None:
+            inherited[b'Rotate'] = rotate
+
+        kids = re.search(rb'/Kids\s*\[\s*(\d+)\s+\d+\s+R', node)
+        if not kids or re.search(rb'/Type\s*/Page\b', node):
+            break
+        node_number = int(kids.group(1))
+
+    if b'MediaBox' not in inherited:
+        raise PdfGeometryError('first page has no /MediaBox')
+    return inherited, pages or 1
+
+
+def _read_via_scan(f):
+    f.seek(0)
+    head = f.read(SCAN_BYTES)
+    match = re.search(rb'/Type\s*/Page\b.*?>>', head, re.DOTALL)
+    data = match.group(0) if match else head
+    media = _box(data, b'MediaBox') or _box(head, b'MediaBox')
+    if media is None:
+        raise PdfGeometryError('no /MediaBox in file head')
+    attributes = {b'MediaBox': media}
+    crop = _box(data, b'CropBox')
+    if crop:
+        attributes[b'CropBox'] = crop
+    rotate = _int(data, b'Rotate')
+    if rotate is not None:
+        attributes[b'Rotate'] = rotate
+    count = _int(head, b'Count')
+    return attributes, count or 1
+
+
+def read_geometry(path):
+    """Return the PdfGeometry of the first page of a PDF file."""
+    file_size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        if f.read(5) != b'%PDF-':
+            raise PdfGeometryError(f'{path} is not a PDF file')
+        method = 'xref'
+        try:
+            attributes, pages = _read_via_xref(f, file_size)
+        except (PdfGeometryError, ValueError):
+            method = 'scan'
+            attributes, pages = _read_via_scan(f)
+
+    media = attributes[b'MediaBox']
+    return PdfGeometry(
+        path=str(path),
+        file_size=file_size,
+        media_box=media,
+        crop_box=attributes.get(b'CropBox', media),
+        rotate=attributes.get(b'Rotate', 0) % 360,
+        pages=pages,
+        method=method,
+    )
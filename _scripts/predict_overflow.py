@@ -0,0 +1,409 @@
+"""
+Static overflow prediction for lesson frames.
+
+Estimates the vertical fill of every frame from the parsed frame model
+(item counts, wrapped line lengths at 8pt, chart width x aspect ratio
+from the chart registry, column layout and bottomnote) without running
+pdflatex. The estimator is calibrated against the Overfull \\vbox
+warnings in cached pdflatex logs (module_XX/temp/*.log, written by
+compile_all_lessons.py), so candidate layouts can be screened before any
+compile.
+
+Usage:
+    python _scripts/predict_overflow.py                  # Report predicted overflows
+    python _scripts/predict_overflow.py --calibrate      # Refit against cached logs
+    python _scripts/predict_overflow.py --module module_02_blockchain
+"""
+
+import argparse
+import json
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from chart_registry import aspect_ratio
+from frame_model import (INCLUDEGRAPHICS, figure_width, frame_at_line,
+                         layout_blocks, parse_tex_file, resolve_figure)
+
+
+PROJECT_DIR = Path(__file__).parent.parent
+MODULE_DIRS = [
+    PROJECT_DIR / 'module_01_fintech',
+    PROJECT_DIR / 'module_02_blockchain',
+    PROJECT_DIR / 'module_03_ai_ml',
+    PROJECT_DIR / 'module_04_traditional',
+]
+CALIBRATION_FILE = Path(__file__).parent / 'overflow_calibration.json'
+
+# Beamer 8pt, aspectratio=169, 5mm text margins (see template_beamer_final.tex)
+PT_PER_MM = 2.845
+TEXT_WIDTH_PT = 150 * PT_PER_MM
+TEXT_HEIGHT_PT = 90 * PT_PER_MM - 40.0   # minus frame title and Madrid footline
+COLUMN_SEP_PT = 0.04 * TEXT_WIDTH_PT
+AVG_CHAR_EM = 0.5                        # average glyph width relative to font size
+DEFAULT_ASPECT = 10 / 6                  # figsize=(10, 6), the chart template default
+
+# (font size, baselineskip) in pt for the Beamer 8pt size class
+FONT_SIZES = {
+    'tiny': (5.0, 6.0),
+    'scriptsize': (6.0, 7.0),
+    'footnotesize': (6.5, 7.5),
+    'small': (7.0, 8.5),
+    'normalsize': (8.0, 9.5),
+    'large': (9.0, 11.0),
+}
+LIST_SKIP_PT = 3.0      # topsep around itemize/enumerate
+ITEM_SKIP_PT = 1.5      # itemsep between items
+TABLE_ROW_FACTOR = 1.2  # tabular rows are a little taller than text lines
+BOTTOMNOTE_PT = 14.0    # rule + spacing + one footnotesize line
+
+DEFAULT_CALIBRATION = {'text': 1.0, 'graphics': 1.0, 'skip': 1.0, 'samples': 0}
+
+SIZE_COMMAND = re.compile(r'\\(' + '|'.join(FONT_SIZES) + r')\b')
+VSPACE = re.compile(r'\\vspace\*?\{(-?[\d.]+)\s*(mm|cm|pt|em|ex)\}')
+OVERFULL_VBOX = re.compile(r'Overfull \\vbox \((\d+\.?\d*)pt too high\) detected at line (\d+)')
+
+
+@dataclass
+class ColumnEstimate:
+    """Height components of one column, in pt."""
+    text: float
+    graphics: float
+    skip: float
+
+    def height(self, cal, graphic_scale=1.0):
+        return (cal['text'] * self.text
+                + cal['graphics'] * self.graphics * graphic_scale
+                + cal['skip'] * self.skip)
+
+
+@dataclass
+class FrameEstimate:
+    """Static layout estimate for a single frame."""
+    tex_path: Path
+    title: str
+    start: int
+    end: int
+    blocks: list        # list of lists of ColumnEstimate
+    bottomnote: float
+    graphics_count: int
+
+    def height(self, cal, graphic_scale=1.0):
+        total = self.bottomnote * cal['skip']
+        for columns in self.blocks:
+            total += max(col.height(cal, graphic_scale) for col in columns)
+        return total
+
+    def fill(self, cal, graphic_scale=1.0):
+        """Predicted vertical fill as a fraction of the usable text height."""
+        return self.height(cal, graphic_scale) / TEXT_HEIGHT_PT
+
+    def overflow_pt(self, cal, graphic_scale=1.0):
+        return max(0.0, self.height(cal, graphic_scale) - TEXT_HEIGHT_PT)
+
+    def dominant_components(self, cal):
+        """Sum the components of the tallest column in each block."""
+        text = graphics = 0.0
+        skip = self.bottomnote
+        for columns in self.blocks:
+            col = max(columns, key=lambda c: c.height(cal))
+            text += col.text
+            graphics += col.graphics
+            skip += col.skip
+        return text, graphics, skip
+
+    def max_graphic_scale(self, cal, candidates):
+        """Return the largest candidate chart scale that still fits, or None."""
+        fitting = [s for s in candidates if self.height(cal, s) <= TEXT_HEIGHT_PT]
+        return max(fitting) if fitting else None
+
+
+def to_pt(value, unit, font_size):
+    """Convert a LaTeX length to points."""
+    factors = {'pt': 1.0, 'mm': PT_PER_MM, 'cm': 10 * PT_PER_MM,
+               'em': font_size, 'ex': 0.45 * font_size}
+    return float(value) * factors[unit]
+
+
+def visible_length(line):
+    """Approximate number of printed characters in a LaTeX source line."""
+    text = re.sub(r'\\(?:begin|end)\{[^}]*\}(?:\[[^\]]*\])?', '', line)
+    text = re.sub(r'\\(?:item|textbf|textit|emph|texttt|textcolor\{[^}]*\})', '', text)
+    text = re.sub(r'\\[a-zA-Z]+\*?(?:\[[^\]]*\])?', '', text)
+    text = re.sub(r'[{}$\\&]', '', text)
+    return len(text.strip())
+
+
+def wrapped_lines(length, width_pt, font_size):
+    """Number of output lines for a paragraph of the given length."""
+    if length <= 0:
+        return 0
+    chars_per_line = max(1, int(width_pt / (AVG_CHAR_EM * font_size)))
+    return -(-length // chars_per_line)
+
+
+def estimate_column(tex_path, lines, width_pt, font):
+    """Estimate the height components of a run of lines at a given width."""
+    text = graphics = skip = 0.0
+    size, leading = FONT_SIZES[font]
+    in_table = False
+    count = 0
+
+    for _, line in lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+
+        size_match = SIZE_COMMAND.search(stripped)
+        if size_match:
+            font = size_match.group(1)
+            size, leading = FONT_SIZES[font]
+
+        for match in VSPACE.finditer(stripped):
+            skip += to_pt(match.group(1), match.group(2), size)
+
+        if re.search(r'\\begin\{(itemize|enumerate)\}', stripped):
+            skip += LIST_SKIP_PT
+            continue
+        if re.search(r'\\end\{(itemize|enumerate)\}', stripped):
+            skip += LIST_SKIP_PT
+            continue
+        if '\\begin{tabular}' in stripped:
+            in_table = True
+            skip += LIST_SKIP_PT
+            continue
+        if '\\end{tabular}' in stripped:
+            in_table = False
+            continue
+
+        figure = INCLUDEGRAPHICS.search(stripped)
+        if figure:
+            fraction = figure_width(figure.group(1)) or 1.0
+            pdf_path = resolve_figure(tex_path, figure.group(2))
+            graphics += fraction * width_pt / aspect_ratio(pdf_path, DEFAULT_ASPECT)
+            count += 1
+            continue
+
+        if in_table:
+            if '\\\\' in stripped and not re.fullmatch(r'\\(?:top|mid|bottom)rule|\\hline', stripped):
+                text += TABLE_ROW_FACTOR * leading
+            continue
+
+        if stripped.startswith('\\item'):
+            skip += ITEM_SKIP_PT
+            indent = 1.5 * size
+            text += wrapped_lines(visible_length(stripped), width_pt - indent, size) * leading
+            continue
+
+        length = visible_length(stripped)
+        if length:
+            text += wrapped_lines(length, width_pt, size) * leading
+
+    return ColumnEstimate(text, graphics, skip), font, count
+
+
+def estimate_frame(tex_path, frame):
+    """Build a FrameEstimate for one parsed frame."""
+    font = 'normalsize'
+    blocks = []
+    graphics_count = 0
+
+    for block in layout_blocks(frame):
+        if block.preamble:
+            _, font, _ = estimate_column(tex_path, block.preamble, TEXT_WIDTH_PT, font)
+
+        columns = []
+        block_font = font
+        for column in block.columns:
+            width_pt = column.width * TEXT_WIDTH_PT
+            if len(block.columns) > 1:
+                width_pt -= COLUMN_SEP_PT / 2
+            estimate, end_font, count = estimate_column(tex_path, column.lines, width_pt, block_font)
+            columns.append(estimate)
+            graphics_count += count
+            if len(block.columns) == 1:
+                font = end_font
+        blocks.append(columns)
+
+    bottomnote = BOTTOMNOTE_PT if frame.bottomnote is not None else 0.0
+    if frame.bottomnote:
+        size, leading = FONT_SIZES['footnotesize']
+        extra = wrapped_lines(visible_length(frame.bottomnote), TEXT_WIDTH_PT, size) - 1
+        bottomnote += max(0, extra) * leading
+
+    return FrameEstimate(
+        tex_path=Path(tex_path),
+        title=frame.title,
+        start=frame.start,
+        end=frame.end,
+        blocks=blocks,
+        bottomnote=bottomnote,
+        graphics_count=graphics_count,
+    )
+
+
+def estimate_lesson(tex_path):
+    """Estimate all content frames in a lesson file."""
+    frames = parse_tex_file(tex_path)
+    return [estimate_frame(tex_path, f) for f in frames if not f.is_title_frame]
+
+
+def find_lessons(module_filter=None):
+    """List lesson .tex files in the module source folders."""
+    lessons = []
+    for module_dir in MODULE_DIRS:
+        if module_filter and module_dir.name != module_filter:
+            continue
+        lessons.extend(sorted(module_dir.glob('lesson_*.tex')))
+    return lessons
+
+
+def cached_log(tex_path):
+    """Locate the most recent pdflatex log for a lesson, if any."""
+    for candidate in (tex_path.parent / 'temp' / f'{tex_path.stem}.log',
+                      tex_path.with_suffix('.log')):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def observed_overflows(tex_path):
+    """Map frame start line -> reported overflow (pt) from a cached log."""
+    log_path = cached_log(tex_path)
+    if log_path is None:
+        return None
+
+    log = log_path.read_text(encoding='utf-8', errors='replace')
+    frames = parse_tex_file(tex_path)
+    observed = {}
+    for match in OVERFULL_VBOX.finditer(log):
+        frame = frame_at_line(frames, int(match.group(2)))
+        if frame:
+            observed[frame.start] = max(observed.get(frame.start, 0.0), float(match.group(1)))
+    return observed
+
+
+def solve_least_squares(rows, targets):
+    """Solve the normal equations for a small dense system (Gaussian elimination)."""
+    n = len(rows[0])
+    ata = [[sum(r[i] * r[j] for r in rows) for j in range(n)] for i in range(n)]
+    atb = [sum(r[i] * t for r, t in zip(rows, targets)) for i in range(n)]
+
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(ata[r][col]))
+        if abs(ata[pivot][col]) < 1e-9:
+            return None
+        ata[col], ata[pivot] = ata[pivot], ata[col]
+        atb[col], atb[pivot] = atb[pivot], atb[col]
+        for r in range(n):
+            if r != col:
+                factor = ata[r][col] / ata[col][col]
+                for c in range(col, n):
+                    ata[r][c] -= factor * ata[col][c]
+                atb[r] -= factor * atb[col]
+    return [atb[i] / ata[i][i] for i in range(n)]
+
+
+def calibrate(lessons):
+    """Fit component weights against cached Overfull \\vbox diagnostics.
+
+    Frames reported as overflowing give an exact target height
+    (text height + overflow); frames in a logged lesson without a warning
+    are used only to score the fitted model.
+    """
+    rows, targets, clean = [], [], []
+    for tex_path in lessons:
+        observed = observed_overflows(tex_path)
+        if observed is None:
+            continue
+        for estimate in estimate_lesson(tex_path):
+            components = estimate.dominant_components(DEFAULT_CALIBRATION)
+            if estimate.start in observed:
+                rows.append(components)
+                targets.append(TEXT_HEIGHT_PT + observed[estimate.start])
+            else:
+                clean.append(estimate)
+
+    calibration = dict(DEFAULT_CALIBRATION)
+    if len(rows) >= 6:
+        weights = solve_least_squares(rows, targets)
+        if weights and all(w > 0 for w in weights):
+            calibration.update(text=weights[0], graphics=weights[1], skip=weights[2])
+    calibration['samples'] = len(rows)
+
+    if rows:
+        errors = [abs(sum(w * x for w, x in zip((calibration['text'], calibration['graphics'],
+                                                  calibration['skip']), r)) - t)
+                  for r, t in zip(rows, targets)]
+        calibration['mean_abs_error_pt'] = round(sum(errors) / len(errors), 2)
+    if clean:
+        fits = sum(1 for e in clean if e.height(calibration) <= TEXT_HEIGHT_PT)
+        calibration['clean_frames_agreement'] = round(fits / len(clean), 3)
+
+    return calibration
+
+
+def load_calibration():
+    """Load fitted weights, falling back to the uncalibrated model."""
+    if CALIBRATION_FILE.exists():
+        with open(CALIBRATION_FILE, encoding='utf-8') as f:
+            return {**DEFAULT_CALIBRATION, **json.load(f)}
+    return dict(DEFAULT_CALIBRATION)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Predict frame overflows without pdflatex')
+    parser.add_argument('--module', type=str, help='Check a specific module only')
+    parser.add_argument('--calibrate', action='store_true',
+                        help='Refit weights against cached pdflatex logs')
+    parser.add_argument('--threshold', type=float, default=1.0,
+                        help='Report frames with predicted fill above this fraction')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("STATIC OVERFLOW PREDICTION")
+    print("=" * 70)
+
+    lessons = find_lessons(args.module)
+
+    if args.calibrate:
+        calibration = calibrate(lessons)
+        with open(CALIBRATION_FILE, 'w', encoding='utf-8') as f:
+            json.dump(calibration, f, indent=2)
+        print(f"Calibrated on {calibration['samples']} logged overflows -> {CALIBRATION_FILE.name}")
+        for key, value in calibration.items():
+            print(f"  {key}: {value}")
+    calibration = load_calibration()
+
+    start = time.perf_counter()
+    estimates = []
+    for tex_path in lessons:
+        estimates.extend(estimate_lesson(tex_path))
+    elapsed = time.perf_counter() - start
+
+    scales = [s / 100 for s in range(50, 101, 5)]
+    flagged = 0
+    current = None
+    for estimate in estimates:
+        fill = estimate.fill(calibration)
+        if fill <= args.threshold:
+            continue
+        if estimate.tex_path != current:
+            current = estimate.tex_path
+            print(f"\n{current.parent.name}/{current.name}:")
+        flagged += 1
+        line = f"  line {estimate.start:4d}: {fill * 100:5.1f}% \"{estimate.title[:40]}\""
+        if estimate.graphics_count:
+            scale = estimate.max_graphic_scale(calibration, scales)
+            line += f"  -> charts at {scale:.2f}x" if scale else "  -> split frame"
+        print(line)
+
+    print("\n" + "=" * 70)
+    print(f"Frames estimated: {len(estimates)} in {elapsed * 1000:.0f} ms")
+    print(f"Predicted overflows: {flagged}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -10,14 +10,15 @@ This script:
 5. Generates file manifest
 """
 
-import os
 import shutil
 import re
 from pathlib import Path
 from datetime import datetime
 
-# Base directory
-BASE_DIR = Path(r"D:\Joerg\Research\slides\DigitalFinance_3")
+from generate_manifest import generate_manifest as build_manifest
+
+# Base directory (the repository root)
+BASE_DIR = Path(__file__).resolve().parent.parent
 
 # Module directories
 MODULES = [
@@ -229,114 +230,17 @@ def generate_file_manifest():
     """
     Generate manifest.txt listing all files to be committed.
     Excludes temp/, previous/, and system files.
+
+    Delegates to generate_manifest.py, which also writes manifest.json
+    (size/mtime/SHA-256 per file) and the manifest_delta.txt upload list.
     """
     print("\n" + "="*70)
     print("TASK 5: Generating file manifest")
     print("="*70)
 
-    manifest_path = BASE_DIR / "manifest.txt"
-
-    # Patterns to exclude
-    exclude_patterns = [
-        'temp/',
-        'previous/',
-        '__pycache__/',
-        '.aux',
-        '.log',
-        '.nav',
-        '.snm',
-        '.toc',
-        '.out',
-        'manifest.txt',
-        'reorganize_for_github.py',
-        'nul'
-    ]
-
-    files_to_commit = []
-
-    # Walk through all files
-    for root, dirs, files in os.walk(BASE_DIR):
-        # Skip excluded directories
-        dirs[:] = [d for d in dirs if not any(excl.rstrip('/') in d for excl in exclude_patterns)]
-
-        for file in files:
-            file_path = Path(root) / file
-            rel_path = file_path.relative_to(BASE_DIR)
-            rel_path_str = str(rel_path).replace('\\', '/')
-
-            # Skip excluded files
-            if any(excl in rel_path_str for excl in exclude_patterns):
-                continue
-
-            files_to_commit.append(rel_path_str)
-
-    # Sort files
-    files_to_commit.sort()
-
-    # Group by category
-    categories = {
-        'Module 01 - FinTech': [],
-        'Module 02 - Blockchain': [],
-        'Module 03 - AI/ML': [],
-        'Module 04 - Traditional': [],
-        'Assessments': [],
-        'Syllabus': [],
-        'Demos': [],
-        'Charts': [],
-        'Docs (GitHub Pages)': [],
-        'Other': []
-    }
-
-    for file_path in files_to_commit:
-        if file_path.startswith('module_01_fintech/'):
-            categories['Module 01 - FinTech'].append(file_path)
-        elif file_path.startswith('module_02_blockchain/'):
-            categories['Module 02 - Blockchain'].append(file_path)
-        elif file_path.startswith('module_03_ai_ml/'):
-            categories['Module 03 - AI/ML'].append(file_path)
-        elif file_path.startswith('module_04_traditional/'):
-            categories['Module 04 - Traditional'].append(file_path)
-        elif file_path.startswith('assessments/'):
-            categories['Assessments'].append(file_path)
-        elif file_path.startswith('syllabus/'):
-            categories['Syllabus'].append(file_path)
-        elif file_path.startswith('demos/'):
-            categories['Demos'].append(file_path)
-        elif file_path.startswith('charts/'):
-            categories['Charts'].append(file_path)
-        elif file_path.startswith('docs/'):
-            categories['Docs (GitHub Pages)'].append(file_path)
-        else:
-            categories['Other'].append(file_path)
-
-    # Write manifest
-    with open(manifest_path, 'w', encoding='utf-8') as f:
-        f.write("="*70 + "\n")
-        f.write("DIGITAL FINANCE COURSE - FILE MANIFEST\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write("="*70 + "\n\n")
-
-        total_files = 0
-        for category, files in categories.items():
-            if files:
-                f.write(f"\n{category} ({len(files)} files)\n")
-                f.write("-" * 70 + "\n")
-                for file_path in files:
-                    f.write(f"  {file_path}\n")
-                total_files += len(files)
-
-        f.write("\n" + "="*70 + "\n")
-        f.write(f"TOTAL: {total_files} files\n")
-        f.write("="*70 + "\n")
-
+    manifest_path, total_files = build_manifest()
     print(f"Generated manifest.txt with {total_files} files")
 
-    # Print summary
-    print("\nFile count by category:")
-    for category, files in categories.items():
-        if files:
-            print(f"  {category}: {len(files)} files")
-
     return manifest_path
 
 
@@ -1,14 +1,20 @@
 #!/usr/bin/env python3
 """
 Verify repository structure is ready for GitHub deployment.
+
+All checks read from a single fs_snapshot.Snapshot; the same snapshot
+drives check_status.py.
 """
 
 from pathlib import Path
 from datetime import datetime
 
-BASE_DIR = Path(r"D:\Joerg\Research\slides\DigitalFinance_3")
+from check_status import MODULES, check_artifacts
+from fs_snapshot import build_snapshot
+
+BASE_DIR = Path(__file__).parent.parent
 
-def check_structure():
+def check_structure(snapshot):
     """Verify folder structure."""
     print("="*70)
     print("REPOSITORY STRUCTURE VERIFICATION")
@@ -35,8 +41,7 @@ def check_structure():
     print("\nFOLDER STRUCTURE:")
     all_exist = True
     for folder, desc in required_folders.items():
-        folder_path = BASE_DIR / folder
-        exists = folder_path.exists()
+        exists = snapshot.exists(folder)
         status = "OK" if exists else "MISSING"
         print(f"  [{status}] {folder:30s} - {desc}")
         if not exists:
@@ -45,7 +50,7 @@ def check_structure():
     return all_exist
 
 
-def check_files():
+def check_files(snapshot):
     """Check critical files exist."""
     print("\n" + "="*70)
     print("CRITICAL FILES")
@@ -63,8 +68,7 @@ def check_files():
 
     all_exist = True
     for filename, desc in critical_files.items():
-        file_path = BASE_DIR / filename
-        exists = file_path.exists()
+        exists = filename in snapshot
         status = "OK" if exists else "MISSING"
         print(f"  [{status}] {filename:35s} - {desc}")
         if not exists:
@@ -73,30 +77,22 @@ def check_files():
     return all_exist
 
 
-def count_lessons():
+def count_lessons(snapshot):
     """Count lesson files."""
     print("\n" + "="*70)
     print("LESSON FILE COUNTS")
     print("="*70)
 
-    modules = [
-        'module_01_fintech',
-        'module_02_blockchain',
-        'module_03_ai_ml',
-        'module_04_traditional'
-    ]
-
     total_tex = 0
     total_pdf = 0
     total_missing = 0
 
-    for module in modules:
-        module_path = BASE_DIR / module
-        if not module_path.exists():
+    for module in MODULES:
+        if not snapshot.exists(module):
             continue
 
-        tex_files = list(module_path.glob("lesson_*.tex"))
-        pdf_files = list(module_path.glob("lesson_*.pdf"))
+        tex_files = snapshot.glob(f"{module}/lesson_*.tex")
+        pdf_files = snapshot.glob(f"{module}/lesson_*.pdf")
 
         tex_count = len(tex_files)
         pdf_count = len(pdf_files)
@@ -119,33 +115,24 @@ def count_lessons():
     return total_tex, total_pdf, total_missing
 
 
-def check_slides_folder():
+def check_slides_folder(snapshot):
     """Check slides/ folder organization."""
     print("\n" + "="*70)
     print("SLIDES FOLDER VERIFICATION")
     print("="*70)
 
-    slides_dir = BASE_DIR / "slides"
-    if not slides_dir.exists():
+    if not snapshot.exists("slides"):
         print("  ERROR: slides/ folder not found")
         return False
 
-    modules = [
-        'module_01_fintech',
-        'module_02_blockchain',
-        'module_03_ai_ml',
-        'module_04_traditional'
-    ]
-
     total_files = 0
-    for module in modules:
-        module_path = slides_dir / module
-        if not module_path.exists():
+    for module in MODULES:
+        if not snapshot.exists(f"slides/{module}"):
             print(f"  MISSING: slides/{module}/")
             continue
 
-        tex_count = len(list(module_path.glob("lesson_*.tex")))
-        pdf_count = len(list(module_path.glob("lesson_*.pdf")))
+        tex_count = len(snapshot.glob(f"slides/{module}/lesson_*.tex"))
+        pdf_count = len(snapshot.glob(f"slides/{module}/lesson_*.pdf"))
         total = tex_count + pdf_count
         total_files += total
 
@@ -155,43 +142,32 @@ def check_slides_folder():
     return total_files > 0
 
 
-def check_docs_folder():
+def check_docs_folder(snapshot):
     """Check docs/ folder for GitHub Pages."""
     print("\n" + "="*70)
     print("DOCS FOLDER VERIFICATION (GitHub Pages)")
     print("="*70)
 
-    docs_dir = BASE_DIR / "docs"
-    if not docs_dir.exists():
+    if not snapshot.exists("docs"):
         print("  ERROR: docs/ folder not found")
         return False
 
     # Check index.html
-    index_html = docs_dir / "index.html"
-    if index_html.exists():
-        size = index_html.stat().st_size
+    if "docs/index.html" in snapshot:
+        size = snapshot.files["docs/index.html"].size
         print(f"  OK: index.html ({size:,} bytes)")
     else:
         print("  MISSING: index.html")
 
     # Check slides PDFs
-    docs_slides = docs_dir / "slides"
-    if not docs_slides.exists():
+    if not snapshot.exists("docs/slides"):
         print("  ERROR: docs/slides/ folder not found")
         return False
 
-    modules = [
-        'module_01_fintech',
-        'module_02_blockchain',
-        'module_03_ai_ml',
-        'module_04_traditional'
-    ]
-
     total_pdfs = 0
-    for module in modules:
-        module_path = docs_slides / module
-        if module_path.exists():
-            pdf_count = len(list(module_path.glob("lesson_*.pdf")))
+    for module in MODULES:
+        if snapshot.exists(f"docs/slides/{module}"):
+            pdf_count = len(snapshot.glob(f"docs/slides/{module}/lesson_*.pdf"))
             total_pdfs += pdf_count
             print(f"  {module}: {pdf_count} PDFs")
 
@@ -199,35 +175,19 @@ def check_docs_folder():
     return total_pdfs > 0
 
 
-def check_unwanted_files():
+def check_unwanted_files(snapshot):
     """Check for files that should be excluded."""
     print("\n" + "="*70)
     print("UNWANTED FILES CHECK")
     print("="*70)
 
-    unwanted_patterns = [
-        '**/*.aux',
-        '**/*.log',
-        '**/*.nav',
-        '**/*.snm',
-        '**/*.toc',
-        '**/*.out',
-    ]
-
-    unwanted_found = []
-
-    for pattern in unwanted_patterns:
-        files = list(BASE_DIR.glob(pattern))
-        # Exclude temp/ and previous/ folders
-        files = [f for f in files if 'temp' not in str(f) and 'previous' not in str(f)]
-
-        if files:
-            unwanted_found.extend(files)
+    # Compilation artifacts outside temp/ and previous/ folders
+    unwanted_found = check_artifacts(snapshot)
 
     if unwanted_found:
         print(f"  WARNING: {len(unwanted_found)} unwanted files found (should be in temp/):")
         for f in unwanted_found[:10]:
-            print(f"    {f.relative_to(BASE_DIR)}")
+            print(f"    {f}")
         if len(unwanted_found) > 10:
             print(f"    ... and {len(unwanted_found) - 10} more")
     else:
@@ -244,13 +204,14 @@ def main():
     print(f"Location: {BASE_DIR}")
     print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-    # Run checks
-    structure_ok = check_structure()
-    files_ok = check_files()
-    tex_count, pdf_count, missing_count = count_lessons()
-    slides_ok = check_slides_folder()
-    docs_ok = check_docs_folder()
-    no_unwanted = check_unwanted_files()
+    # Run checks against one snapshot of the tree
+    snapshot = build_snapshot()
+    structure_ok = check_structure(snapshot)
+    files_ok = check_files(snapshot)
+    tex_count, pdf_count, missing_count = count_lessons(snapshot)
+    slides_ok = check_slides_folder(snapshot)
+    docs_ok = check_docs_folder(snapshot)
+    no_unwanted = check_unwanted_files(snapshot)
 
     # Summary
     print("\n" + "="*70)
@@ -0,0 +1,6 @@
+"""
+Chart support code for the Digital Finance course.
+
+Chart scripts import the shared style layer as ``charts._shared``; the
+chart runners (generate_all_charts.py) put the project root on the path.
+"""
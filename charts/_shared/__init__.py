@@ -0,0 +1,54 @@
+"""
+Shared chart utilities: color palettes and named matplotlib style presets.
+
+    from charts._shared import chart_style, MLPURPLE
+
+    with chart_style('lesson'):
+        fig, ax = plt.subplots()
+
+Importing the package selects the headless Agg backend (see bootstrap.py),
+so import it before matplotlib.pyplot. Everything else is imported on
+first use: `from charts._shared import MLBLUE` loads colors.py only, and
+matplotlib is not imported until a name that needs it is asked for.
+
+Submodules loaded on demand: data (seeded, disk-cached synthetic data
+sets) and specs (declarative chart specs and their batch renderer).
+"""
+
+import importlib
+
+from .bootstrap import distribution, force_headless_backend, import_times, lazy_import
+
+force_headless_backend()
+
+# Public names by submodule, imported on first attribute access (PEP 562)
+_EXPORTS = {
+    'annotations': ('TextBatch', 'bar_labels', 'cell_labels', 'point_labels'),
+    'colors': ('ACCENTS', 'CATEGORICAL', 'COLORS', 'DIVERGING', 'MLBLUE', 'MLGRAY',
+               'MLGREEN', 'MLLAVENDER', 'MLORANGE', 'MLPURPLE', 'MLRED',
+               'SERIES_COLORS', 'get_color'),
+    'determinism': ('deterministic_mode', 'is_deterministic', 'seed_everything'),
+    'fonts': ('FONT_EMBEDDING', 'apply_font_embedding', 'font_rcparams',
+              'warm_font_cache', 'write_build_matplotlibrc'),
+    'output': ('OUTPUT_FORMATS', 'save_chart'),
+    'styles': ('STYLE_PRESETS', 'add_synthetic_label', 'apply_chart_style',
+               'apply_compact_style', 'apply_presentation_style', 'chart_style',
+               'get_style', 'setup_figure', 'use_style'),
+}
+_LAZY = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = ['distribution', 'force_headless_backend', 'import_times', 'lazy_import',
+           *_LAZY]
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
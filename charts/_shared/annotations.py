@@ -0,0 +1,367 @@
+"""
+Batched text annotation for charts.
+
+Each ax.text()/ax.annotate() call creates a separate Text artist with its
+own font properties, transform and layout cache; on dense charts (heat
+maps, long bar series, labelled scatters) creating and drawing these
+artists dominates render time. The helpers below put all labels of one
+call into a single TextBatch artist that lays out and draws every label
+through one shared Text:
+
+    bar_labels(ax, bars, fmt='{:.0f}%')
+    cell_labels(ax, matrix, fmt='{:.2f}', colors=('white', 'black'), threshold=50)
+    point_labels(ax, x, y, names)            # places labels without overlaps
+
+Run charts/_shared/annotation_benchmark.py for timings against the
+per-label loops.
+"""
+
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.text import Text
+from matplotlib.transforms import Bbox, IdentityTransform
+
+# Label positions tried by point_labels, in order: (dx, dy) sign, ha, va
+PLACEMENTS = [
+    ((1, 1), 'left', 'bottom'),
+    ((1, -1), 'left', 'top'),
+    ((-1, 1), 'right', 'bottom'),
+    ((-1, -1), 'right', 'top'),
+    ((0, 1), 'center', 'bottom'),
+    ((0, -1), 'center', 'top'),
+    ((1, 0), 'left', 'center'),
+    ((-1, 0), 'right', 'center'),
+]
+
+
+class TextBatch(Artist):
+    """Many text labels drawn by one artist.
+
+    positions: (N, 2) anchor points in the artist's transform (data
+    coordinates by default). texts: N strings. offsets: optional (N, 2)
+    offsets in points. colors: optional N colors. alignments: optional N
+    (ha, va) pairs. Remaining keyword arguments are Text properties shared
+    by all labels (fontsize, ha, va, fontweight, color, bbox, ...).
+
+    Plain single-line labels are measured once per distinct string and
+    drawn straight through the renderer; labels with mathtext, newlines,
+    rotation or a bbox go through a shared Text object.
+    """
+
+    zorder = 3
+
+    def __init__(self, positions, texts, offsets=None, colors=None, alignments=None,
+                 **text_kwargs):
+        super().__init__()
+        self.positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        self.texts = [str(t) for t in texts]
+        if len(self.texts) != len(self.positions):
+            raise ValueError(f"{len(self.texts)} labels for {len(self.positions)} positions")
+        self.offsets = (np.zeros_like(self.positions) if offsets is None
+                        else np.asarray(offsets, dtype=float).reshape(-1, 2))
+        self.colors = colors
+        self.alignments = alignments        # optional N (ha, va) pairs
+        self.visible_mask = np.ones(len(self.texts), dtype=bool)
+        self._template = Text(0, 0, '', **text_kwargs)
+        self._template.set_transform(IdentityTransform())
+        self._base_alignment = (self._template.get_ha(), self._template.get_va())
+        self._metrics = {}
+        self._metrics_key = None
+
+    def set_figure(self, fig):
+        super().set_figure(fig)
+        self._template.set_figure(fig)
+
+    def _simple(self, text):
+        """True if a label can bypass Text layout."""
+        template = self._template
+        return ('$' not in text and '\n' not in text and template.get_rotation() == 0
+                and template.get_bbox_patch() is None and not template.get_usetex())
+
+    def _measure(self, renderer, text):
+        """(width, height, descent) of a single-line label, cached per string."""
+        key = renderer.points_to_pixels(1.0)
+        if key != self._metrics_key:
+            self._metrics = {}
+            self._metrics_key = key
+        metrics = self._metrics.get(text)
+        if metrics is None:
+            prop = self._template.get_fontproperties()
+            metrics = self._metrics[text] = renderer.get_text_width_height_descent(
+                text, prop, ismath=False)
+        return metrics
+
+    def _layout(self, renderer):
+        """Baseline origin and size of every visible label.
+
+        Returns (indices, x, y, w, h, d) in display coordinates; labels
+        that need full Text layout are returned with w = NaN.
+        """
+        indices = np.flatnonzero(self.visible_mask)
+        anchors = (self.get_transform().transform(self.positions[indices])
+                   + self.offsets[indices] * renderer.points_to_pixels(1.0))
+        _, lp_h, lp_d = self._measure(renderer, 'lp')
+        size = np.full((len(indices), 3), np.nan)
+        for k, i in enumerate(indices):
+            if self._simple(self.texts[i]):
+                w, h, d = self._measure(renderer, self.texts[i])
+                size[k] = w, max(h, lp_h), max(d, lp_d)
+        w, h, d = size.T
+
+        if self.alignments is None:
+            ha = np.full(len(indices), self._base_alignment[0], dtype=object)
+            va = np.full(len(indices), self._base_alignment[1], dtype=object)
+        else:
+            ha = np.array([self.alignments[i][0] for i in indices], dtype=object)
+            va = np.array([self.alignments[i][1] for i in indices], dtype=object)
+        x = anchors[:, 0] - w * np.select([ha == 'center', ha == 'right'], [0.5, 1.0], 0.0)
+        y = anchors[:, 1] + np.select(
+            [va == 'bottom', va == 'top', va == 'center', va == 'center_baseline'],
+            [d, d - h, d - h / 2, -(h - d) / 2], 0.0)
+        return indices, x, y, w, h, d
+
+    def _configure_template(self, i, anchor):
+        template = self._template
+        template.set_position(anchor)
+        template.set_text(self.texts[i])
+        if self.colors is not None:
+            template.set_color(self.colors[i])
+        ha, va = self.alignments[i] if self.alignments is not None else self._base_alignment
+        template.set_horizontalalignment(ha)
+        template.set_verticalalignment(va)
+        return template
+
+    def draw(self, renderer):
+        if not self.get_visible() or not len(self.texts):
+            return
+        self.prepare(renderer)
+        indices, x, y, w, _, _ = self._layout(renderer)
+        anchors = (self.get_transform().transform(self.positions)
+                   + self.offsets * renderer.points_to_pixels(1.0))
+        if renderer.flipy():
+            y = renderer.get_canvas_width_height()[1] - y
+        template = self._template
+        prop = template.get_fontproperties()
+
+        renderer.open_group('textbatch', gid=self.get_gid())
+        gc = renderer.new_gc()
+        gc.set_alpha(template.get_alpha())
+        gc.set_url(template.get_url())
+        gc.set_foreground(template.get_color())
+        for k, i in enumerate(indices):
+            if np.isnan(w[k]):
+                self._configure_template(i, anchors[i]).draw(renderer)
+                continue
+            if self.colors is not None:
+                gc.set_foreground(self.colors[i])
+            renderer.draw_text(gc, x[k], y[k], self.texts[i], prop, 0, ismath=False)
+        gc.restore()
+        renderer.close_group('textbatch')
+        self.stale = False
+
+    def prepare(self, renderer):
+        """Hook for subclasses that lay labels out at draw time."""
+
+    def get_window_extent(self, renderer=None):
+        if renderer is None:
+            renderer = self.figure._get_renderer()
+        self.prepare(renderer)
+        indices, x, y, w, h, d = self._layout(renderer)
+        if not len(indices):
+            return Bbox.null()
+        boxes = []
+        simple = ~np.isnan(w)
+        if simple.any():
+            boxes.append(Bbox([[x[simple].min(), (y - d)[simple].min()],
+                               [(x + w)[simple].max(), (y - d + h)[simple].max()]]))
+        if not simple.all():
+            anchors = (self.get_transform().transform(self.positions)
+                       + self.offsets * renderer.points_to_pixels(1.0))
+            for i in indices[~simple]:
+                boxes.append(self._configure_template(i, anchors[i]).get_window_extent(renderer))
+        return Bbox.union(boxes)
+
+
+class PointLabels(TextBatch):
+    """TextBatch that places each label beside its point without overlaps.
+
+    Labels are placed greedily in the given order (earlier labels win),
+    trying the PLACEMENTS around each point; a grid of occupied cells
+    keeps the overlap test close to constant time per label. Labels with
+    no free placement are hidden unless keep_all is set, in which case
+    they keep their first placement.
+    """
+
+    def __init__(self, positions, texts, distance=4, keep_all=False, **text_kwargs):
+        super().__init__(positions, texts, **text_kwargs)
+        self.distance = distance
+        self.keep_all = keep_all
+        self._layout_key = None
+
+    def prepare(self, renderer):
+        key = (self.get_transform().get_matrix().tobytes(), renderer.points_to_pixels(1.0))
+        if key == self._layout_key:
+            return
+        self._layout_key = key
+
+        n = len(self.texts)
+        pad = renderer.points_to_pixels(1.0)
+        anchors = self.get_transform().transform(self.positions)
+        template = self._template
+
+        # Label sizes in pixels
+        sizes = np.empty((n, 2))
+        _, lp_h, lp_d = self._measure(renderer, 'lp')
+        for i, text in enumerate(self.texts):
+            if self._simple(text):
+                w, h, d = self._measure(renderer, text)
+                h = max(h, lp_h)
+            else:
+                template.set_text(text)
+                extent = template.get_window_extent(renderer)
+                w, h = extent.width, extent.height
+            sizes[i] = w + 2 * pad, h + 2 * pad
+
+        cell = max(float(np.median(sizes[:, 0])) if n else 1.0, 1.0)
+        grid = {}
+        placed = []
+        offsets = np.zeros((n, 2))
+        alignments = [self._base_alignment] * n
+        visible = np.zeros(n, dtype=bool)
+
+        def box_for(i, direction):
+            (sx, sy), ha, va = direction
+            x = anchors[i, 0] + sx * self.distance * pad
+            y = anchors[i, 1] + sy * self.distance * pad
+            w, h = sizes[i]
+            x0 = x if ha == 'left' else x - w if ha == 'right' else x - w / 2
+            y0 = y if va == 'bottom' else y - h if va == 'top' else y - h / 2
+            return (x0, y0, x0 + w, y0 + h)
+
+        def cells(box):
+            for gx in range(int(box[0] // cell), int(box[2] // cell) + 1):
+                for gy in range(int(box[1] // cell), int(box[3] // cell) + 1):
+                    yield gx, gy
+
+        def overlaps(box):
+            for key in cells(box):
+                for j in grid.get(key, ()):
+                    other = placed[j]
+                    if (box[0] < other[2] and other[0] < box[2]
+                            and box[1] < other[3] and other[1] < box[3]):
+                        return True
+            return False
+
+        for i in range(n):
+            chosen = None
+            for direction in PLACEMENTS:
+                box = box_for(i, direction)
+                if not overlaps(box):
+                    chosen = direction, box
+                    break
+            if chosen is None:
+                if not self.keep_all:
+                    continue
+                chosen = PLACEMENTS[0], box_for(i, PLACEMENTS[0])
+            (sx, sy), ha, va = chosen[0]
+            offsets[i] = sx * self.distance, sy * self.distance
+            alignments[i] = (ha, va)
+            visible[i] = True
+            placed.append(chosen[1])
+            for key in cells(chosen[1]):
+                grid.setdefault(key, []).append(len(placed) - 1)
+
+        self.offsets = offsets
+        self.alignments = alignments
+        self.visible_mask = visible
+
+
+def _add(ax, batch):
+    batch.set_transform(ax.transData)
+    batch.set_clip_on(False)
+    ax.add_artist(batch)
+    return batch
+
+
+def bar_labels(ax, bars, labels=None, fmt='{:g}', padding=3, position='edge', **text_kwargs):
+    """Label every bar of a bar container in one artist.
+
+    labels: explicit strings; by default each bar's value formatted with
+    fmt. Vertical bars are labelled above (below for negative values),
+    horizontal bars (the container returned by ax.barh) to the right (left).
+    position='center' puts the labels in the middle of the bars instead
+    (stacked bars).
+    """
+    horizontal = getattr(bars, 'orientation', 'vertical') == 'horizontal'
+    bars = list(bars)
+    xy = np.array([b.get_xy() for b in bars], dtype=float).reshape(-1, 2)
+    width = np.array([b.get_width() for b in bars], dtype=float)
+    height = np.array([b.get_height() for b in bars], dtype=float)
+
+    if position == 'center':
+        values = width if horizontal else height
+        positions = np.column_stack([xy[:, 0] + width / 2, xy[:, 1] + height / 2])
+        offsets = np.zeros((len(bars), 2))
+        alignments = [('center', 'center')] * len(bars)
+    elif horizontal:
+        values = width
+        positions = np.column_stack([xy[:, 0] + width, xy[:, 1] + height / 2])
+        sign = np.where(values < 0, -1.0, 1.0)
+        offsets = np.column_stack([sign * padding, np.zeros(len(bars))])
+        alignments = [('right', 'center') if s < 0 else ('left', 'center') for s in sign]
+    else:
+        values = height
+        positions = np.column_stack([xy[:, 0] + width / 2, xy[:, 1] + height])
+        sign = np.where(values < 0, -1.0, 1.0)
+        offsets = np.column_stack([np.zeros(len(bars)), sign * padding])
+        alignments = [('center', 'top') if s < 0 else ('center', 'bottom') for s in sign]
+
+    if labels is None:
+        labels = [fmt.format(v) for v in values]
+    text_kwargs.setdefault('fontsize', 9)
+    return _add(ax, TextBatch(positions, labels, offsets=offsets, alignments=alignments,
+                              **text_kwargs))
+
+
+def cell_labels(ax, matrix, fmt='{:.2f}', colors=None, threshold=None, mask=None,
+                **text_kwargs):
+    """Label every cell of an imshow/pcolormesh heat map in one artist.
+
+    Cell (i, j) is labelled at x=j, y=i, as in the usual nested loop.
+    colors=(dark_bg_color, light_bg_color) with a threshold picks the text
+    color per cell (values below the threshold get the first color);
+    threshold may also be a (low, high) pair, in which case values outside
+    the band get the first color. mask hides cells where it is True.
+    """
+    matrix = np.asarray(matrix)
+    rows, cols = matrix.shape
+    ii, jj = np.divmod(np.arange(rows * cols), cols)
+    keep = np.ones(rows * cols, dtype=bool) if mask is None else ~np.asarray(mask).ravel()
+    values = matrix.ravel()[keep]
+    positions = np.column_stack([jj[keep], ii[keep]])
+    texts = [fmt.format(v) for v in values]
+
+    cell_colors = None
+    if colors is not None and threshold is not None:
+        if np.ndim(threshold):
+            low, high = threshold
+            first = (values < low) | (values > high)
+        else:
+            first = values < threshold
+        cell_colors = np.where(first, colors[0], colors[1]).tolist()
+
+    text_kwargs.setdefault('ha', 'center')
+    text_kwargs.setdefault('va', 'center')
+    return _add(ax, TextBatch(positions, texts, colors=cell_colors, **text_kwargs))
+
+
+def point_labels(ax, x, y, labels, distance=4, keep_all=False, **text_kwargs):
+    """Label scatter points, placing labels so they do not overlap.
+
+    Earlier labels take priority; pass points sorted by importance.
+    distance is the gap between point and label in points.
+    """
+    positions = np.column_stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float)])
+    text_kwargs.setdefault('fontsize', 8)
+    return _add(ax, PointLabels(positions, labels, distance=distance, keep_all=keep_all,
+                                **text_kwargs))
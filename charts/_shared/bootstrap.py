@@ -0,0 +1,85 @@
+"""
+Minimal-import bootstrap for chart scripts.
+
+Imported first by charts._shared, before anything touches pyplot:
+
+- selects the non-interactive Agg backend through MPLBACKEND, so pyplot
+  never probes or loads GUI toolkits (Tk, Qt, macOS) for PDF output;
+- provides lazy module proxies, so heavy optional dependencies such as
+  scipy.stats are imported only when a chart actually asks for them;
+- records how long each lazy import took (import_times()).
+
+Per-chart import cost across a full build is measured by the runner:
+python generate_all_charts.py --import-times
+"""
+
+import importlib
+import os
+import sys
+import time
+import types
+
+HEADLESS_BACKEND = 'Agg'
+
+# module name -> seconds spent importing it on first use
+_IMPORT_TIMES = {}
+
+
+def force_headless_backend(backend=HEADLESS_BACKEND):
+    """Select a non-interactive backend before pyplot is imported.
+
+    An explicit MPLBACKEND in the environment is respected. If pyplot is
+    already loaded the backend is switched in place.
+    """
+    if 'matplotlib.pyplot' in sys.modules:
+        sys.modules['matplotlib.pyplot'].switch_backend(os.environ.get('MPLBACKEND', backend))
+    else:
+        os.environ.setdefault('MPLBACKEND', backend)
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self.__name__)
+            _IMPORT_TIMES[self.__name__] = time.perf_counter() - start
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_module'] is not None else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name):
+    """Return the module if already imported, else a LazyModule proxy."""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+stats = lazy_import('scipy.stats')
+
+
+def distribution(name, *args, **kwargs):
+    """Frozen scipy.stats distribution, e.g. distribution('norm', 0, 1.5).
+
+    scipy is imported on the first call.
+    """
+    return getattr(stats, name)(*args, **kwargs)
+
+
+def import_times():
+    """Seconds spent in lazy imports so far, by module name."""
+    return dict(_IMPORT_TIMES)
@@ -5,28 +5,23 @@ Copy this file and modify for new charts
 Output: {chart_name}.pdf
 Module: {module_name}
 Lesson: {lesson_number}
+
+Charts import the charts package, so run them from the repository root:
+    python -m module_XX_name.figures.chart_name.chart_name
+    PYTHONPATH=. python module_XX_name/figures/chart_name/chart_name.py
+generate_all_charts.py puts the repository root on PYTHONPATH itself.
 """
 
 from pathlib import Path
+
+# Shared utilities, imported before pyplot so the headless backend is used.
+# For scipy distributions use distribution('norm', ...), which imports
+# scipy only when called.
+from charts._shared import (COLORS, ACCENTS, SERIES_COLORS, chart_style, save_chart,
+                            add_synthetic_label, bar_labels)
 import matplotlib.pyplot as plt
 import numpy as np
 
-# Import shared utilities
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent / '_shared'))
-try:
-    from colors import COLORS, ACCENTS, SERIES_COLORS
-    from styles import apply_chart_style, add_synthetic_label
-except ImportError:
-    # Fallback if imports fail
-    COLORS = {'primary': '#333333', 'secondary': '#666666'}
-    ACCENTS = {'blue': '#4A90E2', 'green': '#44A044'}
-    SERIES_COLORS = ['#333333', '#666666', '#999999']
-    def apply_chart_style():
-        plt.rcParams.update({'font.size': 10, 'axes.labelsize': 10})
-    def add_synthetic_label(ax, position='lower right'):
-        pass
-
 # Chart metadata for QuantLet integration
 CHART_METADATA = {
     'title': 'Chart Title Here',
@@ -37,14 +32,12 @@ CHART_METADATA = {
 }
 
 
+@chart_style('standard')
 def create_chart():
     """Create the chart visualization"""
     # Set random seed for reproducibility
     np.random.seed(42)
 
-    # Apply standard style
-    apply_chart_style()
-
     # Create figure
     fig, ax = plt.subplots(figsize=(10, 6))
 
@@ -58,16 +51,8 @@ def create_chart():
 
     bars = ax.bar(categories, values, color=COLORS['primary'], edgecolor='white')
 
-    # Add value labels on bars
-    for bar, val in zip(bars, values):
-        ax.annotate(
-            f'{val}%',
-            xy=(bar.get_x() + bar.get_width()/2, bar.get_height()),
-            ha='center',
-            va='bottom',
-            fontsize=9,
-            fontweight='bold'
-        )
+    # Add value labels on bars (one artist for all labels)
+    bar_labels(ax, bars, fmt='{:g}%', padding=0, fontsize=9, fontweight='bold')
 
     # Labels and title
     ax.set_xlabel('Categories')
@@ -84,10 +69,10 @@ def create_chart():
     # Tight layout
     plt.tight_layout()
 
-    # Save to PDF
+    # Save PDF (plus web thumbnails when the build asks for them)
     output_path = Path(__file__).parent / f'{Path(__file__).stem}.pdf'
-    plt.savefig(output_path, format='pdf', dpi=300, bbox_inches='tight')
-    plt.close()
+    save_chart(fig, output_path)
+    plt.close(fig)
 
     print(f"Chart saved to: {output_path}")
     return output_path
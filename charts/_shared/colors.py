@@ -56,3 +56,12 @@ def get_color(name):
     """Get color by name from any palette"""
     all_colors = {**COLORS, **ACCENTS}
     return all_colors.get(name, '#333333')
+
+# Beamer theme colors (template_beamer_final.tex), as used in module figures
+MLPURPLE = '#3333B2'
+MLBLUE = '#0066CC'
+MLORANGE = '#FF7F0E'
+MLGREEN = '#2CA02C'
+MLRED = '#D62728'
+MLLAVENDER = '#ADADE0'
+MLGRAY = '#7F7F7F'
@@ -0,0 +1,446 @@
+"""
+Seeded synthetic data for Digital Finance charts.
+
+Vectorized generators for the data sets many figure scripts simulate:
+price paths (GBM and cumulative returns), regime-switching returns,
+credit portfolios and transaction streams, plus simulated order book
+sessions (order_book_session), their depth sampled over the session
+(book_depth) and liquidity metrics (session_liquidity), latency race
+Monte Carlo results (latency_race), lit/dark smart order routing
+comparisons (dark_routing) and market-maker backtests and parameter
+sweeps (market_making_backtest, market_making_sweep). Every generator
+draws from its own np.random.default_rng(seed), so a chart gets the same
+data whether it runs alone, in a batch, or after another chart.
+
+Results are memoized on disk as uncompressed .npz files keyed by the
+generator name and arguments. Loading maps the arrays straight from the
+file (read-only np.memmap views), so a cached data set costs no
+generation time and no copy. Treat returned arrays as read-only.
+
+    CHART_DATA_CACHE   cache folder (default charts/_shared/.data_cache);
+                       'off' disables the disk cache
+
+    from charts._shared.data import gbm_paths
+    prices = gbm_paths(n_paths=50, n_steps=252, sigma=0.25)
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+from .determinism import CHART_SEED
+
+DATA_VERSION = 4  # bump when a generator's output changes for the same arguments
+DEFAULT_CACHE_DIR = Path(__file__).parent / '.data_cache'
+SINGLE_ARRAY = 'data'
+
+_MEMORY = {}
+
+
+def cache_dir():
+    """Disk cache folder, or None when disabled"""
+    value = os.environ.get('CHART_DATA_CACHE')
+    if value == 'off':
+        return None
+    return Path(value) if value else DEFAULT_CACHE_DIR
+
+
+def cache_key(name, arguments):
+    payload = json.dumps([DATA_VERSION, name, arguments], sort_keys=True, default=repr)
+    return f"{name}-{hashlib.sha256(payload.encode()).hexdigest()[:16]}"
+
+
+def _member_memmap(path, info):
+    """Read-only memmap of one stored (uncompressed) .npy member of a zip"""
+    with open(path, 'rb') as f:
+        f.seek(info.header_offset)
+        local = f.read(30)
+        name_len = int.from_bytes(local[26:28], 'little')
+        extra_len = int.from_bytes(local[28:30], 'little')
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+    if dtype.hasobject:
+        return None
+    if 0 in shape:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape,
+                     order='F' if fortran else 'C')
+
+
+def load_npz(path):
+    """{name: array} from an .npz file, memory-mapped where possible"""
+    arrays = {}
+    with zipfile.ZipFile(path) as archive:
+        members = archive.infolist()
+    fallback = None
+    for info in members:
+        key = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+        array = _member_memmap(path, info) if info.compress_type == zipfile.ZIP_STORED else None
+        if array is None:
+            fallback = fallback if fallback is not None else np.load(path, allow_pickle=False)
+            array = fallback[key]
+        arrays[key] = array
+    return arrays
+
+
+def save_npz(path, arrays):
+    """Write arrays uncompressed (so they can be mapped) via a temporary file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'{path.stem}.{os.getpid()}.tmp.npz')
+    np.savez(tmp, **arrays)
+    os.replace(tmp, path)
+
+
+def memoized(func):
+    """Cache a generator's result in memory and as .npz on disk.
+
+    The generator returns an array or a dict of arrays; the cache key is
+    its name plus all arguments (defaults included).
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = {k: (v.tolist() if isinstance(v, np.ndarray) else v)
+                     for k, v in bound.arguments.items()}
+        key = cache_key(func.__name__, arguments)
+        if key in _MEMORY:
+            return _MEMORY[key]
+
+        folder = cache_dir()
+        path = folder / f'{key}.npz' if folder else None
+        arrays = None
+        if path is not None and path.exists():
+            try:
+                arrays = load_npz(path)
+            except (OSError, ValueError, zipfile.BadZipFile):
+                arrays = None  # damaged cache entry: regenerate
+        if arrays is None:
+            result = func(*args, **kwargs)
+            arrays = result if isinstance(result, dict) else {SINGLE_ARRAY: result}
+            arrays = {k: np.asarray(v) for k, v in arrays.items()}
+            if path is not None:
+                try:
+                    save_npz(path, arrays)
+                except OSError:
+                    pass  # read-only checkout: keep the in-memory result
+            for array in arrays.values():
+                array.flags.writeable = False
+
+        value = arrays[SINGLE_ARRAY] if set(arrays) == {SINGLE_ARRAY} else arrays
+        _MEMORY[key] = value
+        return value
+
+    wrapper.uncached = func
+    return wrapper
+
+
+def clear_cache(disk=False):
+    """Forget memoized data sets (and delete the disk cache if disk=True)"""
+    _MEMORY.clear()
+    folder = cache_dir()
+    if disk and folder and folder.exists():
+        for path in folder.glob('*.npz'):
+            path.unlink()
+        for path in folder.glob('order_book_session-*'):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+@memoized
+def gbm_paths(n_paths=1, n_steps=252, s0=100.0, mu=0.05, sigma=0.2, dt=1 / 252,
+              seed=CHART_SEED):
+    """Geometric Brownian motion prices, shape (n_steps + 1, n_paths)"""
+    rng = np.random.default_rng(seed)
+    shocks = rng.standard_normal((n_steps, n_paths))
+    log_returns = (mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * shocks
+    log_paths = np.vstack([np.zeros((1, n_paths)), np.cumsum(log_returns, axis=0)])
+    return s0 * np.exp(log_paths)
+
+
+@memoized
+def cumulative_returns(n_steps=252, drift=0.0, vol=0.01, exact_drift=False, seed=CHART_SEED):
+    """Cumulative sums of normal daily returns, shape (n_steps, n_series).
+
+    drift and vol are scalars or one value per series (a list). With
+    exact_drift the shocks of each series are demeaned, so every series
+    ends at n_steps * drift whatever the seed.
+    """
+    drift = np.atleast_1d(np.asarray(drift, dtype=float))
+    vol = np.atleast_1d(np.asarray(vol, dtype=float))
+    drift, vol = np.broadcast_arrays(drift, vol)
+    rng = np.random.default_rng(seed)
+    shocks = rng.standard_normal((n_steps, len(drift)))
+    if exact_drift:
+        shocks -= shocks.mean(axis=0)
+    return np.cumsum(shocks * vol + drift, axis=0)
+
+
+@memoized
+def regime_switching_returns(regimes, s0=100.0, seed=CHART_SEED):
+    """Returns and prices through a fixed sequence of regimes.
+
+    regimes: list of (n_steps, mean, vol) per regime, in order.
+    Returns {'returns', 'prices', 'regime'}; 'regime' is the index of the
+    regime of each step and prices start at s0 (one more entry than returns).
+    """
+    lengths = np.array([r[0] for r in regimes], dtype=int)
+    regime = np.repeat(np.arange(len(regimes)), lengths)
+    means = np.array([r[1] for r in regimes], dtype=float)[regime]
+    vols = np.array([r[2] for r in regimes], dtype=float)[regime]
+    rng = np.random.default_rng(seed)
+    returns = rng.standard_normal(len(regime)) * vols + means
+    prices = s0 * np.concatenate([[1.0], np.cumprod(1 + returns)])
+    return {'returns': returns, 'prices': prices, 'regime': regime}
+
+
+@memoized
+def markov_regime_returns(n_steps, transition, means, vols, s0=100.0, seed=CHART_SEED):
+    """Returns from a Markov regime-switching model.
+
+    transition: row-stochastic matrix of regime switch probabilities per
+    step. Regime spells are drawn as geometric durations, so the loop runs
+    once per regime change rather than once per step.
+    """
+    transition = np.asarray(transition, dtype=float)
+    rng = np.random.default_rng(seed)
+    stay = np.diag(transition)
+    spells = []
+    state, filled = 0, 0
+    while filled < n_steps:
+        length = rng.geometric(1 - stay[state]) if stay[state] < 1 else n_steps
+        spells.append((state, min(length, n_steps - filled)))
+        filled += length
+        leave = transition[state].copy()
+        leave[state] = 0
+        if leave.sum() == 0:
+            break
+        state = rng.choice(len(leave), p=leave / leave.sum())
+    states, lengths = zip(*spells)
+    regime = np.repeat(states, lengths)[:n_steps]
+    returns = (rng.standard_normal(n_steps) * np.asarray(vols, dtype=float)[regime]
+               + np.asarray(means, dtype=float)[regime])
+    prices = s0 * np.concatenate([[1.0], np.cumprod(1 + returns)])
+    return {'returns': returns, 'prices': prices, 'regime': regime}
+
+
+@memoized
+def credit_portfolio(n_borrowers=1000, n_features=8, base_pd=0.05, coef_range=(0.5, 2.5),
+                     correlation=0.15, n_scenarios=0, lgd=0.45, seed=CHART_SEED):
+    """Borrowers of a logistic default model, with exact SHAP values.
+
+    Features are uniform on [0, 1]; each has a random coefficient of random
+    sign. For a linear logit the SHAP value of feature j is
+    coef_j * (x_j - mean_j), on the log-odds scale.
+
+    Returns {'features' (n, k), 'coef' (k,), 'shap' (n, k), 'pd' (n,),
+    'default' (n,) bool} and, when n_scenarios > 0, 'losses': portfolio
+    loss rates of a one-factor (Vasicek) model with the given asset
+    correlation, one per scenario.
+    """
+    rng = np.random.default_rng(seed)
+    features = rng.uniform(0, 1, (n_borrowers, n_features))
+    coef = rng.uniform(*coef_range, n_features) * rng.choice([-1.0, 1.0], n_features)
+    shap = (features - features.mean(axis=0)) * coef
+    logit = np.log(base_pd / (1 - base_pd)) + shap.sum(axis=1)
+    prob = 1 / (1 + np.exp(-logit))
+    data = {'features': features, 'coef': coef, 'shap': shap, 'pd': prob,
+            'default': rng.uniform(size=n_borrowers) < prob}
+
+    if n_scenarios:
+        from scipy.special import ndtri
+
+        thresholds = ndtri(prob)
+        losses = np.empty(n_scenarios)
+        chunk = max(1, 2_000_000 // n_borrowers)  # bound scenario x borrower memory
+        for start in range(0, n_scenarios, chunk):
+            stop = min(start + chunk, n_scenarios)
+            factor = rng.standard_normal((stop - start, 1))
+            idio = rng.standard_normal((stop - start, n_borrowers))
+            assets = np.sqrt(correlation) * factor + np.sqrt(1 - correlation) * idio
+            losses[start:stop] = (assets < thresholds).mean(axis=1) * lgd
+        data['losses'] = losses
+    return data
+
+
+@memoized
+def transaction_stream(n_normal=500, n_anomalies=20, amount_mu=4.0, amount_sigma=0.8,
+                       max_amount=1000.0, seed=CHART_SEED):
+    """Card transactions with injected anomalies.
+
+    Normal amounts are lognormal (clipped at max_amount) with Poisson daily
+    frequency; anomalies are large and frequent. Each transaction has an
+    anomaly score on [0, 1] (normal below 0.5, anomalies above).
+    Returns {'amount', 'frequency', 'score', 'is_anomaly'}, normal first.
+    """
+    rng = np.random.default_rng(seed)
+    amount = np.concatenate([
+        np.clip(rng.lognormal(amount_mu, amount_sigma, n_normal), 0, max_amount),
+        rng.uniform(500, 2000, n_anomalies),
+    ])
+    frequency = np.concatenate([
+        rng.poisson(5, n_normal).astype(float),
+        rng.uniform(15, 30, n_anomalies),
+    ])
+    score = np.concatenate([
+        rng.beta(2, 5, n_normal) * 0.5,
+        rng.beta(5, 2, n_anomalies) * 0.5 + 0.5,
+    ])
+    is_anomaly = np.arange(n_normal + n_anomalies) >= n_normal
+    return {'amount': amount, 'frequency': frequency, 'score': score,
+            'is_anomaly': is_anomaly}
+
+
+def order_book_session(hours=1.0, interval=1.0, n_levels=10, hawkes=True, seed=CHART_SEED):
+    """A simulated order book session as a memory-mapped BookStore.
+
+    Runs the order flow simulator of the order book demo
+    (demos/module_04_traditional/order_book/order_flow.py) and records
+    top-n_levels snapshots every `interval` seconds plus all trade prints
+    into a columnar store (book_store.py) in the cache folder. Later calls
+    with the same arguments open the recorded store without simulating.
+    With the cache disabled the store is recorded into a temporary folder
+    that is removed together with the store.
+    """
+    from demos.module_04_traditional.order_book.book_store import BookStore, record
+    from demos.module_04_traditional.order_book.order_flow import (OrderFlowSimulator,
+                                                                   default_process)
+
+    arguments = {'hours': hours, 'interval': interval, 'n_levels': n_levels,
+                 'hawkes': hawkes, 'seed': seed}
+    key = cache_key('order_book_session', arguments)
+    if key in _MEMORY:
+        return _MEMORY[key]
+
+    folder = cache_dir()
+    scratch = None
+    if folder is None:
+        # Cache disabled: record into a temporary folder that lives as long
+        # as the store (and its memmaps) and is removed with it
+        scratch = tempfile.TemporaryDirectory(prefix='order_book_session-',
+                                              ignore_cleanup_errors=True)
+        folder = Path(scratch.name)
+    path = folder / key
+    try:
+        store = BookStore(path)
+    except (FileNotFoundError, ValueError, KeyError):
+        simulator = OrderFlowSimulator(process=default_process(hawkes=hawkes), seed=seed)
+        store = record(simulator.simulate(hours * 3600, interval, n_levels), path, n_levels,
+                       meta=arguments, overwrite=True)
+    store.scratch = scratch
+    _MEMORY[key] = store
+    return store
+
+
+@memoized
+def session_liquidity(hours=1.0, interval=1.0, window=300.0, depth_bps=10.0, delay=5.0,
+                      every=None, hawkes=True, seed=CHART_SEED):
+    """Rolling liquidity metrics of an order_book_session, one row per snapshot.
+
+    Returns {field: array} for the fields of liquidity.METRICS_DTYPE
+    (time, quoted/effective/realized spread and price impact in bps, depth
+    within depth_bps of the mid, Kyle's lambda, Amihud, order and book
+    imbalance) over a `window`-second rolling window. With `every`
+    (seconds) only one row per bucket of the store's downsampled replay
+    is kept; the metrics still see every snapshot and trade.
+    """
+    from demos.module_04_traditional.order_book.liquidity import replay
+
+    store = order_book_session(hours, interval, hawkes=hawkes, seed=seed)
+    metrics = replay(store, window, depth_bps, delay, every=every)
+    return {field: metrics[field] for field in metrics.dtype.names}
+
+
+
+@memoized
+def book_depth(hours=1.0, every=60.0, n_levels=10, hawkes=True, seed=CHART_SEED):
+    """Top-n_levels book snapshots of an order_book_session, one per `every` seconds.
+
+    Returns {field: array} for the fields of book_store.snapshot_dtype
+    (time, best bid/ask, mid, spread and per-level prices and sizes),
+    read from the store's downsampled view: the last snapshot at or before
+    the end of each bucket.
+    """
+    store = order_book_session(hours, n_levels=n_levels, hawkes=hawkes, seed=seed)
+    snapshots = store.snapshots.downsample(every)
+    return {field: snapshots[field] for field in snapshots.dtype.names}
+
+@memoized
+def latency_race(n_runs=20, duration=600.0, firms_per_tier=2, seed=CHART_SEED):
+    """Monte Carlo results of the order book demo's latency race (latency_race.py).
+
+    Returns {'tier' (n_tiers,) names, and per field of latency_race.TIER_DTYPE
+    an (n_runs, n_tiers) array}: latency, snipe fill rate, quote fills,
+    sniped share, maker/taker markout (bps) and PnL per hour. Runs are
+    spread over processes; the result does not depend on their number.
+    """
+    from demos.module_04_traditional.order_book.latency_race import LATENCY_TIERS, monte_carlo
+
+    results = monte_carlo(n_runs, duration, seed=seed, firms_per_tier=firms_per_tier)
+    data = {field: results[field] for field in results.dtype.names}
+    data['tier'] = np.array(list(LATENCY_TIERS))
+    return data
+
+
+@memoized
+def dark_routing(dark_fractions=(0.0, 0.25, 0.5, 0.75, 1.0), n_parents=1000,
+                 seed=CHART_SEED):
+    """Smart order routing between the lit book and a midpoint dark pool.
+
+    Runs the same simulated parent orders through the router of the order
+    book demo (dark_pool.py) once per dark allocation. Returns {field:
+    array} for the fields of dark_pool.ROUTING_DTYPE, one entry per
+    allocation: cost vs arrival mid (bps) and its spread across parents,
+    share filled in the dark pool, fill rate.
+    """
+    from demos.module_04_traditional.order_book.dark_pool import compare_routing
+
+    table = compare_routing(tuple(dark_fractions), n_parents, seed)
+    return {field: table[field] for field in table.dtype.names}
+
+
+@memoized
+def market_making_backtest(gamma=0.01, half_spread=1.0, hours=6.5, seed=CHART_SEED):
+    """One Avellaneda-Stoikov backtest over a simulated session (market_maker.py).
+
+    Returns per-snapshot arrays: 'time' (seconds), 'mid', quoted 'bid' and
+    'ask', inventory 'position' (shares) and cumulative 'pnl',
+    'spread_pnl' and 'inventory_pnl' ($).
+    """
+    from demos.module_04_traditional.order_book.market_maker import backtest, simulate_market
+
+    market = simulate_market(hours, seed=seed)
+    result = backtest(market, gamma, half_spread, record=True)
+    return {'time': market['time'], 'mid': market['mid'], 'bid': result['bid'],
+            'ask': result['ask'], 'position': result['position'],
+            'pnl': result['pnl_path'], 'spread_pnl': result['spread_path'],
+            'inventory_pnl': result['inventory_path']}
+
+
+@memoized
+def market_making_sweep(gammas=(0.0, 0.001, 0.003, 0.01, 0.03, 0.1),
+                        half_spreads=(0, 1, 2, 3, 4), n_sessions=4, hours=1.0,
+                        seed=CHART_SEED):
+    """Risk aversion x half-spread sweep of the market-maker backtester.
+
+    Returns 'gamma', 'half_spread' (ticks) and, per summary field of
+    market_maker.SUMMARY_FIELDS, an (n_sessions, n_gammas, n_half_spreads)
+    array. Sessions are spread over processes.
+    """
+    from demos.module_04_traditional.order_book.market_maker import sweep
+
+    return sweep(gammas, half_spreads, n_sessions, hours, seed=seed, cache_dir=None)
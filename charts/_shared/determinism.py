@@ -0,0 +1,132 @@
+"""
+Deterministic chart output for byte-level caching.
+
+In deterministic mode a chart rebuilt from unchanged code is
+byte-identical to the previous build:
+
+- PDF/SVG dates come from SOURCE_DATE_EPOCH (DEFAULT_EPOCH if unset);
+- Creator/Producer metadata is fixed instead of carrying library versions;
+- SVG element ids use a fixed hash salt;
+- NumPy's global RNG and the random module are seeded, and each
+  np.random.default_rng() called without a seed gets its own seed,
+  spawned in call order from the chart seed.
+
+Fixed metadata follows CHART_DETERMINISTIC=1 in the environment. Seeding
+is scoped to the deterministic_mode() context manager, so importing
+charts._shared never changes RNG behaviour for other code in the process.
+generate_all_charts.py --deterministic runs every chart script through it:
+
+    python -m charts._shared.determinism path/to/chart.py
+"""
+
+import os
+import random
+import runpy
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import matplotlib as mpl
+import numpy as np
+
+DEFAULT_EPOCH = 1704067200  # 2024-01-01 00:00 UTC
+CHART_SEED = 42
+HASH_SALT = 'digital-finance'
+CREATOR = 'Digital Finance course charts'
+
+# savefig metadata per format in deterministic mode (dates are added from the epoch)
+DETERMINISTIC_METADATA = {
+    'pdf': {'Creator': CREATOR, 'Producer': 'matplotlib'},
+    'svg': {'Creator': CREATOR},
+    'png': {'Software': CREATOR},
+    'webp': {},
+}
+
+
+def is_deterministic():
+    return os.environ.get('CHART_DETERMINISTIC') == '1'
+
+
+def source_date():
+    """Build timestamp from SOURCE_DATE_EPOCH, or DEFAULT_EPOCH"""
+    epoch = int(os.environ.get('SOURCE_DATE_EPOCH', DEFAULT_EPOCH))
+    return datetime.fromtimestamp(epoch, tz=timezone.utc)
+
+
+def save_metadata(fmt):
+    """savefig metadata for a format: fixed in deterministic mode, else None"""
+    if not is_deterministic():
+        return None
+    metadata = dict(DETERMINISTIC_METADATA.get(fmt, {}))
+    if fmt == 'pdf':
+        metadata['CreationDate'] = source_date()
+    elif fmt == 'svg':
+        metadata['Date'] = source_date().strftime('%Y-%m-%d')
+    return metadata or None
+
+
+def seed_everything(seed=CHART_SEED):
+    np.random.seed(seed)
+    random.seed(seed)
+
+
+@contextmanager
+def deterministic_mode(seed=CHART_SEED, epoch=None):
+    """Deterministic output for the code run inside the block.
+
+    Sets CHART_DETERMINISTIC and SOURCE_DATE_EPOCH, the SVG hash salt and
+    seeds the global RNGs. np.random.default_rng() without a seed returns a
+    generator seeded by the next child of SeedSequence(seed), so separate
+    generators stay independent but every run draws the same streams. All
+    of it is undone on exit.
+    """
+    saved_env = {name: os.environ.get(name)
+                 for name in ('CHART_DETERMINISTIC', 'SOURCE_DATE_EPOCH')}
+    os.environ['CHART_DETERMINISTIC'] = '1'
+    if epoch is not None:
+        os.environ['SOURCE_DATE_EPOCH'] = str(epoch)
+    else:
+        os.environ.setdefault('SOURCE_DATE_EPOCH', str(DEFAULT_EPOCH))
+    unseeded = np.random.default_rng
+    seeds = np.random.SeedSequence(seed)
+
+    def default_rng(seed_value=None):
+        if seed_value is None:
+            seed_value = seeds.spawn(1)[0]
+        return unseeded(seed_value)
+
+    np.random.default_rng = default_rng
+    try:
+        with mpl.rc_context({'svg.hashsalt': HASH_SALT}):
+            seed_everything(seed)
+            yield
+    finally:
+        np.random.default_rng = unseeded
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def run_script(script, args=()):
+    """Run a chart script as __main__ in deterministic mode, as if started
+    with python <script>. The script's folder is put in front of sys.path,
+    which keeps the current directory (the repository root for
+    python -m charts._shared.determinism) importable."""
+    script = Path(script).resolve()
+    argv, path = sys.argv, list(sys.path)
+    sys.argv = [str(script), *args]
+    sys.path.insert(0, str(script.parent))
+    try:
+        with deterministic_mode():
+            runpy.run_path(str(script), run_name='__main__')
+    finally:
+        sys.argv, sys.path[:] = argv, path
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        sys.exit('usage: python -m charts._shared.determinism <chart.py> [args...]')
+    run_script(sys.argv[1], sys.argv[2:])
@@ -0,0 +1,91 @@
+"""
+Font resolution and PDF font embedding for Digital Finance charts.
+
+Font embedding modes (rcParams layered over any style preset):
+
+    type3   glyphs embedded as Type 3 procedures, subset to the glyphs
+            used (matplotlib default)
+    type42  TrueType outlines embedded as Type 42, subset to the glyphs
+            used; text stays selectable and searchable in the PDF
+    core14  no font embedding: text is set in the PDF base-14 fonts
+            (Times, Helvetica, Courier); smallest files
+
+A build selects a mode for every chart script, including scripts that do
+not import this package, through a generated matplotlibrc
+(write_build_matplotlibrc(), used by generate_all_charts.py --pdf-fonts).
+
+warm_font_cache() builds matplotlib's font list once and resolves the
+font families used by the presets, so parallel chart processes start from
+a ready cache instead of each rebuilding it.
+"""
+
+import time
+
+import matplotlib as mpl
+
+DEFAULT_EMBEDDING = 'type3'
+
+FONT_EMBEDDING = {
+    'type3': {
+        'pdf.fonttype': 3,
+        'ps.fonttype': 3,
+        'pdf.use14corefonts': False,
+    },
+    'type42': {
+        'pdf.fonttype': 42,
+        'ps.fonttype': 42,
+        'pdf.use14corefonts': False,
+    },
+    'core14': {
+        'pdf.fonttype': 3,
+        'ps.fonttype': 3,
+        'pdf.use14corefonts': True,
+    },
+}
+
+# Families and variants used by the style presets and the figure scripts
+WARM_FAMILIES = ('serif', 'sans-serif', 'monospace')
+WARM_VARIANTS = (('normal', 'normal'), ('bold', 'normal'), ('normal', 'italic'))
+
+
+def font_rcparams(embedding=DEFAULT_EMBEDDING):
+    """rcParams for a font embedding mode"""
+    try:
+        return FONT_EMBEDDING[embedding]
+    except KeyError:
+        raise ValueError(f"Unknown font embedding '{embedding}' "
+                         f"(available: {', '.join(FONT_EMBEDDING)})") from None
+
+
+def apply_font_embedding(embedding=DEFAULT_EMBEDDING):
+    """Apply an embedding mode globally"""
+    mpl.rcParams.update(font_rcparams(embedding))
+
+
+def warm_font_cache(families=WARM_FAMILIES):
+    """Build the font list cache and resolve the preset font families.
+
+    Returns (seconds, {'family/weight/style': font file}).
+    """
+    from matplotlib import font_manager
+
+    start = time.perf_counter()
+    resolved = {}
+    for family in families:
+        for weight, style in WARM_VARIANTS:
+            prop = font_manager.FontProperties(family=family, weight=weight, style=style)
+            resolved[f'{family}/{weight}/{style}'] = font_manager.findfont(prop)
+    return time.perf_counter() - start, resolved
+
+
+def write_build_matplotlibrc(path, embedding=DEFAULT_EMBEDDING, backend='Agg'):
+    """Write a matplotlibrc selecting the headless backend and an embedding mode.
+
+    Point the MATPLOTLIBRC environment variable at it for chart subprocesses.
+    """
+    lines = [f'backend: {backend}']
+    for key, value in font_rcparams(embedding).items():
+        lines.append(f'{key}: {value}')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    return path
@@ -0,0 +1,102 @@
+"""
+Chart output stage: one figure, several files.
+
+save_chart() writes the Beamer PDF and, when requested, web thumbnails
+(PNG, WebP, SVG) from the same Figure object, so the chart code runs
+once per build however many formats are produced.
+
+Formats and the thumbnail folder come from the arguments or from the
+environment set by the runner (generate_all_charts.py --formats):
+
+    CHART_FORMATS      comma-separated, e.g. 'pdf,webp,svg' (default 'pdf')
+    CHART_WEB_DIR      thumbnail root; files go to <root>/<module>/<name>.<ext>
+                       (default: next to the PDF)
+    CHART_OUTPUT_LOG   JSON-lines file receiving path, bytes and seconds
+                       for every file written
+
+In deterministic mode (determinism.py) metadata is fixed so rebuilds are
+byte-identical.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import matplotlib as mpl
+
+from .determinism import save_metadata
+
+# savefig arguments per format; raster thumbnails are sized by pixel width
+OUTPUT_FORMATS = {
+    'pdf': {'dpi': 300},
+    'png': {'pil_kwargs': {'optimize': True}},
+    'webp': {'pil_kwargs': {'quality': 80, 'method': 6}},
+    'svg': {},
+}
+RASTER_FORMATS = ('png', 'webp')
+THUMBNAIL_WIDTH_PX = 800
+
+# rcParams while writing each format (SVG keeps text as text, not paths)
+FORMAT_RCPARAMS = {
+    'svg': {'svg.fonttype': 'none'},
+}
+
+
+def requested_formats(formats=None):
+    """Formats to write: the argument, else CHART_FORMATS, else PDF only"""
+    if formats is None:
+        formats = os.environ.get('CHART_FORMATS', 'pdf').split(',')
+    formats = [f.strip().lower() for f in formats if f.strip()]
+    unknown = [f for f in formats if f not in OUTPUT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown chart format(s) {', '.join(unknown)} "
+                         f"(available: {', '.join(OUTPUT_FORMATS)})")
+    return formats
+
+
+def thumbnail_path(output_path, fmt, web_dir=None):
+    """Where a web format of a chart goes"""
+    output_path = Path(output_path)
+    web_dir = web_dir or os.environ.get('CHART_WEB_DIR')
+    if not web_dir:
+        return output_path.with_suffix(f'.{fmt}')
+    module = next((p for p in output_path.parts if p.startswith('module_')),
+                  output_path.parent.name)
+    return Path(web_dir) / module / f'{output_path.stem}.{fmt}'
+
+
+def save_chart(fig, output_path, formats=None, web_dir=None, bbox_inches='tight'):
+    """Save a figure as PDF plus any requested web formats.
+
+    output_path is the PDF path; other formats share its stem. Returns
+    {format: {'path', 'bytes', 'seconds'}}.
+    """
+    output_path = Path(output_path)
+    written = {}
+    for fmt in requested_formats(formats):
+        path = output_path if fmt == 'pdf' else thumbnail_path(output_path, fmt, web_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        kwargs = dict(OUTPUT_FORMATS[fmt])
+        if fmt in RASTER_FORMATS:
+            kwargs['dpi'] = THUMBNAIL_WIDTH_PX / fig.get_size_inches()[0]
+
+        metadata = save_metadata(fmt)
+        if metadata:
+            kwargs['metadata'] = metadata
+
+        start = time.perf_counter()
+        with mpl.rc_context(FORMAT_RCPARAMS.get(fmt, {})):
+            fig.savefig(path, format=fmt, bbox_inches=bbox_inches, **kwargs)
+        written[fmt] = {
+            'path': str(path),
+            'bytes': path.stat().st_size,
+            'seconds': time.perf_counter() - start,
+        }
+
+    log_path = os.environ.get('CHART_OUTPUT_LOG')
+    if log_path:
+        with open(log_path, 'a', encoding='utf-8') as f:
+            for fmt, info in written.items():
+                f.write(json.dumps({'format': fmt, **info}) + '\n')
+    return written
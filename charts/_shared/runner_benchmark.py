@@ -0,0 +1,260 @@
+"""
+Benchmark: chart build time per runner mode.
+
+Builds a fixed set of representative charts from every module (simple
+bars, dense scatters, heat maps, multi-panel figures, hash visualizations)
+and reports p50/p95 per chart and total wall time for each way of running
+them:
+
+    subprocess   one fresh interpreter per chart, as generate_all_charts.py
+                 does today (run_chart_script)
+    in-process   every chart executed in one interpreter with runpy,
+                 rcParams restored and figures closed between charts
+    pooled       in-process execution in a pool of pre-warmed workers
+                 (matplotlib, fonts and charts._shared loaded once each)
+    cached       rebuild skipped when the script, charts._shared and the
+                 matplotlib version are unchanged and the PDF exists
+                 (timed on a second pass, after a build primed the cache)
+
+Charts are built from copies of their folders in a temporary directory,
+so the benchmark never rewrites tracked PDFs.
+
+Usage:
+    PYTHONPATH=. python charts/_shared/runner_benchmark.py
+    PYTHONPATH=. python charts/_shared/runner_benchmark.py --modes subprocess,in-process
+    PYTHONPATH=. python charts/_shared/runner_benchmark.py --repeat 3 --jobs 4 --json bench.json
+"""
+
+import argparse
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import os
+import runpy
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import charts._shared  # noqa: F401  (headless backend before pyplot)
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+SHARED_DIR = Path(__file__).resolve().parent
+MODES = ('subprocess', 'in-process', 'pooled', 'cached')
+
+# Representative charts: (category, figure folder relative to the project)
+REPRESENTATIVE = [
+    ('simple bar', 'module_01_fintech/figures/default_rate_by_grade'),
+    ('simple bar', 'module_02_blockchain/figures/energy_comparison'),
+    ('simple bar', 'module_04_traditional/figures/fee_comparison'),
+    ('dense scatter', 'module_01_fintech/figures/efficient_frontier'),
+    ('dense scatter', 'module_03_ai_ml/figures/decision_boundary'),
+    ('dense scatter', 'module_03_ai_ml/figures/anomaly_detection'),
+    ('heat map', 'module_03_ai_ml/figures/algorithm_comparison'),
+    ('heat map', 'module_03_ai_ml/figures/model_agnostic_methods'),
+    ('multi-panel', 'module_03_ai_ml/figures/residual_analysis'),
+    ('multi-panel', 'module_04_traditional/figures/option_greeks'),
+    ('hash viz', 'module_02_blockchain/figures/avalanche_effect'),
+    ('hash viz', 'module_02_blockchain/figures/sha256_visualization'),
+    ('hash viz', 'module_02_blockchain/figures/hash_space_scale'),
+]
+
+
+def chart_script(folder, root=PROJECT_ROOT):
+    folder = Path(root) / folder
+    return folder / f'{folder.name}.py'
+
+
+def copy_charts(folders, root):
+    """Copy chart folders (without their PDFs) under root; returns the scripts"""
+    for folder in folders:
+        shutil.copytree(PROJECT_ROOT / folder, Path(root) / folder,
+                        ignore=shutil.ignore_patterns('*.pdf', '__pycache__'))
+    return [chart_script(folder, root) for folder in folders]
+
+
+def script_info(script):
+    module = next(p for p in script.parts if p.startswith('module_'))
+    return {'script': script, 'module': module, 'name': script.stem, 'folder': 'figures'}
+
+
+def run_subprocess(script):
+    """Seconds to build a chart in its own interpreter (the current runner)"""
+    from generate_all_charts import run_chart_script
+
+    result = run_chart_script(script_info(script))
+    return result['duration'], result['success']
+
+
+def run_in_process(script):
+    """Seconds to build a chart in this interpreter.
+
+    The script runs as __main__ from its own folder; rcParams it sets are
+    rolled back and its figures closed afterwards, so charts do not leak
+    settings into each other.
+    """
+    script = Path(script)
+    cwd = os.getcwd()
+    argv = sys.argv
+    start = time.perf_counter()
+    success = True
+    try:
+        os.chdir(script.parent)
+        sys.argv = [str(script)]
+        with mpl.rc_context(), contextlib.redirect_stdout(io.StringIO()):
+            runpy.run_path(str(script), run_name='__main__')
+    except BaseException:  # a chart calling sys.exit() must not end the batch
+        success = False
+    finally:
+        plt.close('all')
+        os.chdir(cwd)
+        sys.argv = argv
+    return time.perf_counter() - start, success
+
+
+def _warm_worker():
+    """Pool initializer: pay font lookup and the first PDF save once per worker"""
+    from charts._shared.fonts import warm_font_cache
+
+    warm_font_cache()
+    fig, ax = plt.subplots()
+    fig.savefig(io.BytesIO(), format='pdf')
+    plt.close(fig)
+
+
+@functools.lru_cache(maxsize=None)
+def shared_key():
+    """Hash of matplotlib's version and the charts._shared sources"""
+    digest = hashlib.sha256(mpl.__version__.encode())
+    for path in sorted(SHARED_DIR.glob('*.py')):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def source_key(script):
+    """Hash of everything a chart's output depends on that we can see"""
+    digest = hashlib.sha256(shared_key().encode())
+    digest.update(Path(script).read_bytes())
+    return digest.hexdigest()
+
+
+def run_cached(script, stamps):
+    """Seconds to build a chart, skipping it when its stamp is current"""
+    start = time.perf_counter()
+    key = source_key(script)
+    pdf = Path(script).with_suffix('.pdf')
+    if stamps.get(str(script)) == key and pdf.exists():
+        return time.perf_counter() - start, True
+    seconds, success = run_in_process(script)
+    if success:
+        stamps[str(script)] = key
+    return time.perf_counter() - start, success
+
+
+def benchmark_mode(mode, scripts, jobs):
+    """(per-chart seconds, per-chart success, wall seconds) for one pass"""
+    start = time.perf_counter()
+    if mode == 'subprocess':
+        results = [run_subprocess(s) for s in scripts]
+    elif mode == 'in-process':
+        results = [run_in_process(s) for s in scripts]
+    elif mode == 'pooled':
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_warm_worker) as pool:
+            results = list(pool.map(run_in_process, scripts))
+    elif mode == 'cached':
+        stamps = {}
+        for s in scripts:  # prime: first build records the stamps
+            run_cached(s, stamps)
+        start = time.perf_counter()
+        results = [run_cached(s, stamps) for s in scripts]
+    else:
+        raise ValueError(f"Unknown runner mode '{mode}' (available: {', '.join(MODES)})")
+    wall = time.perf_counter() - start
+    seconds, success = zip(*results)
+    return list(seconds), list(success), wall
+
+
+def summarize(seconds):
+    seconds = np.asarray(seconds)
+    return {'p50': float(np.percentile(seconds, 50)),
+            'p95': float(np.percentile(seconds, 95)),
+            'total': float(seconds.sum())}
+
+
+def run_modes(modes, scripts, categories, repeat, jobs):
+    """Time every mode on the given chart scripts; returns the report dict"""
+    report = {'charts': dict(zip((s.stem for s in scripts), categories)), 'modes': {}}
+    for mode in modes:
+        per_chart = [[] for _ in scripts]
+        walls = []
+        failed = set()
+        for _ in range(repeat):
+            seconds, success, wall = benchmark_mode(mode, scripts, jobs)
+            walls.append(wall)
+            for idx, (t, ok) in enumerate(zip(seconds, success)):
+                per_chart[idx].append(t)
+                if not ok:
+                    failed.add(scripts[idx].stem)
+        median = [float(np.median(t)) for t in per_chart]
+        by_category = {}
+        for category, t in zip(categories, median):
+            by_category.setdefault(category, []).append(t)
+        report['modes'][mode] = {
+            **summarize(median),
+            'wall': float(np.median(walls)),
+            'categories': {c: summarize(t) for c, t in by_category.items()},
+            'per_chart': {s.stem: round(t, 4) for s, t in zip(scripts, median)},
+            'failed': sorted(failed),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark chart runner modes')
+    parser.add_argument('--modes', type=str, default=','.join(MODES),
+                        help=f"Comma-separated modes (default: {','.join(MODES)})")
+    parser.add_argument('--repeat', type=int, default=1, help='Passes per mode')
+    parser.add_argument('--jobs', type=int, default=None, help='Workers for pooled mode')
+    parser.add_argument('--json', type=str, help='Also write the results to a JSON file')
+    args = parser.parse_args()
+
+    modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+    missing = [str(chart_script(folder)) for _, folder in REPRESENTATIVE
+               if not chart_script(folder).exists()]
+    if missing:
+        print("Missing chart scripts: " + ', '.join(missing))
+        return 1
+    categories = [c for c, _ in REPRESENTATIVE]
+    with tempfile.TemporaryDirectory(prefix='runner_benchmark_') as tmp:
+        scripts = copy_charts([folder for _, folder in REPRESENTATIVE], tmp)
+        report = run_modes(modes, scripts, categories, args.repeat, args.jobs)
+
+    print(f"{len(scripts)} charts, {args.repeat} pass(es) per mode\n")
+    print(f"{'mode':12s} {'category':14s} {'p50':>8s} {'p95':>8s} {'total':>8s}")
+    print("-" * 54)
+    for mode, info in report['modes'].items():
+        for category, stats in info['categories'].items():
+            print(f"{mode:12s} {category:14s} {stats['p50'] * 1000:6.1f}ms "
+                  f"{stats['p95'] * 1000:6.1f}ms {stats['total']:7.2f}s")
+        print(f"{mode:12s} {'ALL':14s} {info['p50'] * 1000:6.1f}ms {info['p95'] * 1000:6.1f}ms "
+              f"{info['total']:7.2f}s  (wall {info['wall']:.2f}s)")
+        if info['failed']:
+            print(f"{'':12s} failed: {', '.join(info['failed'])}")
+        print()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results: {args.json}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,397 @@
+"""
+Declarative chart specs: simple charts as data instead of scripts.
+
+Many figures are a bar, line or pie chart over a short literal list. For
+those a spec file replaces the Python script: <name>.chart.yaml (or
+<name>.chart.json) in the figure folder, rendered to <name>.pdf next to it.
+
+    title: Global ETF Industry Growth
+    module: module_04_traditional
+    lesson: 46
+    style: lesson
+    figsize: [10, 6]
+    source: 'Source: ETFGI, BlackRock [SYNTHETIC ESTIMATES]'
+    panels:
+      - kind: bar
+        x: [2010, 2012, 2014]
+        series:
+          - {values: [1.3, 1.8, 2.7], color: mlblue}
+        ylabel: {text: 'AUM (USD Trillions)', color: mlblue}
+        value_labels: {fmt: '${}T'}
+
+Panel kinds: bar (grouped when there are several series), barh,
+stacked_bar, line, pie. A panel may carry a `twin` panel drawn on a
+secondary y axis. Colors are hex strings or names of the Beamer palette
+(mlblue, mlpurple, ...).
+
+render_specs() draws any number of specs in one process: matplotlib,
+fonts and styles are loaded once, and each spec is drawn inside
+chart_style() so no settings leak between charts. generate_all_charts.py
+renders all spec files of a build in a single process this way.
+
+Usage:
+    python -m charts._shared.specs                       # All specs in the project
+    python -m charts._shared.specs module_04_traditional # Specs under a folder
+    python -m charts._shared.specs path/to/x.chart.yaml --jsonl
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from .bootstrap import lazy_import
+from .colors import MLBLUE, MLGRAY, MLGREEN, MLLAVENDER, MLORANGE, MLPURPLE, MLRED
+
+# Loaded on first draw, so finding specs (SPEC_SUFFIXES, discover_specs)
+# does not import matplotlib
+plt = lazy_import('matplotlib.pyplot')
+np = lazy_import('numpy')
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+SPEC_SUFFIXES = ('.chart.yaml', '.chart.yml', '.chart.json')
+DEFAULT_STYLE = 'lesson'
+
+PALETTE = {
+    'mlpurple': MLPURPLE,
+    'mlblue': MLBLUE,
+    'mlorange': MLORANGE,
+    'mlgreen': MLGREEN,
+    'mlred': MLRED,
+    'mllavender': MLLAVENDER,
+    'mlgray': MLGRAY,
+}
+
+# Small text under the chart: `source` (bottom right) and `synthetic` (bottom centre)
+SOURCE_TEXT = {'x': 0.98, 'y': 0.02, 'fontsize': 7, 'color': '#999999',
+               'ha': 'right', 'style': 'italic'}
+SYNTHETIC_TEXT = {'x': 0.5, 'y': 0.02, 'fontsize': 7, 'color': '#999999',
+                  'ha': 'center', 'style': 'italic'}
+NOTE_BOX = {'boxstyle': 'round', 'facecolor': '#F5F5F5', 'edgecolor': '#CCCCCC'}
+
+
+class SpecError(ValueError):
+    pass
+
+
+def is_spec(path):
+    return str(path).endswith(SPEC_SUFFIXES)
+
+
+def spec_stem(path):
+    """Chart name of a spec file: etf_growth.chart.yaml -> etf_growth"""
+    name = Path(path).name
+    for suffix in SPEC_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return Path(path).stem
+
+
+def discover_specs(root=PROJECT_ROOT):
+    """Every spec file under root (a folder or a single spec)"""
+    root = Path(root)
+    if root.is_file():
+        return [root]
+    return sorted(p for suffix in SPEC_SUFFIXES for p in root.rglob(f'*{suffix}'))
+
+
+def load_spec(path):
+    """Parse a YAML or JSON spec file into a dict"""
+    path = Path(path)
+    text = path.read_text(encoding='utf-8')
+    if path.name.endswith('.json'):
+        spec = json.loads(text)
+    else:
+        try:
+            import yaml
+        except ImportError:
+            raise SpecError(f"{path}: PyYAML is needed for YAML specs "
+                            f"(pip install pyyaml)") from None
+        spec = yaml.safe_load(text)
+    if not isinstance(spec, dict) or not spec.get('panels'):
+        raise SpecError(f"{path}: a spec needs a 'panels' list")
+    return spec
+
+
+def color(value):
+    if isinstance(value, list):
+        return [color(v) for v in value]
+    if isinstance(value, str):
+        return PALETTE.get(value.lower(), value)
+    return value
+
+
+def _text(value, **defaults):
+    """A label given as a string or as {text, ...text properties}"""
+    if value is None:
+        return None, {}
+    if isinstance(value, str):
+        return value, defaults
+    props = {**defaults, **{k: v for k, v in value.items() if k != 'text'}}
+    if 'color' in props:
+        props['color'] = color(props['color'])
+    return value['text'], props
+
+
+def _series_props(series, kind):
+    props = {}
+    for key in ('label', 'alpha', 'edgecolor', 'linewidth', 'linestyle',
+                'marker', 'markersize', 'hatch'):
+        if key in series:
+            props[key] = series[key]
+    if 'color' in series:
+        props['color'] = color(series['color'])
+    if 'edgecolor' in props:
+        props['edgecolor'] = color(props['edgecolor'])
+    if kind == 'line':
+        props.setdefault('linewidth', 2)
+    return props
+
+
+def _positions(panel):
+    """x positions and tick labels of a panel"""
+    if 'x' in panel:
+        return np.asarray(panel['x'], dtype=float), None
+    categories = panel.get('categories')
+    if categories is None:
+        n = len(panel['series'][0]['values'])
+        return np.arange(n, dtype=float), None
+    return np.arange(len(categories), dtype=float), categories
+
+
+def _draw_bars(ax, panel, kind):
+    from .annotations import bar_labels
+
+    x, categories = _positions(panel)
+    series = panel['series']
+    width = panel.get('width', 0.8 / (1 if kind == 'stacked_bar' else len(series)))
+    horizontal = kind == 'barh'
+    draw = ax.barh if horizontal else ax.bar
+
+    containers = []
+    bottom = np.zeros(len(x))
+    for i, s in enumerate(series):
+        values = np.asarray(s['values'], dtype=float)
+        props = _series_props(s, kind)
+        if kind == 'stacked_bar':
+            bars = draw(x, values, width, bottom=bottom, **props)
+            bottom = bottom + values
+        else:
+            offset = (i - (len(series) - 1) / 2) * width
+            bars = draw(x + offset, values, width, **props)
+        containers.append(bars)
+
+    if categories is not None:
+        tick_props = panel.get('ticks', {})
+        if horizontal:
+            ax.set_yticks(x)
+            ax.set_yticklabels(categories, **tick_props)
+        else:
+            ax.set_xticks(x)
+            ax.set_xticklabels(categories, **tick_props)
+
+    labels = panel.get('value_labels')
+    if labels:
+        labels = {} if labels is True else dict(labels)
+        which = labels.pop('series', range(len(containers)))
+        per_series = labels.pop('labels', None)
+        if 'color' in labels:
+            labels['color'] = color(labels['color'])
+        for i in which:
+            bar_labels(ax, containers[i],
+                       labels=per_series[i] if per_series else None, **labels)
+    return containers
+
+
+def _draw_lines(ax, panel):
+    x, categories = _positions(panel)
+    for s in panel['series']:
+        ax.plot(x, np.asarray(s['values'], dtype=float), **_series_props(s, 'line'))
+    if categories is not None:
+        ax.set_xticks(x)
+        ax.set_xticklabels(categories, **panel.get('ticks', {}))
+
+
+def _draw_pie(ax, panel):
+    s = panel['series'][0]
+    props = {k: s[k] for k in ('explode', 'autopct', 'startangle', 'pctdistance',
+                               'labeldistance') if k in s}
+    if 'colors' in s:
+        props['colors'] = color(s['colors'])
+    ax.pie(s['values'], labels=panel.get('categories'), **props)
+    ax.set_aspect('equal')
+
+
+def _decorate(ax, panel):
+    text, props = _text(panel.get('title'), fontweight='bold')
+    if text:
+        ax.set_title(text, **props)
+    for axis in ('x', 'y'):
+        label, props = _text(panel.get(f'{axis}label'))
+        if label:
+            getattr(ax, f'set_{axis}label')(label, **props)
+            if 'color' in props:
+                ax.tick_params(axis=axis, labelcolor=props['color'])
+        if f'{axis}lim' in panel:
+            getattr(ax, f'set_{axis}lim')(*panel[f'{axis}lim'])
+
+    for line in panel.get('hlines', []):
+        line = dict(line)
+        label = line.pop('text', None)
+        text_at = line.pop('text_at', None)
+        line['color'] = color(line.get('color', MLGRAY))
+        line.setdefault('linestyle', '--')
+        ax.axhline(**line)
+        if label:
+            tx, ty = text_at or (ax.get_xlim()[1], line['y'])
+            ax.text(tx, ty, label, fontsize=8, color=line['color'])
+
+    for note in panel.get('texts', []):
+        note = dict(note)
+        box = note.pop('box', None)
+        text = note.pop('text')
+        x, y = note.pop('x'), note.pop('y')
+        if note.pop('coords', 'axes') == 'axes':
+            note['transform'] = ax.transAxes
+        if box:
+            note['bbox'] = NOTE_BOX if box is True else box
+        if 'color' in note:
+            note['color'] = color(note['color'])
+        ax.text(x, y, text, **note)
+
+    grid = panel.get('grid')
+    if grid:
+        ax.grid(True, axis='both' if grid is True else grid, alpha=0.3)
+        ax.set_axisbelow(True)
+    elif grid is False:
+        ax.grid(False)
+
+    for spine in panel.get('hide_spines', []):
+        ax.spines[spine].set_visible(False)
+
+    legend = panel.get('legend')
+    if legend:
+        ax.legend(**({} if legend is True else legend))
+
+
+def draw_panel(ax, panel):
+    """Draw one panel (and its twin axis) onto ax"""
+    kind = panel.get('kind', 'bar')
+    if kind in ('bar', 'barh', 'stacked_bar'):
+        _draw_bars(ax, panel, kind)
+    elif kind == 'line':
+        _draw_lines(ax, panel)
+    elif kind == 'pie':
+        _draw_pie(ax, panel)
+    else:
+        raise SpecError(f"Unknown panel kind '{kind}' "
+                        f"(available: bar, barh, stacked_bar, line, pie)")
+    _decorate(ax, panel)
+
+    if 'twin' in panel:
+        twin = ax.twinx()
+        twin_panel = dict(panel['twin'])
+        if 'x' not in twin_panel and 'categories' not in twin_panel:
+            twin_panel['x'] = list(_positions(panel)[0])
+        twin_panel.setdefault('hide_spines', panel.get('hide_spines', []))
+        draw_panel(twin, twin_panel)
+
+
+def build_figure(spec):
+    """Figure for a spec (style must already be applied)"""
+    panels = spec['panels']
+    rows, cols = spec.get('layout', (1, len(panels)))
+    fig, axes = plt.subplots(rows, cols, figsize=spec.get('figsize'), squeeze=False)
+    for ax, panel in zip(axes.flat, panels):
+        draw_panel(ax, panel)
+    for ax in list(axes.flat)[len(panels):]:
+        ax.set_visible(False)
+
+    text, props = _text(spec.get('suptitle'), fontsize=14, fontweight='bold')
+    if text:
+        fig.suptitle(text, **props)
+    for key, defaults in (('source', SOURCE_TEXT), ('synthetic', SYNTHETIC_TEXT)):
+        if spec.get(key):
+            props = dict(defaults)
+            fig.text(props.pop('x'), props.pop('y'), spec[key], **props)
+    for note in spec.get('notes', []):
+        note = dict(note)
+        box = note.pop('box', None)
+        if box:
+            note['bbox'] = NOTE_BOX if box is True else box
+        fig.text(note.pop('x'), note.pop('y'), note.pop('text'), **note)
+
+    if spec.get('tight_layout', True):
+        fig.tight_layout()
+    return fig
+
+
+def render_spec(path, formats=None):
+    """Render one spec file to <name>.pdf next to it. Returns save_chart()'s
+    per-format dict."""
+    from .output import save_chart
+    from .styles import chart_style
+
+    path = Path(path)
+    spec = load_spec(path)
+    output_path = path.parent / spec.get('output', f'{spec_stem(path)}.pdf')
+    with chart_style(spec.get('style', DEFAULT_STYLE), rc=spec.get('rc')):
+        fig = build_figure(spec)
+        try:
+            return save_chart(fig, output_path, formats=formats)
+        finally:
+            plt.close(fig)
+
+
+def render_specs(paths, formats=None, on_result=None):
+    """Render many specs in this process; a failing spec does not stop the batch.
+
+    Returns one {'spec', 'success', 'error', 'seconds', 'outputs'} dict per
+    spec; on_result, if given, is called with each as it completes.
+    """
+    results = []
+    for path in paths:
+        start = time.perf_counter()
+        result = {'spec': str(path), 'success': False, 'error': None, 'outputs': {}}
+        try:
+            result['outputs'] = render_spec(path, formats)
+            result['success'] = True
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+        result['seconds'] = time.perf_counter() - start
+        results.append(result)
+        if on_result:
+            on_result(result)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render declarative chart specs')
+    parser.add_argument('paths', nargs='*', help='Spec files or folders (default: project)')
+    parser.add_argument('--jsonl', action='store_true',
+                        help='Print one JSON result per spec (used by generate_all_charts.py)')
+    args = parser.parse_args(argv)
+
+    roots = args.paths or [PROJECT_ROOT]
+    paths = [p for root in roots for p in discover_specs(root)]
+
+    def report(result):
+        if args.jsonl:
+            print(json.dumps(result), flush=True)
+        else:
+            status = 'OK' if result['success'] else 'FAIL'
+            print(f"  [{status:4s}] {spec_stem(result['spec']):<40} ({result['seconds']:.2f}s)"
+                  + (f"  {result['error']}" if result['error'] else ''))
+
+    start = time.perf_counter()
+    results = render_specs(paths, on_result=report)
+    if not args.jsonl:
+        failed = sum(1 for r in results if not r['success'])
+        print(f"Rendered {len(results) - failed}/{len(results)} specs "
+              f"in {time.perf_counter() - start:.1f}s")
+    return 0 if all(r['success'] for r in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,24 @@
 """
 Shared matplotlib styles for Digital Finance charts
 Optimized for 8pt Beamer slides
+
+Styles are named presets in STYLE_PRESETS. Use chart_style() to apply one
+for the duration of a block; rcParams are restored on exit, so charts
+rendered one after another in the same process do not inherit each
+other's settings:
+
+    with chart_style('lesson'):
+        fig, ax = plt.subplots()
+        ...
+
+chart_style() also works as a decorator on a script's create_chart().
 """
 
-import matplotlib.pyplot as plt
+from contextlib import contextmanager
+
+import matplotlib as mpl
+
+from .fonts import font_rcparams
 
 # Standard rcParams for academic charts (8pt minimum)
 CHART_RCPARAMS = {
@@ -49,30 +64,83 @@ COMPACT_RCPARAMS = {
     'legend.fontsize': 7,
 }
 
+# Block repeated at the top of most module figure scripts
+LESSON_RCPARAMS = {
+    'font.size': 10,
+    'axes.labelsize': 10,
+    'axes.titlesize': 11,
+    'xtick.labelsize': 9,
+    'ytick.labelsize': 9,
+    'legend.fontsize': 9,
+    'figure.figsize': (10, 6),
+    'figure.dpi': 150,
+}
+
+# Large-label variant used by the diagram-style figure scripts
+LARGE_RCPARAMS = {
+    'font.size': 14,
+    'axes.labelsize': 14,
+}
+
+STYLE_PRESETS = {
+    'standard': CHART_RCPARAMS,
+    'presentation': PRESENTATION_RCPARAMS,
+    'compact': COMPACT_RCPARAMS,
+    'lesson': LESSON_RCPARAMS,
+    'large': LARGE_RCPARAMS,
+}
+
+
+def get_style(name='standard'):
+    """Return the rcParams of a named preset"""
+    try:
+        return STYLE_PRESETS[name]
+    except KeyError:
+        raise ValueError(f"Unknown chart style '{name}' "
+                         f"(available: {', '.join(STYLE_PRESETS)})") from None
+
+
+@contextmanager
+def chart_style(name='standard', rc=None, fonts=None):
+    """Apply a named preset inside a with-block and restore rcParams on exit.
+
+    rc: optional dict of extra rcParams layered over the preset.
+    fonts: optional PDF font embedding mode ('type3', 'type42', 'core14').
+    """
+    params = dict(get_style(name))
+    if fonts:
+        params.update(font_rcparams(fonts))
+    if rc:
+        params.update(rc)
+    with mpl.rc_context(params):
+        yield params
+
+
+def use_style(name='standard'):
+    """Apply a named preset globally (for standalone scripts)"""
+    mpl.rcParams.update(get_style(name))
+
 
 def apply_chart_style():
     """Apply standard chart style"""
-    plt.rcParams.update(CHART_RCPARAMS)
+    use_style('standard')
 
 
 def apply_presentation_style():
     """Apply larger presentation style"""
-    plt.rcParams.update(PRESENTATION_RCPARAMS)
+    use_style('presentation')
 
 
 def apply_compact_style():
     """Apply compact style for dense charts"""
-    plt.rcParams.update(COMPACT_RCPARAMS)
+    use_style('compact')
 
 
 def setup_figure(figsize=(10, 6), style='standard'):
     """Create figure with appropriate style"""
-    if style == 'presentation':
-        apply_presentation_style()
-    elif style == 'compact':
-        apply_compact_style()
-    else:
-        apply_chart_style()
+    import matplotlib.pyplot as plt
+
+    use_style(style if style in STYLE_PRESETS else 'standard')
 
     fig, ax = plt.subplots(figsize=figsize)
     return fig, ax
@@ -0,0 +1 @@
+"""Order book demo: limit order book, matching engine, order flow simulator and analyses."""
@@ -0,0 +1,389 @@
+"""
+Columnar Order Book Snapshot Store
+
+Stores a simulated session - top-N-level book snapshots and trade prints -
+on disk, one raw binary file per column, and reads it back through
+np.memmap. A query touches only the columns and rows it asks for:
+
+- time-range slicing: binary search on the (sorted) time column, then a
+  view of the range in every requested column
+- downsampling: the last snapshot per time bucket (the book as it stood
+  at the bucket's end), gathered by index from the mapped columns
+- trade bars: volume, VWAP, high/low and trade counts per bucket, reduced
+  chunk by chunk
+
+Results are NumPy structured arrays (SNAPSHOT fields per row, with the
+depth columns as (n_levels,) sub-arrays), so a chart loads minutes of a
+session without reading hours of it into RAM.
+
+Layout of a store directory:
+
+    meta.json                   lengths, n_levels, column dtypes, user metadata
+    snapshots.<column>.bin      one file per snapshot column
+    trades.<column>.bin         one file per trade column
+
+Usage:
+    python book_store.py                     # Record 2 h of flow, then query it
+    python book_store.py --hours 8 --path session_store
+
+Author: BSc Digital Finance Course
+Date: 2025-12-07
+"""
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+STORE_VERSION = 1
+META_FILE = 'meta.json'
+
+
+def snapshot_dtype(n_levels):
+    """Structured dtype of one top-N book snapshot."""
+    return np.dtype([
+        ('time', np.float64),
+        ('best_bid', np.float64),
+        ('best_ask', np.float64),
+        ('mid', np.float64),
+        ('spread', np.float64),
+        ('bid_prices', np.float64, (n_levels,)),
+        ('bid_sizes', np.float64, (n_levels,)),
+        ('ask_prices', np.float64, (n_levels,)),
+        ('ask_sizes', np.float64, (n_levels,)),
+    ])
+
+
+# Trade prints; side is +1 for buyer-initiated (aggressor 'buy'), -1 for seller-initiated
+PRINT_DTYPE = np.dtype([
+    ('time', np.float64),
+    ('price', np.float64),
+    ('quantity', np.float64),
+    ('side', np.int8),
+])
+
+BAR_DTYPE = np.dtype([
+    ('time', np.float64),      # bucket start
+    ('volume', np.float64),
+    ('vwap', np.float64),
+    ('high', np.float64),
+    ('low', np.float64),
+    ('buy_volume', np.float64),
+    ('trades', np.int64),
+])
+
+
+class Table:
+    """Read-only columnar table: one memory-mapped file per field.
+
+    Rows are sorted by the 'time' column.
+    """
+
+    def __init__(self, directory, name, dtype, length):
+        self.directory = Path(directory)
+        self.name = name
+        self.dtype = dtype
+        self.length = length
+        self._columns = {}
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def fields(self):
+        return self.dtype.names
+
+    def column(self, field):
+        """The whole column as a read-only np.memmap (nothing is read yet)."""
+        if field not in self._columns:
+            base, shape = self.dtype[field].base, self.dtype[field].shape
+            if self.length == 0:
+                self._columns[field] = np.empty((0,) + shape, dtype=base)
+            else:
+                self._columns[field] = np.memmap(self.directory / f'{self.name}.{field}.bin',
+                                                 dtype=base, mode='r',
+                                                 shape=(self.length,) + shape)
+        return self._columns[field]
+
+    def time_slice(self, start=None, end=None):
+        """slice of the rows with start <= time < end (None: open-ended)."""
+        times = self.column('time')
+        lo = 0 if start is None else int(np.searchsorted(times, start, side='left'))
+        hi = self.length if end is None else int(np.searchsorted(times, end, side='left'))
+        return slice(lo, max(lo, hi))
+
+    def take(self, rows, fields=None):
+        """Structured array of the given rows (a slice or an index array)."""
+        fields = list(fields or self.fields)
+        columns = {f: self.column(f)[rows] for f in fields}
+        n = len(next(iter(columns.values())))
+        out = np.empty(n, dtype=np.dtype([(f, self.dtype[f]) for f in fields]))
+        for field, values in columns.items():
+            out[field] = values
+        return out
+
+    def read(self, start=None, end=None, fields=None):
+        """Rows with start <= time < end, as a structured array."""
+        return self.take(self.time_slice(start, end), fields)
+
+    def downsample(self, interval, start=None, end=None, fields=None):
+        """The last row at or before the end of each `interval`-second bucket.
+
+        Buckets start at `start` (default: the first row's time); buckets
+        with no row at or before their end are skipped.
+        """
+        times = self.column('time')
+        if self.length == 0:
+            return self.take(slice(0, 0), fields)
+        rows = self.time_slice(start, end)
+        first = times[0] if start is None else start
+        last = times[-1] if end is None else end
+        edges = np.arange(first + interval, last + interval * 0.5, interval)
+        index = np.searchsorted(times, edges, side='right') - 1
+        index = index[(index >= rows.start) & (index < rows.stop)]
+        return self.take(np.unique(index), fields)
+
+
+def trade_bars(trades, interval, start=None, end=None, chunk=1_000_000):
+    """Per-bucket trade statistics (BAR_DTYPE) from a trade Table.
+
+    Processes the selected range `chunk` prints at a time, so the memory
+    used depends on the number of bars, not on the number of trades.
+    """
+    rows = trades.time_slice(start, end)
+    times = trades.column('time')
+    if rows.stop <= rows.start:
+        return np.zeros(0, dtype=BAR_DTYPE)
+    first = float(times[rows.start] if start is None else start)
+    if end is None:
+        n_bars = int((times[rows.stop - 1] - first) // interval) + 1
+    else:
+        n_bars = max(1, int(np.ceil((end - first) / interval)))
+
+    volume = np.zeros(n_bars)
+    notional = np.zeros(n_bars)
+    buy_volume = np.zeros(n_bars)
+    counts = np.zeros(n_bars, dtype=np.int64)
+    high = np.full(n_bars, -np.inf)
+    low = np.full(n_bars, np.inf)
+    for lo in range(rows.start, rows.stop, chunk):
+        part = slice(lo, min(lo + chunk, rows.stop))
+        t = np.asarray(trades.column('time')[part])
+        price = np.asarray(trades.column('price')[part])
+        qty = np.asarray(trades.column('quantity')[part])
+        side = np.asarray(trades.column('side')[part])
+        bucket = np.minimum(((t - first) // interval).astype(np.int64), n_bars - 1)
+        volume += np.bincount(bucket, qty, n_bars)
+        notional += np.bincount(bucket, price * qty, n_bars)
+        buy_volume += np.bincount(bucket, np.where(side > 0, qty, 0.0), n_bars)
+        counts += np.bincount(bucket, minlength=n_bars)
+        np.maximum.at(high, bucket, price)
+        np.minimum.at(low, bucket, price)
+
+    bars = np.zeros(n_bars, dtype=BAR_DTYPE)
+    bars['time'] = first + np.arange(n_bars) * interval
+    bars['volume'] = volume
+    bars['buy_volume'] = buy_volume
+    bars['trades'] = counts
+    with np.errstate(invalid='ignore', divide='ignore'):
+        bars['vwap'] = np.where(counts > 0, notional / volume, np.nan)
+    bars['high'] = np.where(counts > 0, high, np.nan)
+    bars['low'] = np.where(counts > 0, low, np.nan)
+    return bars
+
+
+class BookStore:
+    """A recorded session: .snapshots and .trades Tables plus .meta."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        meta_path = self.path / META_FILE
+        if not meta_path.exists():
+            raise FileNotFoundError(f"no book store at {self.path} (missing {META_FILE})")
+        self.meta = json.loads(meta_path.read_text(encoding='utf-8'))
+        if self.meta.get('version') != STORE_VERSION:
+            raise ValueError(f"unsupported store version {self.meta.get('version')} "
+                             f"(expected {STORE_VERSION})")
+        self.n_levels = self.meta['n_levels']
+        self.snapshots = Table(self.path, 'snapshots', snapshot_dtype(self.n_levels),
+                               self.meta['lengths']['snapshots'])
+        self.trades = Table(self.path, 'trades', PRINT_DTYPE, self.meta['lengths']['trades'])
+
+    def __repr__(self):
+        return (f"BookStore({str(self.path)!r}, snapshots={len(self.snapshots)}, "
+                f"trades={len(self.trades)}, levels={self.n_levels})")
+
+    def trade_bars(self, interval, start=None, end=None):
+        return trade_bars(self.trades, interval, start, end)
+
+
+class BookStoreWriter:
+    """Appends snapshots and trades to a new store, buffered per chunk.
+
+    Use as a context manager (or call close()); meta.json is written on
+    close, so a store that was not closed is never opened half-written.
+    """
+
+    def __init__(self, path, n_levels, chunk=4096, meta=None, overwrite=False):
+        self.path = Path(path)
+        if (self.path / META_FILE).exists():
+            if not overwrite:
+                raise FileExistsError(f"book store already exists: {self.path}")
+            shutil.rmtree(self.path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.n_levels = n_levels
+        self.chunk = chunk
+        self.meta = dict(meta or {})
+        self._dtypes = {'snapshots': snapshot_dtype(n_levels), 'trades': PRINT_DTYPE}
+        self._buffers = {name: np.empty(chunk, dtype=dtype)
+                         for name, dtype in self._dtypes.items()}
+        self._filled = {name: 0 for name in self._dtypes}
+        self._lengths = {name: 0 for name in self._dtypes}
+        self._files = {(name, field): open(self.path / f'{name}.{field}.bin', 'wb')
+                       for name, dtype in self._dtypes.items() for field in dtype.names}
+
+    def _flush(self, name):
+        n = self._filled[name]
+        if not n:
+            return
+        buffer = self._buffers[name][:n]
+        for field in self._dtypes[name].names:
+            self._files[name, field].write(np.ascontiguousarray(buffer[field]).tobytes())
+        self._lengths[name] += n
+        self._filled[name] = 0
+
+    def _append(self, name, rows):
+        buffer = self._buffers[name]
+        for lo in range(0, len(rows), self.chunk):
+            part = rows[lo:lo + self.chunk]
+            while len(part):
+                i = self._filled[name]
+                n = min(len(part), self.chunk - i)
+                for field in self._dtypes[name].names:
+                    buffer[field][i:i + n] = part[field][:n]
+                self._filled[name] = i + n
+                part = part[n:]
+                if self._filled[name] == self.chunk:
+                    self._flush(name)
+
+    def append(self, snapshot):
+        """Add one snapshot (an order_flow.Snapshot or anything with its fields).
+
+        Its `trades` (a TRADE_DTYPE array from the matching engine) are
+        stored as trade prints.
+        """
+        buffer = self._buffers['snapshots']
+        i = self._filled['snapshots']
+        row = buffer[i]
+        for field in buffer.dtype.names:
+            row[field] = getattr(snapshot, field)
+        self._filled['snapshots'] = i + 1
+        if i + 1 == self.chunk:
+            self._flush('snapshots')
+
+        trades = getattr(snapshot, 'trades', None)
+        if trades is not None and len(trades):
+            self.append_trades(trades)
+
+    def append_trades(self, trades):
+        """Add trades: a PRINT_DTYPE array, or matching-engine TRADE_DTYPE trades."""
+        if trades.dtype != PRINT_DTYPE:
+            prints = np.empty(len(trades), dtype=PRINT_DTYPE)
+            prints['time'] = trades['timestamp']
+            prints['price'] = trades['price']
+            prints['quantity'] = trades['quantity']
+            prints['side'] = np.where(trades['aggressor'] == 'buy', 1, -1)
+            trades = prints
+        self._append('trades', trades)
+
+    def close(self):
+        for name in self._dtypes:
+            self._flush(name)
+        for f in self._files.values():
+            f.close()
+        meta = {
+            'version': STORE_VERSION,
+            'n_levels': self.n_levels,
+            'lengths': self._lengths,
+            'columns': {name: {field: [dtype[field].base.str, list(dtype[field].shape)]
+                               for field in dtype.names}
+                        for name, dtype in self._dtypes.items()},
+            **self.meta,
+        }
+        tmp = self.path / f'{META_FILE}.tmp'
+        tmp.write_text(json.dumps(meta, indent=2), encoding='utf-8')
+        tmp.replace(self.path / META_FILE)
+        return BookStore(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            for f in self._files.values():
+                f.close()
+
+
+def record(snapshots, path, n_levels, meta=None, overwrite=False):
+    """Write an iterable of snapshots (e.g. OrderFlowSimulator.simulate())
+    to a new store; returns the opened BookStore."""
+    writer = BookStoreWriter(path, n_levels, meta=meta, overwrite=overwrite)
+    with writer:
+        for snapshot in snapshots:
+            writer.append(snapshot)
+    return BookStore(path)
+
+
+def main():
+    from order_flow import OrderFlowSimulator
+
+    parser = argparse.ArgumentParser(description='Record and replay a simulated session')
+    parser.add_argument('--hours', type=float, default=2.0, help='Simulated trading hours')
+    parser.add_argument('--interval', type=float, default=0.1, help='Seconds between snapshots')
+    parser.add_argument('--levels', type=int, default=10, help='Depth levels per snapshot')
+    parser.add_argument('--path', type=str, help='Store directory (default: a temporary one)')
+    args = parser.parse_args()
+
+    folder = Path(args.path) if args.path else Path(tempfile.mkdtemp()) / 'session'
+    duration = args.hours * 3600
+    sim = OrderFlowSimulator()
+    start = time.perf_counter()
+    store = record(sim.simulate(duration, args.interval, args.levels), folder, args.levels,
+                   meta={'hours': args.hours, 'interval': args.interval}, overwrite=True)
+    t_record = time.perf_counter() - start
+    size = sum(f.stat().st_size for f in folder.iterdir())
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    window = store.snapshots.read(3600 * 0.5, 3600 * 0.5 + 300, fields=['time', 'mid', 'spread'])
+    t_slice = time.perf_counter() - start
+    start = time.perf_counter()
+    minutes = store.snapshots.downsample(60.0)
+    t_down = time.perf_counter() - start
+    start = time.perf_counter()
+    bars = store.trade_bars(60.0)
+    t_bars = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(f"\nBook store: {store}")
+    print("-" * 70)
+    print(f"Recorded:        {args.hours:g} h in {t_record:.1f} s, {size / 1e6:.1f} MB on disk")
+    print(f"5-min slice:     {len(window):,} snapshots in {t_slice * 1000:.2f} ms")
+    print(f"1-min samples:   {len(minutes):,} snapshots in {t_down * 1000:.2f} ms")
+    print(f"1-min bars:      {len(bars):,} bars from {len(store.trades):,} trades "
+          f"in {t_bars * 1000:.1f} ms")
+    print(f"Query memory:    {peak / 1e6:.2f} MB peak (session {size / 1e6:.1f} MB)")
+    if not args.path:
+        shutil.rmtree(folder.parent)
+
+
+if __name__ == '__main__':
+    main()
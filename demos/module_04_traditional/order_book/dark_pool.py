@@ -0,0 +1,447 @@
+"""
+Midpoint Dark Pool and Smart Order Router
+
+A dark pool shows no quotes: orders rest invisibly, in price-time priority
+on their limits, and cross each other at the midpoint of the lit market's
+best bid and offer (the NBBO of an OrderBook, order_book.py). Both sides
+save half the spread against the lit market, but a fill is only possible
+when contra-side liquidity happens to be resting in the pool.
+
+The SmartOrderRouter splits a parent order across venues: it first pings
+the dark pool with part of the order (immediate-or-cancel at the
+midpoint), then sends whatever is left to the lit book through the
+MatchingEngine (matching_engine.py). The cost of each parent order is
+measured against the lit midpoint on arrival, in basis points.
+
+simulate_parents() runs many parent orders through the router while the
+lit book evolves with simulated order flow (order_flow.py) and contra
+orders arrive in the dark pool, once per dark allocation to compare.
+
+Usage:
+    python dark_pool.py                 # Routing comparison and throughput
+    python dark_pool.py --parents 5000 --orders 500000
+
+Author: BSc Digital Finance Course
+Date: 2025-12-07
+"""
+
+import argparse
+import bisect
+import math
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+
+try:  # imported as demos.module_04_traditional.order_book
+    from .matching_engine import MatchingEngine
+    from .order_book import OrderBook
+    from .order_flow import OrderFlowSimulator
+except ImportError:  # run as a script from this folder
+    from matching_engine import MatchingEngine
+    from order_book import OrderBook
+    from order_flow import OrderFlowSimulator
+
+BPS = 10_000
+
+DarkFill = namedtuple('DarkFill', ['fill_id', 'timestamp', 'price', 'quantity',
+                                   'buy_order_id', 'sell_order_id'])
+
+DarkReport = namedtuple('DarkReport', ['order_id', 'status', 'filled', 'remaining',
+                                       'avg_price', 'fills'])
+
+ParentReport = namedtuple('ParentReport', ['side', 'quantity', 'filled', 'dark_filled',
+                                           'lit_filled', 'avg_price', 'arrival_mid',
+                                           'cost_bps'])
+
+ROUTING_DTYPE = np.dtype([
+    ('dark_fraction', np.float64),
+    ('cost_bps', np.float64),        # quantity-weighted, vs arrival mid
+    ('cost_std', np.float64),        # across parent orders
+    ('dark_share', np.float64),      # of the filled quantity
+    ('fill_rate', np.float64),
+    ('parents', np.int64),
+])
+
+
+class DarkOrder:
+    """A resting midpoint-pegged order."""
+
+    __slots__ = ('order_id', 'side', 'quantity', 'limit')
+
+    def __init__(self, order_id, side, quantity, limit):
+        self.order_id = order_id
+        self.side = side
+        self.quantity = quantity
+        self.limit = limit
+
+
+class DarkPool:
+    """Midpoint-crossing dark pool referencing a lit OrderBook's NBBO.
+
+    Orders are pegged to the midpoint, optionally with a limit price.
+    Resting orders are indexed by limit: one FIFO queue per limit price
+    (pegged orders without a limit queue ahead of all limits), with the
+    limits of each side kept sorted. An order matches the most aggressive
+    limits first and, within a limit, the oldest order first; matching
+    stops at the first limit that excludes the midpoint, so excluded orders
+    are never scanned. Nothing crosses while the lit market is one-sided or
+    crossed (no midpoint to reference). When the midpoint changes, resting
+    buys and sells that now accept it are crossed (recross(), also run on
+    every submit).
+    """
+
+    def __init__(self, lit_book, keep_fills=True):
+        self.lit = lit_book
+        self.keep_fills = keep_fills
+        self.fills = []
+        self._levels = {'buy': {}, 'sell': {}}    # limit key -> deque of DarkOrders
+        self._limits = {'buy': [], 'sell': []}    # ascending limit keys per side
+        self._orders = {}
+        self._resting = {'buy': 0.0, 'sell': 0.0}
+        self._last_mid = None
+        self._next_id = 1
+        self.stats = {'orders': 0, 'cancels': 0, 'fills': 0, 'volume': 0.0}
+
+    def reference_price(self):
+        """Lit NBBO midpoint, or None if a side of the lit book is empty."""
+        bid = self.lit.best_level('buy')
+        ask = self.lit.best_level('sell')
+        if bid is None or ask is None or bid.tick >= ask.tick:
+            return None
+        return round((bid.tick + ask.tick) * self.lit.tick_size / 2, self.lit.decimals + 1)
+
+    def resting(self, side):
+        """Total quantity resting on one side of the pool."""
+        return self._resting[side]
+
+    @staticmethod
+    def _key(side, limit):
+        """Sort key of a limit: pegged orders sort as the most aggressive."""
+        if limit is None:
+            return math.inf if side == 'buy' else -math.inf
+        return limit
+
+    def _best(self, side, mid):
+        """Oldest live order at the best limit of `side` that accepts mid, or None."""
+        limits = self._limits[side]
+        levels = self._levels[side]
+        while limits:
+            key = limits[-1] if side == 'buy' else limits[0]
+            if key < mid if side == 'buy' else key > mid:
+                return None  # best limit excludes the midpoint, so do all others
+            queue = levels[key]
+            while queue and queue[0].quantity <= 0:
+                queue.popleft()  # cancelled or filled
+            if queue:
+                return queue[0]
+            del levels[key]
+            if side == 'buy':
+                limits.pop()
+            else:
+                del limits[0]
+        return None
+
+    def _fill(self, buy, sell, quantity, mid, timestamp, fills):
+        """Record a midpoint fill between a buy and a sell order id."""
+        self.stats['fills'] += 1
+        self.stats['volume'] += quantity
+        dark_fill = DarkFill(self.stats['fills'], timestamp, mid, quantity, buy, sell)
+        fills.append(dark_fill)
+        if self.keep_fills:
+            self.fills.append(dark_fill)
+
+    def _take(self, order, quantity):
+        """Reduce a resting order by a fill."""
+        order.quantity -= quantity
+        self._resting[order.side] -= quantity
+        if order.quantity <= 0:
+            del self._orders[order.order_id]  # leaves its queue lazily
+
+    def recross(self, timestamp=None):
+        """Cross resting buys and sells that accept the current midpoint.
+
+        Only needed after the midpoint moved or came back after the lit book
+        was one-sided or crossed (orders resting at one midpoint cannot
+        cross each other), so it returns at once otherwise. Returns the list
+        of DarkFills.
+        """
+        return self._recross(self.reference_price(), timestamp)
+
+    def _recross(self, mid, timestamp):
+        fills = []
+        if mid is None or mid == self._last_mid:
+            self._last_mid = mid  # None: orders resting now may cross later
+            return fills
+        self._last_mid = mid
+        while True:
+            buy = self._best('buy', mid)
+            sell = self._best('sell', mid) if buy is not None else None
+            if sell is None:
+                return fills
+            quantity = min(buy.quantity, sell.quantity)
+            self._take(buy, quantity)
+            self._take(sell, quantity)
+            self._fill(buy.order_id, sell.order_id, quantity, mid, timestamp, fills)
+
+    def submit(self, side, quantity, limit=None, ioc=False, timestamp=None):
+        """Cross an order at the current midpoint; rest the remainder unless ioc.
+
+        limit: worst acceptable midpoint (a buy does not trade above it).
+        Returns a DarkReport.
+        """
+        mid = self.reference_price()
+        if mid != self._last_mid:
+            self._recross(mid, timestamp)
+        self.stats['orders'] += 1
+        order_id = self._next_id
+        self._next_id += 1
+        fills = []
+        remaining = quantity
+        if mid is not None and (limit is None or (mid <= limit if side == 'buy'
+                                                  else mid >= limit)):
+            remaining = self._match(order_id, side, quantity, mid, timestamp, fills)
+
+        filled = quantity - remaining
+        if remaining <= 0:
+            status = 'filled'
+        elif ioc:
+            status = 'cancelled'
+        else:
+            order = DarkOrder(order_id, side, remaining, limit)
+            key = self._key(side, limit)
+            queue = self._levels[side].get(key)
+            if queue is None:
+                queue = self._levels[side][key] = deque()
+                bisect.insort(self._limits[side], key)
+            queue.append(order)
+            self._orders[order_id] = order
+            self._resting[side] += remaining
+            status = 'resting'
+        avg_price = mid if filled else None
+        return DarkReport(order_id, status, filled, remaining, avg_price, fills)
+
+    def _match(self, order_id, side, quantity, mid, timestamp, fills):
+        contra = 'sell' if side == 'buy' else 'buy'
+        while quantity > 0:
+            order = self._best(contra, mid)
+            if order is None:
+                break
+            fill = min(order.quantity, quantity)
+            quantity -= fill
+            self._take(order, fill)
+            buy_id, sell_id = (order_id, order.order_id) if side == 'buy' \
+                else (order.order_id, order_id)
+            self._fill(buy_id, sell_id, fill, mid, timestamp, fills)
+        return quantity
+
+    def cancel(self, order_id):
+        """Cancel a resting order; False if it is no longer in the pool."""
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            return False
+        self.stats['cancels'] += 1
+        self._resting[order.side] -= order.quantity
+        order.quantity = 0  # dropped lazily from its queue
+        return True
+
+    def __len__(self):
+        return len(self._orders)
+
+
+class SmartOrderRouter:
+    """Splits parent orders between a dark pool and the lit book.
+
+    dark_fraction of each parent is first offered to the dark pool as an
+    immediate-or-cancel midpoint order; the rest, plus anything the pool
+    could not fill, goes to the lit book as a market order (or an IOC
+    limit order when the parent has a limit price).
+    """
+
+    def __init__(self, engine, dark_pool, dark_fraction=0.5, lot_size=100):
+        self.engine = engine
+        self.dark = dark_pool
+        self.dark_fraction = dark_fraction
+        self.lot_size = lot_size
+        self.stats = {'parents': 0, 'child_orders': 0}
+
+    def route(self, side, quantity, limit=None, timestamp=None):
+        """Execute one parent order; returns a ParentReport."""
+        book = self.engine.book
+        arrival = book.get_mid_price()
+        self.stats['parents'] += 1
+        notional = 0.0
+
+        dark_qty = min(quantity, round(quantity * self.dark_fraction / self.lot_size)
+                       * self.lot_size)
+        dark_filled = 0.0
+        if dark_qty > 0:
+            report = self.dark.submit(side, dark_qty, limit, ioc=True, timestamp=timestamp)
+            self.stats['child_orders'] += 1
+            dark_filled = report.filled
+            if dark_filled:
+                notional += report.avg_price * dark_filled
+
+        lit_qty = quantity - dark_filled
+        lit_filled = 0.0
+        if lit_qty > 0:
+            order_type = 'market' if limit is None else 'ioc'
+            report = self.engine.submit(side, lit_qty, limit, order_type, timestamp=timestamp)
+            self.stats['child_orders'] += 1
+            lit_filled = report.filled
+            if lit_filled:
+                notional += report.avg_price * lit_filled
+
+        filled = dark_filled + lit_filled
+        avg_price = notional / filled if filled else None
+        sign = 1 if side == 'buy' else -1
+        cost = sign * (avg_price - arrival) / arrival * BPS if filled else np.nan
+        return ParentReport(side, quantity, filled, dark_filled, lit_filled, avg_price,
+                            arrival, cost)
+
+
+def simulate_parents(n_parents=1000, dark_fraction=0.5, gap=2.0, parent_lots=(5, 40),
+                     contra_rate=1.5, contra_lots=(1, 20), max_dark_resting=200, seed=42):
+    """Route n_parents random parent orders while lit and dark liquidity evolve.
+
+    Between parents the lit book runs `gap` seconds of simulated order flow
+    and Poisson(contra_rate * gap) contra orders of random side arrive in
+    the dark pool (the oldest are cancelled beyond max_dark_resting). All
+    random draws are made up front, so every dark_fraction sees the same
+    parents, lit flow and dark arrivals. Returns a list of ParentReports.
+    """
+    rng = np.random.default_rng(seed)
+    sides = np.where(rng.random(n_parents) < 0.5, 'buy', 'sell').tolist()
+    sizes = (rng.integers(*parent_lots, n_parents) * 100.0).tolist()
+    n_contra = rng.poisson(contra_rate * gap, n_parents).tolist()
+    contra_sides = np.where(rng.random(sum(n_contra)) < 0.5, 'buy', 'sell').tolist()
+    contra_sizes = (rng.integers(*contra_lots, sum(n_contra)) * 100.0).tolist()
+
+    sim = OrderFlowSimulator(seed=seed)
+    engine = sim.engine
+    pool = DarkPool(sim.book, keep_fills=False)
+    router = SmartOrderRouter(engine, pool, dark_fraction)
+    resting = deque()
+    reports = []
+    k = 0
+    for side, size, n in zip(sides, sizes, n_contra):
+        for _ in sim.simulate(gap, interval=gap, n_levels=1):
+            pass
+        pool.recross(sim.time)
+        for _ in range(n):
+            report = pool.submit(contra_sides[k], contra_sizes[k], timestamp=sim.time)
+            k += 1
+            if report.status == 'resting':
+                resting.append(report.order_id)
+        while len(pool) > max_dark_resting and resting:
+            pool.cancel(resting.popleft())
+        reports.append(router.route(side, size, timestamp=sim.time))
+    return reports
+
+
+def summarize(reports, dark_fraction):
+    """One ROUTING_DTYPE row for the parent orders of one routing policy."""
+    filled = np.array([r.filled for r in reports])
+    quantity = np.array([r.quantity for r in reports])
+    dark = np.array([r.dark_filled for r in reports])
+    cost = np.array([r.cost_bps for r in reports])
+    done = filled > 0
+    return np.array([(dark_fraction,
+                      np.sum(cost[done] * filled[done]) / filled[done].sum(),
+                      np.std(cost[done]),
+                      dark.sum() / filled.sum(),
+                      filled.sum() / quantity.sum(),
+                      len(reports))], dtype=ROUTING_DTYPE)[0]
+
+
+def compare_routing(dark_fractions=(0.0, 0.25, 0.5, 0.75, 1.0), n_parents=1000, seed=42,
+                    **kwargs):
+    """ROUTING_DTYPE rows for each dark allocation on identical flow."""
+    return np.array([summarize(simulate_parents(n_parents, f, seed=seed, **kwargs), f)
+                     for f in dark_fractions], dtype=ROUTING_DTYPE)
+
+
+def measure_throughput(n_orders=200_000, n_parents=20_000, seed=42):
+    """Dark pool orders/s and router parent orders/s on a static deep book."""
+    rng = np.random.default_rng(seed)
+    book = OrderBook(100.0)
+    for level in range(1, 201):
+        book.add_limit_order('buy', 100.0 - level * 0.01, 1e9)
+        book.add_limit_order('sell', 100.0 + level * 0.01, 1e9)
+
+    pool = DarkPool(book, keep_fills=False)
+    sides = np.where(rng.random(n_orders) < 0.5, 'buy', 'sell').tolist()
+    sizes = (rng.integers(1, 20, n_orders) * 100.0).tolist()
+    start = time.perf_counter()
+    for side, size in zip(sides, sizes):
+        pool.submit(side, size)
+    t_dark = time.perf_counter() - start
+
+    router = SmartOrderRouter(MatchingEngine(book, keep_trades=False), pool, 0.5)
+    sides = np.where(rng.random(n_parents) < 0.5, 'buy', 'sell').tolist()
+    sizes = (rng.integers(5, 40, n_parents) * 100.0).tolist()
+    start = time.perf_counter()
+    for side, size in zip(sides, sizes):
+        router.route(side, size)
+    t_router = time.perf_counter() - start
+    return {
+        'dark_orders_per_second': n_orders / t_dark,
+        'dark_fills': pool.stats['fills'],
+        'parents_per_second': n_parents / t_router,
+        'child_orders_per_second': router.stats['child_orders'] / t_router,
+    }
+
+
+def check_recross():
+    """Resting orders cross once a one-sided lit book has a midpoint again.
+
+    The midpoint comes back at its old value, so the pool has to notice
+    that it was undefined in between. Returns the recrossed quantity.
+    """
+    book = OrderBook(100.0)
+    book.add_limit_order('buy', 99.99, 100)
+    ask = book.add_limit_order('sell', 100.01, 100)
+    pool = DarkPool(book)
+    pool.submit('buy', 100, ioc=True)       # Sees the 100.00 midpoint
+    book.cancel_order(ask)
+    pool.submit('buy', 100)
+    pool.submit('sell', 100)                # Both rest: no midpoint
+    book.add_limit_order('sell', 100.01, 100)
+    fills = pool.recross()
+    assert len(pool) == 0 and sum(f.quantity for f in fills) == 100, fills
+    return sum(f.quantity for f in fills)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Dark pool routing and throughput')
+    parser.add_argument('--parents', type=int, default=1000, help='Parent orders per policy')
+    parser.add_argument('--orders', type=int, default=200_000,
+                        help='Dark orders in the throughput test')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = compare_routing(n_parents=args.parents)
+    seconds = time.perf_counter() - start
+
+    print(f"\nSmart order routing: {args.parents:,} parent orders per policy "
+          f"({seconds:.1f} s)")
+    print("-" * 70)
+    print(f"{'dark share':>10s} {'cost (bp)':>10s} {'std (bp)':>9s} {'filled dark':>12s} "
+          f"{'fill rate':>10s}")
+    for row in table:
+        print(f"{row['dark_fraction']:10.0%} {row['cost_bps']:10.2f} {row['cost_std']:9.2f} "
+              f"{row['dark_share']:12.1%} {row['fill_rate']:10.1%}")
+
+    print(f"\nRe-cross check:  {check_recross():,.0f} shares crossed after the lit "
+          f"book was one-sided")
+
+    result = measure_throughput(args.orders)
+    print("\nThroughput:")
+    print(f"Dark pool:       {result['dark_orders_per_second']:,.0f} orders/s "
+          f"({result['dark_fills']:,} midpoint fills)")
+    print(f"Router:          {result['parents_per_second']:,.0f} parent orders/s "
+          f"({result['child_orders_per_second']:,.0f} child orders/s)")
+
+
+if __name__ == '__main__':
+    main()
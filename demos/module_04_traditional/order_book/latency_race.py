@@ -0,0 +1,332 @@
+"""
+HFT Latency Race Simulator
+
+A discrete-event simulation of the race that follows public news: the
+fundamental value of the stock jumps, every trading firm sees the jump and
+reacts, and their messages reach the MatchingEngine (matching_engine.py)
+after their own latency. Events wait in a heapq priority queue ordered by
+arrival time, so the exchange processes them exactly in the order they
+would arrive.
+
+Each firm quotes a bid and an ask around the value it last saw. On a jump
+it (1) cancels its own quotes, (2) sends immediate-or-cancel orders against
+any stale quotes that are now mispriced ("sniping"), and (3) requotes
+around the new value. Slow firms lose the race: their stale quotes are
+picked off before their cancels arrive. Noise traders send market orders
+at random times, which pay the spread to whoever quotes at the front.
+
+Reported per latency tier:
+    snipe fill rate     filled / attempted quantity of sniping IOC orders
+    quote fills         passive fills of the tier's quotes
+    sniped share        share of passive volume taken by other firms' orders
+    maker markout       value 1 s after a passive fill vs the fill price, in
+                        bps for the maker (negative = adverse selection)
+    PnL                 cash plus inventory at the final value, per hour
+
+Monte Carlo runs use independent seeds and are spread over processes.
+
+Usage:
+    python latency_race.py
+    python latency_race.py --runs 40 --jobs 4 --duration 900
+
+Author: BSc Digital Finance Course
+Date: 2025-12-07
+"""
+
+import argparse
+import heapq
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:  # imported as demos.module_04_traditional.order_book
+    from .matching_engine import MatchingEngine
+    from .order_book import OrderBook
+except ImportError:  # run as a script from this folder
+    from matching_engine import MatchingEngine
+    from order_book import OrderBook
+
+BPS = 10_000
+
+# One-way latency per tier, in seconds
+LATENCY_TIERS = {
+    'co-located': 5e-6,
+    'fast': 50e-6,
+    'standard': 500e-6,
+    'slow': 5e-3,
+}
+
+TIER_DTYPE = np.dtype([
+    ('latency', np.float64),
+    ('snipe_fill_rate', np.float64),
+    ('quote_fills', np.float64),
+    ('sniped_share', np.float64),
+    ('maker_markout', np.float64),
+    ('taker_markout', np.float64),
+    ('pnl_per_hour', np.float64),
+])
+
+NOISE = -1  # owner id of noise trader orders
+
+# Event kinds, in priority order for simultaneous events
+JUMP, REACT, NOISE_ORDER = 0, 1, 2
+
+
+class Firm:
+    """A trading firm: its latency, resting quotes and account."""
+
+    __slots__ = ('firm_id', 'tier', 'latency', 'orders', 'cash', 'inventory',
+                 'snipe_sent', 'snipe_filled')
+
+    def __init__(self, firm_id, tier, latency):
+        self.firm_id = firm_id
+        self.tier = tier
+        self.latency = latency
+        self.orders = []
+        self.cash = 0.0
+        self.inventory = 0.0
+        self.snipe_sent = 0.0
+        self.snipe_filled = 0.0
+
+
+class LatencyRace:
+    """One simulated session of latency races on a MatchingEngine."""
+
+    def __init__(self, tiers=None, firms_per_tier=2, value=100.0, tick_size=0.01,
+                 jump_rate=1.0, jump_ticks=2, noise_rate=3.0, half_spread=1,
+                 quote_size=500, snipe_size=500, jitter=0.2, seed=42):
+        self.tiers = dict(tiers or LATENCY_TIERS)
+        self.engine = MatchingEngine(OrderBook(value, tick_size), keep_trades=False)
+        self.book = self.engine.book
+        self.rng = np.random.default_rng(seed)
+        self.value_tick = self.book.to_tick(value)
+        self.jump_rate = jump_rate
+        self.jump_ticks = jump_ticks
+        self.noise_rate = noise_rate
+        self.half_spread = half_spread
+        self.quote_size = quote_size
+        self.snipe_size = snipe_size
+        self.jitter = jitter
+        self.firms = [Firm(len(self.tiers) * k + i, tier, latency)
+                      for k in range(firms_per_tier)
+                      for i, (tier, latency) in enumerate(self.tiers.items())]
+        self.owner = {}                 # resting order id -> firm id
+        self.values = [(0.0, self.value_tick)]  # (time, value tick) after every jump
+        self.fills = []                 # (time, firm, side, price, qty, passive, sniped)
+        self._queue = []
+        self._sequence = 0
+
+    def schedule(self, t, kind, firm=None, data=None):
+        self._sequence += 1
+        heapq.heappush(self._queue, (t, kind, self._sequence, firm, data))
+
+    def run(self, duration):
+        """Simulate `duration` seconds; returns self for chaining."""
+        rng = self.rng
+        for firm in self.firms:
+            self._requote(0.0, firm, self.value_tick)
+        self.schedule(rng.exponential(1 / self.jump_rate), JUMP)
+        self.schedule(rng.exponential(1 / self.noise_rate), NOISE_ORDER)
+
+        queue = self._queue
+        while queue:
+            t, kind, _, firm, data = heapq.heappop(queue)
+            if t > duration:
+                break
+            if kind == JUMP:
+                step = self.jump_ticks if rng.random() < 0.5 else -self.jump_ticks
+                self.value_tick += step
+                self.values.append((t, self.value_tick))
+                # Every firm sees the jump and the book as they are now; its
+                # orders based on them arrive after its latency
+                seen = (self.value_tick, self._stale_sides(self.value_tick))
+                delays = np.exp(rng.normal(0, self.jitter, len(self.firms)))
+                for f, delay in zip(self.firms, delays.tolist()):
+                    self.schedule(t + f.latency * delay, REACT, f.firm_id, seen)
+                self.schedule(t + rng.exponential(1 / self.jump_rate), JUMP)
+            elif kind == REACT:
+                self._react(t, self.firms[firm], data)
+            else:
+                side = 'buy' if rng.random() < 0.5 else 'sell'
+                quantity = float(rng.integers(1, 6) * 100)
+                report = self.engine.submit(side, quantity, order_type='market', timestamp=t)
+                self._settle(t, NOISE, side, report.trades)
+                self.schedule(t + rng.exponential(1 / self.noise_rate), NOISE_ORDER)
+        self.duration = duration
+        return self
+
+    def _stale_sides(self, value_tick):
+        """Sides a sniper would trade: 'buy' if the best ask is below the value,
+        'sell' if the best bid is above it."""
+        sides = []
+        ask, bid = self.book.best_level('sell'), self.book.best_level('buy')
+        if ask is not None and ask.tick < value_tick:
+            sides.append('buy')
+        if bid is not None and bid.tick > value_tick:
+            sides.append('sell')
+        return sides
+
+    def _react(self, t, firm, seen):
+        """A firm's messages after a jump: cancel, snipe, requote.
+
+        seen: (value tick, sides with stale quotes) as of the jump; the
+        snipes are sent on that information and fill only against what is
+        still in the book when they arrive.
+        """
+        value_tick, stale_sides = seen
+        engine = self.engine
+        for order_id in firm.orders:
+            if engine.cancel(order_id):
+                del self.owner[order_id]
+        firm.orders = []
+
+        book = self.book
+        for side in stale_sides:
+            limit = value_tick - 1 if side == 'buy' else value_tick + 1
+            report = engine.submit(side, float(self.snipe_size), book.to_price(limit), 'ioc',
+                                   timestamp=t)
+            firm.snipe_sent += self.snipe_size
+            firm.snipe_filled += report.filled
+            self._settle(t, firm.firm_id, side, report.trades)
+
+        self._requote(t, firm, value_tick)
+
+    def _requote(self, t, firm, value_tick):
+        book = self.book
+        for side, tick in (('buy', value_tick - self.half_spread),
+                           ('sell', value_tick + self.half_spread)):
+            report = self.engine.submit(side, float(self.quote_size), book.to_price(tick),
+                                        'limit', timestamp=t)
+            self._settle(t, firm.firm_id, side, report.trades)
+            if report.status == 'resting':
+                firm.orders.append(report.order_id)
+                self.owner[report.order_id] = firm.firm_id
+
+    def _settle(self, t, taker, side, trades):
+        """Book the cash and inventory of both sides of each trade.
+
+        A passive fill counts as sniped when the aggressor was a firm (an
+        IOC snipe or a requote that crossed a stale quote), not a noise trader.
+        """
+        sniped = taker != NOISE
+        sign = 1 if side == 'buy' else -1
+        owner = self.owner
+        firms = self.firms
+        for trade in trades:
+            maker = owner.get(trade.maker_order_id, NOISE)
+            if trade.maker_order_id not in self.book:
+                owner.pop(trade.maker_order_id, None)
+            for firm_id, s, passive in ((taker, sign, False), (maker, -sign, True)):
+                if firm_id == NOISE:
+                    continue
+                firm = firms[firm_id]
+                firm.cash -= s * trade.price * trade.quantity
+                firm.inventory += s * trade.quantity
+                self.fills.append((t, firm_id, s, trade.price, trade.quantity, passive,
+                                   sniped))
+
+    def value_at(self, times):
+        """Fundamental value (price) at the given times."""
+        jump_times = np.array([v[0] for v in self.values])
+        ticks = np.array([v[1] for v in self.values])
+        index = np.searchsorted(jump_times, times, side='right') - 1
+        return ticks[index] * self.book.tick_size
+
+    def results(self, horizon=1.0):
+        """Per-tier statistics as a TIER_DTYPE array (one row per tier)."""
+        fills = np.array(self.fills, dtype=[('time', float), ('firm', int), ('side', int),
+                                            ('price', float), ('qty', float),
+                                            ('passive', bool), ('sniped', bool)])
+        tier_index = {tier: i for i, tier in enumerate(self.tiers)}
+        firm_tier = np.array([tier_index[f.tier] for f in self.firms])
+        markout = np.zeros(len(fills))
+        if len(fills):
+            later = self.value_at(fills['time'] + horizon)
+            markout = fills['side'] * (later - fills['price']) / fills['price'] * BPS
+        final_value = self.value_tick * self.book.tick_size
+
+        out = np.zeros(len(self.tiers), dtype=TIER_DTYPE)
+        for tier, i in tier_index.items():
+            members = [f for f in self.firms if tier_index[f.tier] == i]
+            in_tier = firm_tier[fills['firm']] == i if len(fills) else np.zeros(0, bool)
+            passive = in_tier & fills['passive']
+            active = in_tier & ~fills['passive']
+            sent = sum(f.snipe_sent for f in members)
+            out[i]['latency'] = self.tiers[tier]
+            out[i]['snipe_fill_rate'] = sum(f.snipe_filled for f in members) / sent \
+                if sent else np.nan
+            out[i]['quote_fills'] = fills['qty'][passive].sum() / len(members)
+            out[i]['sniped_share'] = _weighted(fills['sniped'][passive], fills['qty'][passive])
+            out[i]['maker_markout'] = _weighted(markout[passive], fills['qty'][passive])
+            out[i]['taker_markout'] = _weighted(markout[active], fills['qty'][active])
+            pnl = sum(f.cash + f.inventory * final_value for f in members) / len(members)
+            out[i]['pnl_per_hour'] = pnl * 3600 / self.duration
+        return out
+
+
+def _weighted(values, weights):
+    total = weights.sum()
+    return float((values * weights).sum() / total) if total else np.nan
+
+
+def _mean(values):
+    """Mean over runs, ignoring runs without data (NaN)."""
+    values = values[~np.isnan(values)]
+    return float(values.mean()) if len(values) else np.nan
+
+
+def run_session(seed, duration=600.0, **params):
+    """Run one session; returns its TIER_DTYPE results (picklable, for pools)."""
+    return LatencyRace(seed=seed, **params).run(duration).results()
+
+
+def monte_carlo(n_runs=20, duration=600.0, jobs=None, seed=42, **params):
+    """(n_runs, n_tiers) TIER_DTYPE results of independent sessions.
+
+    Seeds are derived from `seed` per run, so the results do not depend on
+    the number of worker processes.
+    """
+    seeds = np.random.SeedSequence(seed).generate_state(n_runs).tolist()
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or n_runs == 1:
+        results = [run_session(s, duration, **params) for s in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, n_runs)) as pool:
+            futures = [pool.submit(run_session, s, duration, **params) for s in seeds]
+            results = [f.result() for f in futures]
+    return np.stack(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Latency race Monte Carlo')
+    parser.add_argument('--runs', type=int, default=20, help='Monte Carlo sessions')
+    parser.add_argument('--duration', type=float, default=600.0, help='Seconds per session')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes')
+    parser.add_argument('--firms', type=int, default=2, help='Firms per latency tier')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = monte_carlo(args.runs, args.duration, args.jobs, firms_per_tier=args.firms)
+    seconds = time.perf_counter() - start
+
+    print(f"\nLatency race: {args.runs} sessions x {args.duration:g} s, "
+          f"{args.firms} firms per tier ({seconds:.1f} s)")
+    print("-" * 86)
+    print(f"{'tier':12s} {'latency':>9s} {'snipe fill':>11s} {'quote fills':>12s} "
+          f"{'sniped':>7s} {'maker mkout':>12s} {'taker mkout':>12s} {'PnL/hour':>10s}")
+    for i, tier in enumerate(LATENCY_TIERS):
+        r = results[:, i]
+        latency = r['latency'][0]
+        label = f"{latency * 1e6:.0f} us" if latency < 1e-3 else f"{latency * 1e3:.0f} ms"
+        print(f"{tier:12s} {label:>9s} {_mean(r['snipe_fill_rate']):10.1%} "
+              f"{np.mean(r['quote_fills']):12,.0f} {_mean(r['sniped_share']):6.1%} "
+              f"{_mean(r['maker_markout']):9.2f} bp {_mean(r['taker_markout']):9.2f} bp "
+              f"{np.mean(r['pnl_per_hour']):8,.0f}"
+              f" ± {np.std(r['pnl_per_hour']) / math.sqrt(len(r)):,.0f}")
+
+
+if __name__ == '__main__':
+    main()
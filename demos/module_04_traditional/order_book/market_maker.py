@@ -0,0 +1,287 @@
+"""
+Avellaneda-Stoikov Market-Maker Backtester
+
+Backtests inventory-aware quoting against simulated order flow
+(order_flow.py). At every book snapshot the market maker quotes around a
+reservation price that leans against its inventory q:
+
+    reservation  r = mid - q * gamma * sigma^2 * horizon
+    half-spread  h = half_spread ticks + gamma * sigma^2 * horizon / 2
+    quotes       bid = r - h, ask = r + h (on the tick grid, never crossing the book)
+
+gamma is the risk aversion, sigma^2 the variance of mid changes per second
+and horizon the holding period (seconds) the inventory risk is priced
+over. sigma^2 is estimated causally, from mid changes up to the current
+snapshot only (an exponentially weighted average with a half-life of a few
+minutes); the market maker does not quote during a warm-up at the start
+of the session, while the first estimate builds up.
+
+A quote fills (quote_size shares) when a trade print in the next interval
+reaches its price: a seller-initiated print at or below the bid, a
+buyer-initiated print at or above the ask. Queue position is ignored, so
+fills are optimistic.
+
+Inventory makes the backtest sequential in time, so it is vectorized over
+the parameters instead: each time step updates every (gamma, half-spread)
+combination at once as NumPy arrays. sweep() runs independent simulated
+sessions in a process pool and caches the results on disk.
+
+P&L splits exactly into spread capture (fill price vs mid at the fill) and
+inventory P&L (inventory times the following mid change).
+
+Usage:
+    python market_maker.py                          # Sweep, cached in .sweep_cache
+    python market_maker.py --sessions 8 --jobs 4 --hours 2
+
+Author: BSc Digital Finance Course
+Date: 2025-12-07
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+try:  # imported as demos.module_04_traditional.order_book
+    from .order_flow import OrderFlowSimulator
+except ImportError:  # run as a script from this folder
+    from order_flow import OrderFlowSimulator
+
+SWEEP_VERSION = 2
+DEFAULT_CACHE = Path(__file__).parent / '.sweep_cache'
+DEFAULT_GAMMAS = (0.0, 0.001, 0.003, 0.01, 0.03, 0.1)
+DEFAULT_HALF_SPREADS = (0, 1, 2, 3, 4)  # ticks
+
+# Per-parameter summary statistics of a backtest
+SUMMARY_FIELDS = ('pnl', 'spread_pnl', 'inventory_pnl', 'fills', 'mean_abs_inventory',
+                  'max_abs_inventory', 'sharpe')
+
+
+def market_data(snapshots, tick_size=0.01, halflife=300.0, warmup=300.0):
+    """Per-snapshot market arrays for the backtest.
+
+    snapshots: Snapshots from OrderFlowSimulator.simulate() (or rows with the
+    same fields). Interval i runs from snapshot i to snapshot i + 1; its
+    trade prints are those of snapshot i + 1. Returns {'time', 'mid',
+    'best_bid', 'best_ask', 'low_sell', 'high_buy', 'sigma2', 'tick_size'},
+    where low_sell[i] / high_buy[i] are the lowest seller-initiated and highest
+    buyer-initiated print price in interval i (NaN if none).
+
+    sigma2[i] is the variance of mid changes per second known at snapshot i:
+    an exponentially weighted mean (half-life `halflife` seconds) of the
+    squared mid changes per second of the intervals ending at or before it.
+    It is NaN for the first `warmup` seconds, when the backtest does not quote.
+    """
+    times, bids, asks, low_sell, high_buy = [], [], [], [], []
+    for snap in snapshots:
+        times.append(snap.time)
+        bids.append(snap.best_bid)
+        asks.append(snap.best_ask)
+        trades = snap.trades
+        buys = trades['aggressor'] == 'buy'
+        low_sell.append(trades['price'][~buys].min() if (~buys).any() else np.nan)
+        high_buy.append(trades['price'][buys].max() if buys.any() else np.nan)
+
+    bid, ask = np.array(bids), np.array(asks)
+    # Carry the last two-sided quote over snapshots where a side was empty
+    valid = ~(np.isnan(bid) | np.isnan(ask))
+    index = np.maximum.accumulate(np.where(valid, np.arange(len(bid)), 0))
+    bid, ask = bid[index], ask[index]
+    mid = (bid + ask) / 2
+    time_ = np.array(times)
+    dt = np.diff(time_)
+    rate = (np.diff(mid) ** 2 / dt).tolist()
+    weight = (1 - 0.5 ** (dt / halflife)).tolist()
+    sigma2 = np.full(len(mid), np.nan)
+    total = norm = 0.0
+    for i, (r, w) in enumerate(zip(rate, weight), start=1):
+        total += w * (r - total)  # EWMA of rate and of 1, for an unbiased start
+        norm += w * (1 - norm)
+        sigma2[i] = total / norm
+    sigma2[time_ - time_[0] < warmup] = np.nan
+    return {
+        'time': time_, 'mid': mid, 'best_bid': bid, 'best_ask': ask,
+        'low_sell': np.array(low_sell[1:] + [np.nan]),
+        'high_buy': np.array(high_buy[1:] + [np.nan]),
+        'sigma2': sigma2, 'tick_size': tick_size,
+    }
+
+
+def backtest(market, gammas, half_spreads, quote_size=100, horizon=300.0,
+             max_inventory=2000, record=False):
+    """Backtest every (gamma, half_spread) pair on one market path at once.
+
+    gammas, half_spreads: broadcastable arrays of parameters (half_spreads
+    in ticks); results have their broadcast shape. Returns {field: array}
+    for SUMMARY_FIELDS and, with record=True, the paths over time
+    (time x parameters): 'pnl_path', 'spread_path', 'inventory_path',
+    'position', 'bid', 'ask'. Quoting starts at the first snapshot with a
+    sigma^2 estimate (market['sigma2'] not NaN); bid and ask are NaN before.
+    Per-step statistics (mean inventory, Sharpe) cover the quoting steps.
+    """
+    gamma, half = np.broadcast_arrays(np.asarray(gammas, float),
+                                      np.asarray(half_spreads, float))
+    shape = gamma.shape
+    gamma, half = gamma.ravel(), half.ravel()
+    tick = market['tick_size']
+    sigma2 = market['sigma2']
+    mid = market['mid']
+    best_bid, best_ask = market['best_bid'], market['best_ask']
+    low_sell, high_buy = market['low_sell'], market['high_buy']
+    n_steps, n_params = len(mid), len(gamma)
+    quoting = np.flatnonzero(~np.isnan(sigma2[:-1]))
+    start = quoting[0] if len(quoting) else max(n_steps - 1, 0)
+    q = np.zeros(n_params)
+    spread_pnl = np.zeros(n_params)
+    inventory_pnl = np.zeros(n_params)
+    fills = np.zeros(n_params)
+    abs_inventory = np.zeros(n_params)
+    max_abs = np.zeros(n_params)
+    step_pnl = np.zeros((max(n_steps - 1 - start, 0), n_params))
+    if record:
+        paths = {name: np.zeros((n_steps, n_params)) for name in
+                 ('pnl_path', 'spread_path', 'inventory_path', 'position')}
+        paths['bid'] = np.full((n_steps, n_params), np.nan)
+        paths['ask'] = np.full((n_steps, n_params), np.nan)
+
+    for i in range(start, n_steps - 1):
+        m = mid[i]
+        risk = gamma * sigma2[i] * horizon          # price per share of inventory
+        half_width = half * tick + risk / 2
+        reservation = m - q * risk
+        bid = np.floor((reservation - half_width) / tick + 1e-9) * tick
+        ask = np.ceil((reservation + half_width) / tick - 1e-9) * tick
+        bid = np.minimum(bid, best_ask[i] - tick)
+        ask = np.maximum(ask, best_bid[i] + tick)
+        bought = (low_sell[i] <= bid) & (q + quote_size <= max_inventory)
+        sold = (high_buy[i] >= ask) & (q - quote_size >= -max_inventory)
+        capture = quote_size * (bought * (m - bid) + sold * (ask - m))
+        q += quote_size * (bought.astype(float) - sold)
+        move = q * (mid[i + 1] - m)
+        spread_pnl += capture
+        inventory_pnl += move
+        step_pnl[i - start] = capture + move
+        fills += bought + sold
+        np.abs(q, out=move)
+        abs_inventory += move
+        np.maximum(max_abs, move, out=max_abs)
+        if record:
+            paths['position'][i + 1] = q
+            paths['bid'][i] = bid
+            paths['ask'][i] = ask
+            paths['spread_path'][i + 1] = spread_pnl
+            paths['inventory_path'][i + 1] = inventory_pnl
+
+    pnl = spread_pnl + inventory_pnl
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sharpe = step_pnl.mean(axis=0) / step_pnl.std(axis=0) * np.sqrt(max(len(step_pnl), 1))
+    result = {
+        'pnl': pnl, 'spread_pnl': spread_pnl, 'inventory_pnl': inventory_pnl,
+        'fills': fills, 'mean_abs_inventory': abs_inventory / max(len(step_pnl), 1),
+        'max_abs_inventory': max_abs, 'sharpe': sharpe,
+    }
+    result = {k: v.reshape(shape) for k, v in result.items()}
+    if record:
+        paths['pnl_path'] = paths['spread_path'] + paths['inventory_path']
+        result.update({k: v.reshape((n_steps,) + shape) for k, v in paths.items()})
+    return result
+
+
+def simulate_market(hours=1.0, interval=1.0, seed=42):
+    """Market arrays of one simulated session (kept in memory, no store)."""
+    sim = OrderFlowSimulator(seed=seed)
+    return market_data(sim.simulate(hours * 3600, interval, n_levels=1), sim.book.tick_size)
+
+
+def run_session(seed, gammas, half_spreads, hours=1.0, interval=1.0, **kwargs):
+    """Simulate one session and backtest the whole parameter grid on it."""
+    market = simulate_market(hours, interval, seed)
+    grid = np.meshgrid(np.asarray(gammas, float), np.asarray(half_spreads, float),
+                       indexing='ij')
+    return backtest(market, *grid, **kwargs)
+
+
+def sweep(gammas=DEFAULT_GAMMAS, half_spreads=DEFAULT_HALF_SPREADS, n_sessions=4,
+          hours=1.0, interval=1.0, seed=42, jobs=None, cache_dir=DEFAULT_CACHE, **kwargs):
+    """Parameter sweep over independent simulated sessions.
+
+    Returns {field: (n_sessions, len(gammas), len(half_spreads)) array} for
+    SUMMARY_FIELDS plus 'gamma' and 'half_spread'. Sessions run in a
+    process pool (jobs workers, default: all CPUs); seeds are derived from
+    `seed`, so results do not depend on the pool size. With a cache_dir the
+    result is stored as .npz keyed by all arguments and reused.
+    """
+    arguments = {'gammas': list(map(float, gammas)),
+                 'half_spreads': list(map(float, half_spreads)), 'n_sessions': n_sessions,
+                 'hours': hours, 'interval': interval, 'seed': seed, **kwargs}
+    path = None
+    if cache_dir is not None:
+        payload = json.dumps([SWEEP_VERSION, arguments], sort_keys=True)
+        key = hashlib.sha256(payload.encode()).hexdigest()[:16]
+        path = Path(cache_dir) / f'sweep-{key}.npz'
+        if path.exists():
+            with np.load(path) as cached:
+                return {name: cached[name] for name in cached.files}
+
+    seeds = np.random.SeedSequence(seed).generate_state(n_sessions).tolist()
+    jobs = jobs or os.cpu_count() or 1
+    task = dict(gammas=gammas, half_spreads=half_spreads, hours=hours, interval=interval,
+                **kwargs)
+    if jobs == 1 or n_sessions == 1:
+        sessions = [run_session(s, **task) for s in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, n_sessions)) as pool:
+            futures = [pool.submit(run_session, s, **task) for s in seeds]
+            sessions = [f.result() for f in futures]
+
+    result = {field: np.stack([s[field] for s in sessions]) for field in SUMMARY_FIELDS}
+    result['gamma'] = np.asarray(gammas, float)
+    result['half_spread'] = np.asarray(half_spreads, float)
+    if path is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'{path.stem}.{os.getpid()}.tmp.npz')
+        np.savez(tmp, **result)
+        os.replace(tmp, path)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Avellaneda-Stoikov parameter sweep')
+    parser.add_argument('--sessions', type=int, default=4, help='Simulated sessions')
+    parser.add_argument('--hours', type=float, default=1.0, help='Hours per session')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore the disk cache')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = sweep(n_sessions=args.sessions, hours=args.hours, jobs=args.jobs,
+                   cache_dir=None if args.no_cache else DEFAULT_CACHE)
+    seconds = time.perf_counter() - start
+
+    pnl = result['pnl'].mean(axis=0)
+    sharpe = result['sharpe'].mean(axis=0)
+    inventory = result['mean_abs_inventory'].mean(axis=0)
+    spreads = result['half_spread']
+    print(f"\nMarket-maker sweep: {args.sessions} sessions x {args.hours:g} h "
+          f"({seconds:.1f} s)")
+    print("-" * 78)
+    print("Mean PnL per session ($) by risk aversion (rows) and half-spread (ticks):")
+    print(f"{'gamma':>8s}" + ''.join(f"{h:>10g}" for h in spreads))
+    for g, row in zip(result['gamma'], pnl):
+        print(f"{g:8g}" + ''.join(f"{v:10.0f}" for v in row))
+    best = np.unravel_index(np.nanargmax(sharpe), sharpe.shape)
+    print(f"\nBest Sharpe: gamma={result['gamma'][best[0]]:g}, "
+          f"half-spread={spreads[best[1]]:g} ticks: Sharpe {sharpe[best]:.2f}, "
+          f"PnL {pnl[best]:,.0f}, mean |inventory| {inventory[best]:,.0f} shares")
+    no_skew = np.unravel_index(np.nanargmax(sharpe[:1]), sharpe[:1].shape)
+    print(f"Without skew (gamma=0): best Sharpe {sharpe[no_skew]:.2f}, "
+          f"mean |inventory| {inventory[no_skew]:,.0f} shares")
+
+
+if __name__ == '__main__':
+    main()
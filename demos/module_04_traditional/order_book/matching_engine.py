@@ -0,0 +1,252 @@
+"""
+Matching Engine on the Limit Order Book
+
+Executes incoming orders against an OrderBook (order_book.py) with
+price-time priority: the best price first and, within a price, the oldest
+resting order first. Trades execute at the resting order's price.
+
+Order types:
+    market   fill as much as the book allows; the rest is cancelled
+    limit    fill up to the limit price; the rest rests in the book
+    ioc      immediate-or-cancel: a limit order whose rest is cancelled
+    fok      fill-or-kill: filled completely up to the limit price, or
+             rejected without touching the book
+
+Every fill is recorded as a Trade (kept in engine.trades unless the engine
+is created with keep_trades=False, e.g. for long simulations that only need
+each report's trades). Run this file to measure message throughput on
+random order flow.
+
+Usage:
+    python matching_engine.py
+    python matching_engine.py --messages 500000
+
+Author: BSc Digital Finance Course
+Date: 2025-12-07
+"""
+
+import argparse
+import time
+from collections import namedtuple
+
+import numpy as np
+
+try:  # imported as demos.module_04_traditional.order_book
+    from .order_book import OrderBook
+except ImportError:  # run as a script from this folder
+    from order_book import OrderBook
+
+ORDER_TYPES = ('market', 'limit', 'ioc', 'fok')
+
+Trade = namedtuple('Trade', ['trade_id', 'timestamp', 'price', 'quantity', 'aggressor',
+                             'maker_order_id', 'taker_order_id'])
+
+ExecutionReport = namedtuple('ExecutionReport', ['order_id', 'status', 'filled', 'remaining',
+                                                 'avg_price', 'trades'])
+
+TRADE_DTYPE = np.dtype([
+    ('trade_id', np.int64),
+    ('timestamp', np.float64),
+    ('price', np.float64),
+    ('quantity', np.float64),
+    ('aggressor', 'U4'),
+    ('maker_order_id', np.int64),
+    ('taker_order_id', np.int64),
+])
+
+
+class MatchingEngine:
+    """Price-time priority matching on an OrderBook."""
+
+    def __init__(self, book=None, keep_trades=True):
+        self.book = book if book is not None else OrderBook()
+        self.keep_trades = keep_trades
+        self.trades = []
+        self.clock = 0  # Messages processed; the default timestamp
+        self.stats = {'orders': 0, 'cancels': 0, 'trades': 0, 'volume': 0.0,
+                      'rejected': 0}
+
+    def submit(self, side, quantity, price=None, order_type='limit', order_id=None,
+               timestamp=None):
+        """Execute one order; returns an ExecutionReport.
+
+        status is 'filled', 'resting' (limit order remainder in the book),
+        'cancelled' (market/IOC remainder dropped) or 'rejected' (FOK that
+        cannot be filled, or an invalid order).
+        """
+        book = self.book
+        self.clock += 1
+        self.stats['orders'] += 1
+        if timestamp is None:
+            timestamp = self.clock
+        if order_id is None:
+            order_id = book.new_order_id()
+
+        if side not in ('buy', 'sell') or quantity <= 0 or order_type not in ORDER_TYPES \
+                or (price is None and order_type == 'limit'):
+            self.stats['rejected'] += 1
+            return ExecutionReport(order_id, 'rejected', 0.0, quantity, None, [])
+
+        limit_tick = None if price is None or order_type == 'market' else book.to_tick(price)
+        if order_type == 'fok' and not book.available(side, quantity, limit_tick):
+            self.stats['rejected'] += 1
+            return ExecutionReport(order_id, 'rejected', 0.0, quantity, None, [])
+
+        fills, remaining = book.take(side, quantity, limit_tick)
+
+        trades = []
+        if fills:
+            trade_id = self.stats['trades']
+            tick_size = book.tick_size
+            decimals = book.decimals
+            notional = 0.0
+            for maker_id, tick, qty in fills:
+                trade_id += 1
+                trade_price = round(tick * tick_size, decimals)
+                notional += trade_price * qty
+                trades.append(Trade(trade_id, timestamp, trade_price, qty, side,
+                                    maker_id, order_id))
+            if self.keep_trades:
+                self.trades.extend(trades)
+            filled = quantity - remaining
+            self.stats['trades'] += len(trades)
+            self.stats['volume'] += filled
+            avg_price = notional / filled
+        else:
+            filled = 0.0
+            avg_price = None
+
+        if remaining <= 0:
+            status = 'filled'
+        elif order_type == 'limit':
+            book.add_limit_order(side, price, remaining, order_id=order_id)
+            status = 'resting'
+        else:
+            status = 'cancelled'
+        return ExecutionReport(order_id, status, filled, remaining, avg_price, trades)
+
+    def market_order(self, side, quantity, **kwargs):
+        return self.submit(side, quantity, order_type='market', **kwargs)
+
+    def limit_order(self, side, price, quantity, **kwargs):
+        return self.submit(side, quantity, price=price, order_type='limit', **kwargs)
+
+    def ioc_order(self, side, price, quantity, **kwargs):
+        return self.submit(side, quantity, price=price, order_type='ioc', **kwargs)
+
+    def fok_order(self, side, price, quantity, **kwargs):
+        return self.submit(side, quantity, price=price, order_type='fok', **kwargs)
+
+    def modify(self, order_id, quantity=None, price=None, timestamp=None):
+        """Change a resting order's quantity and/or price; returns an ExecutionReport.
+
+        A new price that crosses the book is executed like a new limit order
+        with the same id (it trades first, any rest re-enters the book);
+        otherwise the book re-prices the order in place (status 'resting').
+        Unknown ids are rejected.
+        """
+        book = self.book
+        order = book.get_order(order_id)
+        if order is None:
+            self.stats['rejected'] += 1
+            return ExecutionReport(order_id, 'rejected', 0.0, quantity or 0.0, None, [])
+        quantity = order.quantity if quantity is None else quantity
+        tick = order.tick if price is None else book.to_tick(price)
+        if quantity > 0 and tick != order.tick and book.crosses(order.side, tick):
+            book.cancel_order(order_id)
+            return self.submit(order.side, quantity, book.to_price(tick), 'limit',
+                               order_id=order_id, timestamp=timestamp)
+        self.clock += 1
+        book.modify_order(order_id, quantity, price)
+        status = 'resting' if quantity > 0 else 'cancelled'
+        return ExecutionReport(order_id, status, 0.0, max(quantity, 0.0), None, [])
+
+    def cancel(self, order_id):
+        """Cancel a resting order; False if it is no longer in the book."""
+        self.clock += 1
+        self.stats['cancels'] += 1
+        return self.book.cancel_order(order_id)
+
+    def trades_array(self):
+        """All trades so far as a NumPy structured array (TRADE_DTYPE)."""
+        return np.array([tuple(t) for t in self.trades], dtype=TRADE_DTYPE)
+
+
+def random_messages(n, mid_price=100.0, tick_size=0.01, seed=42):
+    """Random order flow, drawn with NumPy up front.
+
+    Returns arrays (kind, side, price, quantity); kind indexes
+    ('limit', 'market', 'ioc', 'fok', 'cancel').
+    """
+    rng = np.random.default_rng(seed)
+    kind = rng.choice(5, size=n, p=[0.6, 0.05, 0.05, 0.05, 0.25])
+    side = rng.random(n) < 0.5
+    # Limit prices around the mid; about a fifth of them cross the spread
+    offset = np.round(rng.exponential(8, n) - 2).astype(int)
+    price = np.round(mid_price + np.where(side, -offset, offset) * tick_size, 2)
+    quantity = rng.integers(1, 10, n) * 100.0
+    return kind, side, price, quantity
+
+
+def measure_throughput(n_messages=200_000, n_resting=2_000, seed=42):
+    """Replay random flow through a fresh engine; returns a result dict."""
+    engine = MatchingEngine(OrderBook(100.0))
+    rng = np.random.default_rng(seed + 1)
+    for i in range(n_resting):
+        side = 'buy' if i % 2 else 'sell'
+        offset = (1 + rng.integers(50)) * 0.01
+        engine.book.add_limit_order(side, 100.0 - offset if side == 'buy' else 100.0 + offset,
+                                    float(rng.integers(1, 10) * 100))
+
+    kind, side, price, quantity = random_messages(n_messages, seed=seed)
+    kinds = ('limit', 'market', 'ioc', 'fok')
+    sides = np.where(side, 'buy', 'sell').tolist()
+    kind, price, quantity = kind.tolist(), price.tolist(), quantity.tolist()
+    resting = []
+    submit = engine.submit
+
+    start = time.perf_counter()
+    for k, s, p, q in zip(kind, sides, price, quantity):
+        if k == 4:
+            if resting:
+                engine.cancel(resting.pop())
+            continue
+        report = submit(s, q, p, kinds[k])
+        if report.status == 'resting':
+            resting.append(report.order_id)
+    seconds = time.perf_counter() - start
+
+    return {
+        'messages': n_messages,
+        'seconds': seconds,
+        'messages_per_second': n_messages / seconds,
+        'trades': engine.stats['trades'],
+        'trades_per_second': engine.stats['trades'] / seconds,
+        'volume': engine.stats['volume'],
+        'rejected': engine.stats['rejected'],
+        'resting_orders': len(engine.book),
+        'bid_levels': engine.book.n_levels('buy'),
+        'ask_levels': engine.book.n_levels('sell'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Matching engine throughput')
+    parser.add_argument('--messages', type=int, default=200_000, help='Messages to replay')
+    parser.add_argument('--resting', type=int, default=2_000, help='Orders in the initial book')
+    args = parser.parse_args()
+
+    result = measure_throughput(args.messages, args.resting)
+    print("\nMatching Engine Throughput:")
+    print("-" * 70)
+    print(f"Messages:        {result['messages']:,} in {result['seconds']:.2f} s")
+    print(f"Throughput:      {result['messages_per_second']:,.0f} messages/s")
+    print(f"Trades:          {result['trades']:,} ({result['trades_per_second']:,.0f}/s)")
+    print(f"Volume:          {result['volume']:,.0f} shares")
+    print(f"FOK rejected:    {result['rejected']:,}")
+    print(f"Final book:      {result['resting_orders']:,} orders, "
+          f"{result['bid_levels']} bid / {result['ask_levels']} ask levels")
+
+
+if __name__ == '__main__':
+    main()
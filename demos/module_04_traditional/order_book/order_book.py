@@ -0,0 +1,350 @@
+"""
+Price-Level Indexed Limit Order Book
+
+Each side of the book is a sorted list of price levels (integer ticks) and a
+dictionary from tick to level. Every level keeps its resting orders in
+arrival order (a FIFO deque) together with the level's total quantity, and
+an order index maps order ids to orders. Cancelled orders are marked dead
+(quantity 0) and skipped when they reach the front of their queue, so:
+
+- best bid / best ask            O(1)   (end / start of the sorted ticks)
+- add to an existing level       O(1)
+- add a new price level          O(log L) search, plus a list insert
+- cancel / reduce an order       O(1)   (order index, lazy removal)
+- match against the best level   O(1) per fill
+- aggregated depth (top k)       O(k)
+
+where L is the number of price levels on a side.
+
+Author: BSc Digital Finance Course
+Date: 2025-12-07
+"""
+
+import bisect
+from collections import deque
+from decimal import Decimal
+
+import numpy as np
+
+SIDES = ('buy', 'sell')
+
+
+class Order:
+    """A resting limit order."""
+
+    __slots__ = ('order_id', 'side', 'tick', 'quantity', 'sequence')
+
+    def __init__(self, order_id, side, tick, quantity, sequence):
+        self.order_id = order_id
+        self.side = side
+        self.tick = tick
+        self.quantity = quantity
+        self.sequence = sequence
+
+    def __repr__(self):
+        return (f"Order(id={self.order_id}, {self.side}, tick={self.tick}, "
+                f"qty={self.quantity:g})")
+
+
+class PriceLevel:
+    """All resting orders at one price, oldest first."""
+
+    __slots__ = ('tick', 'queue', 'quantity', 'count')
+
+    def __init__(self, tick):
+        self.tick = tick
+        self.queue = deque()  # Orders in time priority; dead ones have quantity 0
+        self.quantity = 0.0   # Total live quantity
+        self.count = 0        # Live orders
+
+    def append(self, order):
+        self.queue.append(order)
+        self.quantity += order.quantity
+        self.count += 1
+
+    def remove(self, order):
+        """Cancel an order in place (it is dropped when it reaches the front)."""
+        self.quantity -= order.quantity
+        order.quantity = 0
+        self.count -= 1
+        if len(self.queue) > 2 * self.count + 32:
+            self.queue = deque(o for o in self.queue if o.quantity > 0)
+
+    def first(self):
+        """Oldest live order at this price."""
+        queue = self.queue
+        while queue[0].quantity <= 0:
+            queue.popleft()
+        return queue[0]
+
+    def __iter__(self):
+        return (o for o in self.queue if o.quantity > 0)
+
+    def __len__(self):
+        return self.count
+
+
+class OrderBook:
+    """Limit order book indexed by price level."""
+
+    def __init__(self, mid_price=100.0, tick_size=0.01):
+        self.mid_price = mid_price
+        self.tick_size = tick_size
+        # Decimal places of the tick (0.01 -> 2, 0.25 -> 2, 0.125 -> 3)
+        self.decimals = max(0, -Decimal(str(tick_size)).as_tuple().exponent)
+        self._ticks = {'buy': [], 'sell': []}    # ascending ticks per side
+        self._levels = {'buy': {}, 'sell': {}}   # tick -> PriceLevel
+        self._orders = {}                        # order_id -> Order
+        self._counts = {'buy': 0, 'sell': 0}     # resting orders per side
+        self._next_id = 1
+        self._sequence = 0
+
+    # Prices are stored as integer ticks so levels compare exactly
+    def to_tick(self, price):
+        return int(round(price / self.tick_size))
+
+    def to_price(self, tick):
+        return round(tick * self.tick_size, self.decimals)
+
+    def _check_side(self, side):
+        if side not in SIDES:
+            raise ValueError(f"side must be 'buy' or 'sell', got {side!r}")
+
+    def new_order_id(self):
+        """Reserve the next order id."""
+        order_id = self._next_id
+        self._next_id += 1
+        return order_id
+
+    def add_limit_order(self, side, price, quantity, order_id=None):
+        """Add a limit order to the book; returns its order id."""
+        self._check_side(side)
+        if quantity <= 0:
+            raise ValueError(f"quantity must be positive, got {quantity}")
+        if order_id is None:
+            order_id = self.new_order_id()
+        elif order_id in self._orders:
+            raise ValueError(f"duplicate order id {order_id}")
+
+        self._sequence += 1
+        order = Order(order_id, side, self.to_tick(price), quantity, self._sequence)
+        self._rest(order)
+        return order_id
+
+    def _rest(self, order):
+        levels = self._levels[order.side]
+        level = levels.get(order.tick)
+        if level is None:
+            level = levels[order.tick] = PriceLevel(order.tick)
+            bisect.insort(self._ticks[order.side], order.tick)
+        level.append(order)
+        self._orders[order.order_id] = order
+        self._counts[order.side] += 1
+
+    def _unrest(self, order):
+        levels = self._levels[order.side]
+        level = levels[order.tick]
+        level.remove(order)
+        del self._orders[order.order_id]
+        self._counts[order.side] -= 1
+        if not level.count:
+            del levels[order.tick]
+            ticks = self._ticks[order.side]
+            del ticks[bisect.bisect_left(ticks, order.tick)]
+
+    def cancel_order(self, order_id):
+        """Remove a resting order. Returns False if it is not in the book."""
+        order = self._orders.get(order_id)
+        if order is None:
+            return False
+        self._unrest(order)
+        return True
+
+    def crosses(self, side, tick):
+        """Whether a `side` order at `tick` would trade against the book."""
+        opposite = self._ticks['sell' if side == 'buy' else 'buy']
+        if not opposite:
+            return False
+        return tick >= opposite[0] if side == 'buy' else tick <= opposite[-1]
+
+    def modify_order(self, order_id, quantity=None, price=None):
+        """Change an order's quantity and/or price.
+
+        Reducing the quantity at the same price keeps the order's place in
+        the queue; a price change or a larger quantity re-queues it at the
+        back of its (new) level, as on most exchanges. A new price that
+        would cross the book raises ValueError: the book does not match
+        orders, MatchingEngine.modify does.
+        """
+        order = self._orders.get(order_id)
+        if order is None:
+            raise KeyError(f"unknown order id {order_id}")
+        quantity = order.quantity if quantity is None else quantity
+        tick = order.tick if price is None else self.to_tick(price)
+        if quantity <= 0:
+            self._unrest(order)
+            return order_id
+        if tick != order.tick and self.crosses(order.side, tick):
+            raise ValueError(f"order {order_id} at {self.to_price(tick)} would cross the book")
+
+        if tick == order.tick and quantity <= order.quantity:
+            self._levels[order.side][tick].quantity -= order.quantity - quantity
+            order.quantity = quantity
+            return order_id
+
+        self._unrest(order)
+        self._sequence += 1
+        self._rest(Order(order_id, order.side, tick, quantity, self._sequence))
+        return order_id
+
+    def take(self, side, quantity, limit_tick=None):
+        """Execute an incoming `side` order against the opposite side.
+
+        Walks the opposite side from the best price outwards and each level
+        oldest order first (price-time priority), filling up to `quantity`
+        without crossing `limit_tick` (None: no limit). Filled orders leave
+        the book. Returns (fills, unfilled quantity); a fill is
+        (resting order id, tick, quantity).
+        """
+        buy = side == 'buy'
+        book_side = 'sell' if buy else 'buy'
+        ticks = self._ticks[book_side]
+        levels = self._levels[book_side]
+        index = self._orders
+        n_filled = 0
+        fills = []
+        while quantity > 0 and ticks:
+            tick = ticks[0] if buy else ticks[-1]
+            if limit_tick is not None and (tick > limit_tick if buy else tick < limit_tick):
+                break
+            level = levels[tick]
+            queue = level.queue
+            while quantity > 0 and level.count:
+                order = queue[0]
+                if order.quantity <= 0:
+                    queue.popleft()
+                    continue
+                if order.quantity <= quantity:
+                    fill = order.quantity
+                    queue.popleft()
+                    del index[order.order_id]
+                    order.quantity = 0
+                    level.count -= 1
+                    n_filled += 1
+                else:
+                    fill = quantity
+                    order.quantity -= fill
+                level.quantity -= fill
+                quantity -= fill
+                fills.append((order.order_id, tick, fill))
+            if not level.count:
+                del levels[tick]
+                if buy:
+                    del ticks[0]
+                else:
+                    ticks.pop()
+        self._counts[book_side] -= n_filled
+        return fills, quantity
+
+    def available(self, side, quantity, limit_tick=None):
+        """Whether an incoming `side` order of `quantity` could be filled
+        completely without crossing limit_tick (for fill-or-kill orders)."""
+        buy = side == 'buy'
+        book_side = 'sell' if buy else 'buy'
+        for level in self.levels(book_side) if quantity > 0 else ():
+            if limit_tick is not None and (level.tick > limit_tick if buy
+                                           else level.tick < limit_tick):
+                return False
+            quantity -= level.quantity
+            if quantity <= 0:
+                return True
+        return quantity <= 0
+
+    def copy(self):
+        """Independent copy of the book (orders keep their ids and priority)."""
+        book = OrderBook(self.mid_price, self.tick_size)
+        book._next_id = self._next_id
+        book._sequence = self._sequence
+        for side in SIDES:
+            for tick in self._ticks[side]:
+                for order in self._levels[side][tick]:
+                    book._rest(Order(order.order_id, side, tick, order.quantity,
+                                     order.sequence))
+        return book
+
+    def get_order(self, order_id):
+        return self._orders.get(order_id)
+
+    def best_level(self, side):
+        """PriceLevel at the top of one side, or None."""
+        ticks = self._ticks[side]
+        if not ticks:
+            return None
+        return self._levels[side][ticks[-1] if side == 'buy' else ticks[0]]
+
+    def get_best_bid(self):
+        """Get the best (highest) bid price."""
+        ticks = self._ticks['buy']
+        return self.to_price(ticks[-1]) if ticks else None
+
+    def get_best_ask(self):
+        """Get the best (lowest) ask price."""
+        ticks = self._ticks['sell']
+        return self.to_price(ticks[0]) if ticks else None
+
+    def get_spread(self):
+        """Calculate bid-ask spread."""
+        best_bid = self.get_best_bid()
+        best_ask = self.get_best_ask()
+        if best_bid is not None and best_ask is not None:
+            return round(best_ask - best_bid, self.decimals)
+        return None
+
+    def get_mid_price(self):
+        """Midpoint of the best bid and ask (mid_price if a side is empty)."""
+        best_bid = self.get_best_bid()
+        best_ask = self.get_best_ask()
+        if best_bid is None or best_ask is None:
+            return self.mid_price
+        return (best_bid + best_ask) / 2
+
+    def levels(self, side, n_levels=None):
+        """PriceLevels of one side from the best price outwards."""
+        ticks = self._ticks[side]
+        if side == 'buy':
+            ticks = ticks[::-1] if n_levels is None else ticks[:-n_levels - 1:-1]
+        elif n_levels is not None:
+            ticks = ticks[:n_levels]
+        levels = self._levels[side]
+        return [levels[t] for t in ticks]
+
+    def depth(self, side, n_levels=None):
+        """Aggregated depth: (prices, quantities) arrays, best price first."""
+        self._check_side(side)
+        levels = self.levels(side, n_levels)
+        ticks = np.fromiter((lv.tick for lv in levels), dtype=np.int64, count=len(levels))
+        quantities = np.fromiter((lv.quantity for lv in levels), dtype=float,
+                                 count=len(levels))
+        return np.round(ticks * self.tick_size, self.decimals), quantities
+
+    @property
+    def bids(self):
+        """(price, quantity) per bid level, highest first."""
+        return list(zip(*(a.tolist() for a in self.depth('buy'))))
+
+    @property
+    def asks(self):
+        """(price, quantity) per ask level, lowest first."""
+        return list(zip(*(a.tolist() for a in self.depth('sell'))))
+
+    def n_levels(self, side):
+        return len(self._ticks[side])
+
+    def n_orders(self, side):
+        return self._counts[side]
+
+    def __len__(self):
+        return len(self._orders)
+
+    def __contains__(self, order_id):
+        return order_id in self._orders
@@ -0,0 +1,148 @@
+"""
+Order Book Benchmark: Price-Level Index vs Sorted Lists
+
+Replays the same random order flow (adds, cancels, size reductions and
+best-price queries around a drifting mid price) against the price-level
+indexed OrderBook (order_book.py) and against the original list-based book,
+which appends every order to a Python list and re-sorts it.
+
+Usage:
+    python order_book_benchmark.py
+    python order_book_benchmark.py --sizes 1000 10000 --operations 20000
+
+Author: BSc Digital Finance Course
+Date: 2025-12-07
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from order_book import OrderBook
+
+
+class ListOrderBook:
+    """The original list-based book: append + sort, linear-scan cancels."""
+
+    def __init__(self, mid_price=100.0):
+        self.mid_price = mid_price
+        self.bids = []  # (price, quantity, order_id) tuples
+        self.asks = []
+        self._next_id = 1
+
+    def add_limit_order(self, side, price, quantity):
+        order_id = self._next_id
+        self._next_id += 1
+        if side == 'buy':
+            self.bids.append((price, quantity, order_id))
+            self.bids.sort(key=lambda o: (-o[0], o[2]))  # Highest bid first, then time
+        else:
+            self.asks.append((price, quantity, order_id))
+            self.asks.sort(key=lambda o: (o[0], o[2]))   # Lowest ask first, then time
+        return order_id
+
+    def cancel_order(self, order_id):
+        for orders in (self.bids, self.asks):
+            for i, order in enumerate(orders):
+                if order[2] == order_id:
+                    del orders[i]
+                    return True
+        return False
+
+    def modify_order(self, order_id, quantity):
+        for orders in (self.bids, self.asks):
+            for i, (price, _, oid) in enumerate(orders):
+                if oid == order_id:
+                    orders[i] = (price, quantity, oid)
+                    return order_id
+        raise KeyError(order_id)
+
+    def get_best_bid(self):
+        return self.bids[0][0] if self.bids else None
+
+    def get_best_ask(self):
+        return self.asks[0][0] if self.asks else None
+
+
+def make_flow(n_resting, n_operations, seed=42):
+    """Random order flow: initial book, then a mix of operations.
+
+    Returns (initial orders, operations); an operation is
+    ('add', side, price, qty), ('cancel', k), ('modify', k, qty) or
+    ('best',), where k indexes the k-th order added so far.
+    """
+    rng = np.random.default_rng(seed)
+    n_levels = max(20, n_resting // 10)
+
+    def order(mid):
+        side = 'buy' if rng.random() < 0.5 else 'sell'
+        offset = rng.integers(1, n_levels + 1) * 0.01
+        price = round(mid - offset if side == 'buy' else mid + offset, 2)
+        return side, price, float(rng.integers(1, 20) * 100)
+
+    initial = [order(100.0) for _ in range(n_resting)]
+    operations = []
+    mid = 100.0
+    n_orders = n_resting
+    kinds = rng.choice(4, size=n_operations, p=[0.45, 0.35, 0.1, 0.1])
+    for kind in kinds:
+        mid = round(mid + rng.choice([-0.01, 0.0, 0.01]), 2)
+        if kind == 0:
+            operations.append(('add',) + order(mid))
+            n_orders += 1
+        elif kind == 1:
+            operations.append(('cancel', int(rng.integers(n_orders))))
+        elif kind == 2:
+            operations.append(('modify', int(rng.integers(n_orders)), 100.0))
+        else:
+            operations.append(('best',))
+    return initial, operations
+
+
+def replay(book, initial, operations):
+    """Seconds to apply the operations (after loading the initial book)."""
+    ids = [book.add_limit_order(side, price, qty) for side, price, qty in initial]
+    live = set(ids)
+    start = time.perf_counter()
+    for op in operations:
+        if op[0] == 'add':
+            order_id = book.add_limit_order(op[1], op[2], op[3])
+            ids.append(order_id)
+            live.add(order_id)
+        elif op[0] == 'cancel':
+            order_id = ids[op[1]]
+            if order_id in live:
+                book.cancel_order(order_id)
+                live.discard(order_id)
+        elif op[0] == 'modify':
+            order_id = ids[op[1]]
+            if order_id in live:
+                book.modify_order(order_id, quantity=op[2])
+        else:
+            book.get_best_bid()
+            book.get_best_ask()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark order book implementations')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 20000],
+                        help='Resting orders before the replay')
+    parser.add_argument('--operations', type=int, default=5000, help='Operations replayed')
+    args = parser.parse_args()
+
+    print(f"{'resting':>8s} {'ops':>7s} {'list (us/op)':>13s} {'indexed (us/op)':>16s} "
+          f"{'speedup':>8s}")
+    print("-" * 58)
+    for size in args.sizes:
+        initial, operations = make_flow(size, args.operations)
+        t_list = replay(ListOrderBook(), initial, operations)
+        t_indexed = replay(OrderBook(), initial, operations)
+        n = len(operations)
+        print(f"{size:8d} {n:7d} {t_list / n * 1e6:13.1f} {t_indexed / n * 1e6:16.2f} "
+              f"{t_list / t_indexed:7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,53 +3,38 @@ Order Book Simulation and Visualization
 
 This script simulates a limit order book and visualizes market depth,
 demonstrating how bid-ask spreads and liquidity work in financial markets.
+The book itself (price-level indexed, FIFO per level) is in order_book.py.
+
+Large books are aggregated in NumPy before plotting: the depth bars merge
+adjacent levels into buckets of whole ticks (at most --max-levels bars) and
+the cumulative depth curves are sampled at log-spaced distances from the
+mid (--bands points), so a book with tens of thousands of levels renders
+quickly and gives a small PDF.
+
+Usage:
+    python order_book_simulation.py
+    python order_book_simulation.py --levels 20000 --spacing 0.001 --tick-size 0.001
 
 Author: BSc Digital Finance Course
 Date: 2025-12-07
 """
 
+import argparse
+import time
+
 import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from market_impact import book_impact
+from matching_engine import MatchingEngine
+from order_book import OrderBook
+
 # Set font size globally and random seed
 plt.rcParams.update({'font.size': 8})
 np.random.seed(42)
 
-class OrderBook:
-    """Simple limit order book implementation."""
-
-    def __init__(self, mid_price=100.0):
-        self.mid_price = mid_price
-        self.bids = []  # (price, quantity) tuples
-        self.asks = []  # (price, quantity) tuples
-
-    def add_limit_order(self, side, price, quantity):
-        """Add a limit order to the book."""
-        if side == 'buy':
-            self.bids.append((price, quantity))
-            self.bids.sort(reverse=True)  # Highest bid first
-        else:
-            self.asks.append((price, quantity))
-            self.asks.sort()  # Lowest ask first
-
-    def get_best_bid(self):
-        """Get the best (highest) bid price."""
-        return self.bids[0][0] if self.bids else None
-
-    def get_best_ask(self):
-        """Get the best (lowest) ask price."""
-        return self.asks[0][0] if self.asks else None
-
-    def get_spread(self):
-        """Calculate bid-ask spread."""
-        best_bid = self.get_best_bid()
-        best_ask = self.get_best_ask()
-        if best_bid and best_ask:
-            return best_ask - best_bid
-        return None
-
-def generate_order_book(mid_price=100.0, n_levels=20):
+def generate_order_book(mid_price=100.0, n_levels=20, spacing=0.10, tick_size=0.01):
     """
     Generate a realistic order book with liquidity.
 
@@ -59,18 +44,22 @@ def generate_order_book(mid_price=100.0, n_levels=20):
         Mid-market price
     n_levels : int
         Number of price levels on each side
+    spacing : float
+        Price distance between adjacent levels
+    tick_size : float
+        Tick size of the book (spacing must be a multiple of it)
 
     Returns:
     --------
     OrderBook
         Populated order book
     """
-    book = OrderBook(mid_price)
+    book = OrderBook(mid_price, tick_size)
 
     # Generate bid side (below mid price)
     for i in range(1, n_levels + 1):
         # Price decreases as we go deeper into the book
-        price = mid_price - i * 0.10
+        price = mid_price - i * spacing
         # Quantity increases with distance from mid (more liquidity at worse prices)
         quantity = 100 * (1 + i * 0.3) + np.random.normal(0, 20)
         quantity = max(50, quantity)  # Minimum 50 shares
@@ -78,36 +67,99 @@ def generate_order_book(mid_price=100.0, n_levels=20):
 
     # Generate ask side (above mid price)
     for i in range(1, n_levels + 1):
-        price = mid_price + i * 0.10
+        price = mid_price + i * spacing
         quantity = 100 * (1 + i * 0.3) + np.random.normal(0, 20)
         quantity = max(50, quantity)
         book.add_limit_order('sell', price, quantity)
 
     return book
 
-def calculate_cumulative_volume(orders):
-    """Calculate cumulative volume at each price level."""
-    if not orders:
-        return [], []
+def rebin_levels(prices, quantities, tick_size, max_levels=200):
+    """
+    Merge adjacent price levels into buckets of a whole number of ticks.
 
-    prices = [price for price, _ in orders]
-    quantities = [qty for _, qty in orders]
-    cumulative = np.cumsum(quantities)
+    Parameters:
+    -----------
+    prices, quantities : np.ndarray
+        Levels of one side, best price first
+    tick_size : float
+        Tick size of the book
+    max_levels : int
+        Most buckets to return; books with no more levels are unchanged
 
-    return prices, cumulative
+    Returns:
+    --------
+    tuple
+        (bucket centre prices, bucket quantities, bucket width), best first
+    """
+    ticks = np.rint(np.asarray(prices) / tick_size).astype(np.int64)
+    if len(ticks) <= max_levels:
+        step = np.abs(np.diff(ticks)).min() if len(ticks) > 1 else 1
+        return np.asarray(prices), np.asarray(quantities), step * tick_size
+
+    lowest = ticks.min()
+    width = -(-(ticks.max() - lowest + 1) // max_levels)  # ticks per bucket
+    bucket = (ticks - lowest) // width
+    sizes = np.bincount(bucket, weights=quantities)
+    filled = np.flatnonzero(sizes)
+    centres = (lowest + filled * width + (width - 1) / 2) * tick_size
+    if ticks[0] > ticks[-1]:  # bids: highest price first
+        filled, centres = filled[::-1], centres[::-1]
+    return centres, sizes[filled], width * tick_size
+
+def depth_bands(prices, quantities, reference, n_bands=100):
+    """
+    Cumulative depth sampled at log-spaced distances from a reference price.
+
+    Fine near the touch and coarse deep in the book; books with no more
+    than n_bands levels are returned level by level.
+
+    Returns:
+    --------
+    tuple
+        (band edge prices, cumulative quantity up to each edge), best first
+    """
+    prices = np.asarray(prices)
+    if len(prices) <= n_bands:
+        return prices, np.cumsum(quantities)
+
+    distance = np.abs(prices - reference)
+    edges = np.geomspace(max(distance.min(), 1e-12), distance.max(), n_bands)
+    band = np.minimum(np.searchsorted(edges, distance), n_bands - 1)
+    volume = np.bincount(band, weights=quantities, minlength=n_bands)
+    direction = np.sign(prices[0] - reference)
+    return reference + direction * edges, np.cumsum(volume)
 
 def main():
+    parser = argparse.ArgumentParser(description='Order book depth visualization')
+    parser.add_argument('--levels', type=int, default=20, help='Price levels per side')
+    parser.add_argument('--spacing', type=float, default=0.10, help='Distance between levels')
+    parser.add_argument('--tick-size', type=float, default=0.01, help='Tick size')
+    parser.add_argument('--max-levels', type=int, default=200,
+                        help='Most depth bars per side (levels are rebinned above)')
+    parser.add_argument('--bands', type=int, default=100,
+                        help='Log-spaced points of the cumulative depth curves')
+    args = parser.parse_args()
+
     # Generate order book
     mid_price = 100.0
-    book = generate_order_book(mid_price=mid_price, n_levels=20)
+    book = generate_order_book(mid_price=mid_price, n_levels=args.levels,
+                               spacing=args.spacing, tick_size=args.tick_size)
+    start = time.perf_counter()
+
+    # Level arrays, then aggregated for plotting
+    bid_levels = book.depth('buy')
+    ask_levels = book.depth('sell')
+    bid_quantities = bid_levels[1]
+    ask_quantities = ask_levels[1]
+    bid_bars, bid_bar_sizes, bid_width = rebin_levels(*bid_levels, book.tick_size,
+                                                      args.max_levels)
+    ask_bars, ask_bar_sizes, ask_width = rebin_levels(*ask_levels, book.tick_size,
+                                                      args.max_levels)
 
     # Calculate cumulative volumes
-    bid_prices, bid_cumulative = calculate_cumulative_volume(book.bids)
-    ask_prices, ask_cumulative = calculate_cumulative_volume(book.asks)
-
-    # Get order quantities
-    bid_quantities = [qty for _, qty in book.bids]
-    ask_quantities = [qty for _, qty in book.asks]
+    bid_prices, bid_cumulative = depth_bands(*bid_levels, mid_price, args.bands)
+    ask_prices, ask_cumulative = depth_bands(*ask_levels, mid_price, args.bands)
 
     # Create visualization
     fig = plt.figure(figsize=(10, 7))
@@ -117,30 +169,33 @@ def main():
     ax3 = fig.add_subplot(gs[1, 1])
     ax4 = fig.add_subplot(gs[2, :])
 
-    # Plot 1: Order book depth chart
+    # Plot 1: Order book depth chart (bar outlines only when bars are few)
+    bid_edges = None if len(bid_bars) <= 50 else 0
+    ask_edges = None if len(ask_bars) <= 50 else 0
     # Bids (buy orders)
-    ax1.barh(bid_prices, bid_quantities, height=0.08, color='gray',
-            edgecolor='black', alpha=0.7, label='Bid (Buy Orders)')
+    ax1.barh(bid_bars, bid_bar_sizes, height=0.8 * bid_width, color='gray',
+            edgecolor='black', linewidth=bid_edges, alpha=0.7, label='Bid (Buy Orders)')
 
     # Asks (sell orders)
-    ax1.barh(ask_prices, ask_quantities, height=0.08, color='black',
-            edgecolor='black', alpha=0.7, label='Ask (Sell Orders)')
+    ax1.barh(ask_bars, ask_bar_sizes, height=0.8 * ask_width, color='black',
+            edgecolor='black', linewidth=ask_edges, alpha=0.7, label='Ask (Sell Orders)')
 
     # Mark mid price and best bid/ask
     best_bid = book.get_best_bid()
     best_ask = book.get_best_ask()
     spread = book.get_spread()
+    d = book.decimals  # price decimals of the tick size
 
     ax1.axhline(y=mid_price, color='gray', linestyle='--', linewidth=1.5,
-               label=f'Mid Price: ${mid_price:.2f}')
+               label=f'Mid Price: ${mid_price:.{d}f}')
     ax1.axhline(y=best_bid, color='darkgray', linestyle=':', linewidth=1,
-               label=f'Best Bid: ${best_bid:.2f}')
+               label=f'Best Bid: ${best_bid:.{d}f}')
     ax1.axhline(y=best_ask, color='black', linestyle=':', linewidth=1,
-               label=f'Best Ask: ${best_ask:.2f}')
+               label=f'Best Ask: ${best_ask:.{d}f}')
 
     # Highlight spread
     ax1.axhspan(best_bid, best_ask, alpha=0.2, color='yellow',
-               label=f'Spread: ${spread:.2f}')
+               label=f'Spread: ${spread:.{d}f}')
 
     ax1.set_xlabel('Order Size (shares)', fontsize=8)
     ax1.set_ylabel('Price (USD)', fontsize=8)
@@ -177,41 +232,9 @@ def main():
     # Plot 4: Market impact simulation
     # Simulate different order sizes and their impact
     order_sizes = np.array([100, 250, 500, 1000, 2000, 5000])
-    buy_impacts = []
-    sell_impacts = []
-
-    for size in order_sizes:
-        # Buy order impact (consumes asks)
-        remaining = size
-        total_cost = 0
-        for price, qty in book.asks:
-            if remaining <= 0:
-                break
-            executed = min(remaining, qty)
-            total_cost += executed * price
-            remaining -= executed
-
-        if remaining == 0:
-            avg_price = total_cost / size
-            buy_impacts.append((avg_price - best_ask) / best_ask * 10000)  # bps
-        else:
-            buy_impacts.append(np.nan)
-
-        # Sell order impact (consumes bids)
-        remaining = size
-        total_proceeds = 0
-        for price, qty in book.bids:
-            if remaining <= 0:
-                break
-            executed = min(remaining, qty)
-            total_proceeds += executed * price
-            remaining -= executed
-
-        if remaining == 0:
-            avg_price = total_proceeds / size
-            sell_impacts.append((best_bid - avg_price) / best_bid * 10000)  # bps
-        else:
-            sell_impacts.append(np.nan)
+    impacts = book_impact(book, order_sizes)  # bps, NaN beyond visible depth
+    buy_impacts = impacts['buy']
+    sell_impacts = impacts['sell']
 
     # Plot market impact
     x_pos = np.arange(len(order_sizes))
@@ -235,49 +258,48 @@ def main():
     # Save output
     output_path = Path(__file__).parent / 'order_book_simulation.pdf'
     plt.savefig(output_path, format='pdf', dpi=300, bbox_inches='tight')
+    seconds = time.perf_counter() - start
     print(f"Output saved to: {output_path}")
+    print(f"Plotted {len(bid_bars) + len(ask_bars)} bars for "
+          f"{len(bid_quantities) + len(ask_quantities):,} levels in {seconds:.2f} s "
+          f"({output_path.stat().st_size / 1024:.0f} KB)")
 
     # Print order book statistics
     print("\nOrder Book Statistics:")
     print("-" * 70)
-    print(f"Mid Price:       ${mid_price:.2f}")
-    print(f"Best Bid:        ${best_bid:.2f}")
-    print(f"Best Ask:        ${best_ask:.2f}")
-    print(f"Bid-Ask Spread:  ${spread:.2f} ({spread/mid_price*100:.3f}%)")
-    print(f"\nTotal Bid Volume:   {sum(bid_quantities):,.0f} shares")
-    print(f"Total Ask Volume:   {sum(ask_quantities):,.0f} shares")
-    print(f"\nBid Levels: {len(book.bids)}")
-    print(f"Ask Levels: {len(book.asks)}")
+    print(f"Mid Price:       ${mid_price:.{d}f}")
+    print(f"Best Bid:        ${best_bid:.{d}f}")
+    print(f"Best Ask:        ${best_ask:.{d}f}")
+    print(f"Bid-Ask Spread:  ${spread:.{d}f} ({spread/mid_price*100:.3f}%)")
+    print(f"\nTotal Bid Volume:   {bid_quantities.sum():,.0f} shares")
+    print(f"Total Ask Volume:   {ask_quantities.sum():,.0f} shares")
+    print(f"\nBid Levels: {len(bid_quantities)}")
+    print(f"Ask Levels: {len(ask_quantities)}")
 
     print("\nTop 5 Bids:")
-    for i, (price, qty) in enumerate(book.bids[:5]):
-        print(f"  {i+1}. ${price:.2f} x {qty:,.0f} shares")
+    for i, (price, qty) in enumerate(zip(*(a[:5].tolist() for a in bid_levels))):
+        print(f"  {i+1}. ${price:.{d}f} x {qty:,.0f} shares")
 
     print("\nTop 5 Asks:")
-    for i, (price, qty) in enumerate(book.asks[:5]):
-        print(f"  {i+1}. ${price:.2f} x {qty:,.0f} shares")
+    for i, (price, qty) in enumerate(zip(*(a[:5].tolist() for a in ask_levels))):
+        print(f"  {i+1}. ${price:.{d}f} x {qty:,.0f} shares")
 
     # Calculate market impact for a sample order
     sample_order_size = 500
     print(f"\nMarket Impact Analysis (for {sample_order_size} share market order):")
     print("-" * 70)
 
-    # Buy market order (consumes asks)
-    remaining = sample_order_size
-    total_cost = 0
-    for price, qty in book.asks:
-        if remaining <= 0:
-            break
-        executed = min(remaining, qty)
-        total_cost += executed * price
-        remaining -= executed
-
-    avg_price_buy = total_cost / sample_order_size if remaining == 0 else None
-    if avg_price_buy:
+    # Buy market order (consumes asks), executed on a copy of the book
+    engine = MatchingEngine(book.copy())
+    report = engine.market_order('buy', sample_order_size)
+    if report.status == 'filled':
+        avg_price_buy = report.avg_price
         slippage_buy = avg_price_buy - best_ask
         print(f"Buy {sample_order_size} shares:")
-        print(f"  Average execution price: ${avg_price_buy:.2f}")
-        print(f"  Slippage: ${slippage_buy:.2f} ({slippage_buy/best_ask*100:.3f}%)")
+        print(f"  Average execution price: ${avg_price_buy:.{d}f}")
+        print(f"  Slippage: ${slippage_buy:.{d}f} ({slippage_buy/best_ask*100:.3f}%)")
+        print(f"  Fills: {len(report.trades)} trades, "
+              f"best ask afterwards ${engine.book.get_best_ask():.{d}f}")
 
 if __name__ == '__main__':
     main()
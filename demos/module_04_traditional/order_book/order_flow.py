@@ -0,0 +1,380 @@
+"""
+Event-Driven Order Flow Simulator
+
+Generates a stream of order book events - limit orders, cancellations and
+market orders on both sides - and feeds them through the MatchingEngine
+(matching_engine.py) into an OrderBook (order_book.py).
+
+Arrivals are a multivariate point process over the six event types
+(limit/cancel/market x buy/sell):
+
+    Poisson   constant intensities lambda_i
+    Hawkes    self-exciting intensities with an exponential kernel,
+              lambda_i(t) = mu_i + sum_j alpha_ij * sum_{t_k of type j} exp(-beta (t - t_k)),
+              simulated with Ogata's thinning; the excitation decays in
+              closed form, so each event costs O(1)
+
+Cancellations have a per-order hazard: their baseline intensity is scaled
+by the number of orders resting on that side, which keeps the book size
+stationary instead of letting it drift to empty or grow without bound.
+
+The simulator is a generator: simulate() yields a Snapshot (top-of-book,
+top-N depth and the trades since the previous snapshot) every `interval`
+seconds of simulated time. Nothing accumulates between snapshots - the
+engine does not keep a trade log and at most `max_resting` orders rest in the
+book - so hours of trading run in constant memory.
+
+Usage:
+    python order_flow.py                      # Two hours of Hawkes flow
+    python order_flow.py --hours 8 --poisson
+    python order_flow.py --trace-memory
+
+Author: BSc Digital Finance Course
+Date: 2025-12-07
+"""
+
+import argparse
+import math
+import time
+import tracemalloc
+from collections import namedtuple
+
+import numpy as np
+
+try:  # imported as demos.module_04_traditional.order_book
+    from .matching_engine import TRADE_DTYPE, MatchingEngine
+    from .order_book import OrderBook
+except ImportError:  # run as a script from this folder
+    from matching_engine import TRADE_DTYPE, MatchingEngine
+    from order_book import OrderBook
+
+# Event types, in the order of the intensity vector
+EVENTS = (('limit', 'buy'), ('limit', 'sell'),
+          ('cancel', 'buy'), ('cancel', 'sell'),
+          ('market', 'buy'), ('market', 'sell'))
+
+# Baseline intensities per side (events per second; for 'cancel', per resting order)
+DEFAULT_RATES = {'limit': 5.0, 'cancel': 0.05, 'market': 1.0}
+
+Snapshot = namedtuple('Snapshot', ['time', 'best_bid', 'best_ask', 'mid', 'spread',
+                                   'bid_prices', 'bid_sizes', 'ask_prices', 'ask_sizes',
+                                   'trades', 'events'])
+
+
+def _uniforms(rng, block=65_536):
+    """Endless stream of U(0,1) floats, drawn from NumPy in blocks."""
+    while True:
+        yield from rng.random(block).tolist()
+
+
+class HawkesProcess:
+    """Multivariate Hawkes process with an exponential kernel.
+
+    baseline: (k,) intensities mu; excitation: (k, k) jumps alpha, where
+    alpha[i, j] is added to the intensity of type i by an event of type j;
+    decay: beta, per second. Without excitation it is a Poisson process.
+    """
+
+    def __init__(self, baseline, excitation=None, decay=1.0):
+        self.baseline = np.asarray(baseline, dtype=float)
+        k = len(self.baseline)
+        self.excitation = (np.zeros((k, k)) if excitation is None
+                           else np.asarray(excitation, dtype=float))
+        self.decay = float(decay)
+        if self.excitation.shape != (k, k):
+            raise ValueError(f"excitation must be {k}x{k}, got {self.excitation.shape}")
+        if self.excitation.any() and self.branching_ratio() >= 1:
+            raise ValueError(f"explosive process: branching ratio "
+                             f"{self.branching_ratio():.2f} >= 1")
+
+    def branching_ratio(self):
+        """Spectral radius of alpha / beta (must be < 1 for stationarity)."""
+        return float(np.max(np.abs(np.linalg.eigvals(self.excitation / self.decay))))
+
+    def mean_rates(self):
+        """Stationary intensities (I - alpha/beta)^-1 mu."""
+        k = len(self.baseline)
+        return np.linalg.solve(np.eye(k) - self.excitation / self.decay, self.baseline)
+
+    def arrivals(self, rng, start=0.0, scale=None):
+        """Endless generator of (time, event type index).
+
+        scale: optional list of k multipliers on the baseline that the
+        caller may update between events (state-dependent intensities).
+        """
+        base = self.baseline.tolist()
+        scale = scale if scale is not None else [1.0] * len(base)
+        columns = self.excitation.T.tolist()  # columns[j]: jumps caused by type j
+        exciting = self.excitation.any()
+        beta = self.decay
+        k = len(base)
+        excited = [0.0] * k
+        uniform = _uniforms(rng).__next__
+        log = math.log
+        exp = math.exp
+        t = start
+        while True:
+            mu = [b * s for b, s in zip(base, scale)]
+            # Intensities only decay until the next event, so the current
+            # total bounds them over the waiting time
+            bound = sum(mu) + sum(excited)
+            wait = -log(1.0 - uniform()) / bound
+            t += wait
+            if exciting:
+                factor = exp(-beta * wait)
+                excited = [e * factor for e in excited]
+                intensity = [m + e for m, e in zip(mu, excited)]
+                total = sum(intensity)
+                if uniform() * bound > total:
+                    continue  # thinned
+            else:
+                intensity = mu
+                total = bound
+            target = uniform() * total
+            j = 0
+            while j < k - 1 and target >= intensity[j]:
+                target -= intensity[j]
+                j += 1
+            if exciting:
+                excited = [e + a for e, a in zip(excited, columns[j])]
+            yield t, j
+
+
+class PoissonProcess(HawkesProcess):
+    """Independent Poisson arrivals with constant intensities."""
+
+    def __init__(self, rates):
+        super().__init__(rates)
+
+
+def default_process(hawkes=True, rates=None, decay=2.0):
+    """Arrival process over EVENTS.
+
+    With hawkes=True a market order raises the intensity of further market
+    orders on the same side (order splitting, herding) and of limit orders
+    on the side it consumed (liquidity replenishment); limit orders mildly
+    excite cancellations.
+    """
+    rates = dict(DEFAULT_RATES, **(rates or {}))
+    baseline = [rates[kind] for kind, _ in EVENTS]
+    if not hawkes:
+        return PoissonProcess(baseline)
+
+    index = {event: i for i, event in enumerate(EVENTS)}
+    alpha = np.zeros((len(EVENTS), len(EVENTS)))
+    for side, other in (('buy', 'sell'), ('sell', 'buy')):
+        market = index['market', side]
+        alpha[market, market] = 0.6
+        alpha[index['limit', other], market] = 1.2     # refill the consumed side
+        alpha[index['cancel', side], index['limit', side]] = 0.3
+    # Excitation is specified in events per event; scale to jump sizes
+    return HawkesProcess(baseline, alpha * decay, decay)
+
+
+class OrderFlowSimulator:
+    """Streams simulated order flow through a MatchingEngine.
+
+    Limit prices are set relative to the opposite best quote: a buy limit
+    sits 1 + Exp(limit_offset) ticks below the best ask (inside the spread
+    when it is wide), capped at max_offset ticks. Sizes are 1 + Geometric
+    lots. A cancellation removes a random resting order of its side.
+    """
+
+    def __init__(self, engine=None, process=None, seed=42, mid_price=100.0, tick_size=0.01,
+                 limit_offset=4.0, max_offset=50, mean_lots=3.0, lot_size=100,
+                 initial_levels=10, max_resting=20_000):
+        if engine is None:
+            engine = MatchingEngine(OrderBook(mid_price, tick_size), keep_trades=False)
+        self.engine = engine
+        self.book = engine.book
+        self.process = process if process is not None else default_process()
+        self.rng = np.random.default_rng(seed)
+        self.limit_offset = limit_offset
+        self.max_offset = max_offset
+        self.lot_p = 1.0 / mean_lots
+        self.lot_size = lot_size
+        self.max_resting = max_resting
+        self.time = 0.0
+        self.counts = [0] * len(EVENTS)
+        self._resting = {'buy': [], 'sell': []}  # our order ids; filled ones dropped lazily
+        self._trades = []                        # trades since the last snapshot
+        self._reference = self.book.to_tick(self.book.get_mid_price())  # last mid, in ticks
+        # Cancel intensities scale with the resting orders per side
+        self._scale = [1.0] * len(EVENTS)
+        self._cancel_slots = [(i, side) for i, (kind, side) in enumerate(EVENTS)
+                              if kind == 'cancel']
+        self._arrivals = self.process.arrivals(self.rng, scale=self._scale)
+        self._lookahead = None
+        self._uniform = _uniforms(self.rng).__next__
+        self._seed_book(initial_levels)
+        self._update_scale()
+
+    def _seed_book(self, n_levels):
+        book = self.book
+        mid = book.to_tick(book.mid_price)
+        for level in range(1, n_levels + 1):
+            for side, tick in (('buy', mid - level), ('sell', mid + level)):
+                self._rest(side, tick, self._quantity())
+
+    def _quantity(self):
+        # 1 + Geometric(p) lots by inversion
+        u = self._uniform()
+        return self.lot_size * (1 + int(math.log(1.0 - u) / math.log(1.0 - self.lot_p)))
+
+    def _rest(self, side, tick, quantity):
+        report = self.engine.submit(side, quantity, self.book.to_price(tick), 'limit',
+                                    timestamp=self.time)
+        self._trades.extend(report.trades)
+        if report.status == 'resting':
+            self._resting[side].append(report.order_id)
+
+    def _cancel_random(self, side):
+        """Cancel a random live order on one side; False if none is resting."""
+        resting = self._resting[side]
+        book = self.book
+        if len(resting) > 2 * book.n_orders(side) + 1024:
+            self._resting[side] = resting = [oid for oid in resting if oid in book]
+        while resting:
+            i = int(self._uniform() * len(resting))
+            resting[i], resting[-1] = resting[-1], resting[i]
+            order_id = resting.pop()
+            if order_id in book:
+                return self.engine.cancel(order_id)
+        return False
+
+    def _limit_tick(self, side):
+        book = self.book
+        offset = 1 + min(int(-self.limit_offset * math.log(1.0 - self._uniform())),
+                         self.max_offset)
+        bid, ask = book.best_level('buy'), book.best_level('sell')
+        if bid and ask:
+            self._reference = (bid.tick + ask.tick) // 2
+        if side == 'buy':
+            return (ask.tick if ask else self._reference + 1) - offset
+        return (bid.tick if bid else self._reference - 1) + offset
+
+    def handle(self, event):
+        """Apply one event (an index into EVENTS) at the current time."""
+        kind, side = EVENTS[event]
+        self.counts[event] += 1
+        if kind == 'limit':
+            if len(self.book) >= self.max_resting:
+                self._cancel_random(side)
+            self._rest(side, self._limit_tick(side), self._quantity())
+        elif kind == 'cancel':
+            self._cancel_random(side)
+        else:
+            report = self.engine.submit(side, self._quantity(), order_type='market',
+                                        timestamp=self.time)
+            self._trades.extend(report.trades)
+        self._update_scale()
+
+    def _update_scale(self):
+        for i, side in self._cancel_slots:
+            self._scale[i] = self.book.n_orders(side)
+
+    def snapshot(self, n_levels=10):
+        """Snapshot of the book now; takes the trades since the last one."""
+        book = self.book
+        bid_prices, bid_sizes = _padded(book.depth('buy', n_levels), n_levels)
+        ask_prices, ask_sizes = _padded(book.depth('sell', n_levels), n_levels)
+        best_bid, best_ask = bid_prices[0], ask_prices[0]
+        trades = np.array([tuple(t) for t in self._trades], dtype=TRADE_DTYPE)
+        self._trades = []
+        events = np.array(self.counts)
+        self.counts = [0] * len(EVENTS)
+        return Snapshot(self.time, best_bid, best_ask, (best_bid + best_ask) / 2,
+                        best_ask - best_bid, bid_prices, bid_sizes, ask_prices, ask_sizes,
+                        trades, events)
+
+    def simulate(self, duration, interval=1.0, n_levels=10):
+        """Run for `duration` seconds, yielding a Snapshot every `interval`.
+
+        Snapshot fields: time; best_bid, best_ask, mid, spread (NaN when a
+        side is empty); bid/ask prices and sizes of the top n_levels (NaN
+        price, zero size past the last level); trades, a TRADE_DTYPE array
+        of the trades since the previous snapshot; events, counts per EVENTS
+        type over the interval. Call simulate() again to continue the same
+        session.
+        """
+        begin = self.time
+        end = begin + duration
+        n_snapshots = 1
+        next_snapshot = begin + interval
+        arrivals = self._arrivals
+        handle = self.handle
+        while True:
+            if self._lookahead is None:
+                self._lookahead = next(arrivals)
+            t, event = self._lookahead
+            while next_snapshot <= min(t, end) + 1e-9:
+                self.time = next_snapshot
+                yield self.snapshot(n_levels)
+                n_snapshots += 1
+                next_snapshot = begin + n_snapshots * interval
+            if t > end:
+                self.time = end
+                return
+            self._lookahead = None
+            self.time = t
+            handle(event)
+
+
+def _padded(depth, n_levels):
+    prices, sizes = depth
+    if len(prices) == n_levels:
+        return prices, sizes
+    return (np.concatenate([prices, np.full(n_levels - len(prices), np.nan)]),
+            np.concatenate([sizes, np.zeros(n_levels - len(sizes))]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream simulated order flow')
+    parser.add_argument('--hours', type=float, default=2.0, help='Simulated trading hours')
+    parser.add_argument('--interval', type=float, default=1.0, help='Seconds between snapshots')
+    parser.add_argument('--levels', type=int, default=10, help='Depth levels per snapshot')
+    parser.add_argument('--poisson', action='store_true', help='Poisson instead of Hawkes')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Report traced memory during the run (slower)')
+    args = parser.parse_args()
+
+    process = default_process(hawkes=not args.poisson)
+    sim = OrderFlowSimulator(process=process, seed=args.seed)
+    duration = args.hours * 3600
+    if args.trace_memory:
+        tracemalloc.start()
+
+    n_snapshots = n_trades = 0
+    volume = spread_sum = 0.0
+    memory = []
+    start = time.perf_counter()
+    for snap in sim.simulate(duration, args.interval, args.levels):
+        n_snapshots += 1
+        n_trades += len(snap.trades)
+        volume += snap.trades['quantity'].sum()
+        if not np.isnan(snap.spread):
+            spread_sum += snap.spread
+        if args.trace_memory and n_snapshots % max(1, int(900 / args.interval)) == 0:
+            memory.append((snap.time, tracemalloc.get_traced_memory()[0]))
+    seconds = time.perf_counter() - start
+    stats = sim.engine.stats
+    n_events = stats['orders'] + stats['cancels']
+
+    name = 'Poisson' if args.poisson else (f"Hawkes (branching ratio "
+                                           f"{process.branching_ratio():.2f})")
+    print(f"\nOrder flow: {args.hours:g} h of {name} arrivals")
+    print("-" * 70)
+    print(f"Events:          {n_events:,} in {seconds:.1f} s ({n_events / seconds:,.0f}/s)")
+    print(f"Snapshots:       {n_snapshots:,} every {args.interval:g} s, "
+          f"{args.levels} levels")
+    print(f"Trades:          {n_trades:,} ({volume:,.0f} shares)")
+    print(f"Mean spread:     {spread_sum / max(n_snapshots, 1):.4f}")
+    print(f"Final book:      {len(sim.book):,} orders, mid {sim.book.get_mid_price():.2f}")
+    if memory:
+        print("Traced memory:   " + ', '.join(f"{t / 3600:.2f} h {m / 1e6:.2f} MB"
+                                              for t, m in memory[::max(1, len(memory) // 4)]))
+
+
+if __name__ == '__main__':
+    main()
@@ -6,17 +6,35 @@ Usage:
     python generate_all_charts.py                    # Generate all charts
     python generate_all_charts.py --module module_01_fintech  # Generate specific module
     python generate_all_charts.py --verify           # Verify only, don't generate
+    python generate_all_charts.py --import-times     # Also record per-chart import cost
+    python generate_all_charts.py --pdf-fonts type42 # Font embedding: type3, type42, core14
+    python generate_all_charts.py --formats pdf,webp # Also write web thumbnails to docs/charts
+    python generate_all_charts.py --deterministic    # Byte-reproducible output
+    python generate_all_charts.py --check-determinism 10  # Rebuild a sample twice, compare hashes
+
+Charts defined as spec files (<name>.chart.yaml, see charts/_shared/specs.py)
+are rendered together in one process after the scripts.
+
+charts/_shared/runner_benchmark.py times representative charts under this
+runner (one subprocess per chart) and under in-process, pooled and cached
+execution.
 """
 
+import os
 import subprocess
 import sys
 import time
 import json
 import argparse
 import gc
+import hashlib
+import shutil
+import tempfile
 from pathlib import Path
 from datetime import datetime
 
+from charts._shared.specs import SPEC_SUFFIXES, spec_stem
+
 # Configuration
 BASE_DIR = Path(__file__).parent
 CHARTS_DIR = BASE_DIR / "charts"
@@ -35,7 +53,7 @@ MODULES = [
 
 
 def discover_chart_scripts(module_filter=None):
-    """Find all chart Python scripts"""
+    """Find all chart Python scripts and chart spec files"""
     scripts = []
 
     for module_name, charts_folder in MODULES:
@@ -54,6 +72,15 @@ def discover_chart_scripts(module_filter=None):
                     'name': item.stem,
                     'folder': charts_folder,
                 })
+            for suffix in SPEC_SUFFIXES:
+                for item in module_charts.rglob(f"*{suffix}"):
+                    scripts.append({
+                        'script': item,
+                        'module': module_name,
+                        'name': spec_stem(item),
+                        'folder': charts_folder,
+                        'spec': True,
+                    })
 
         # Also check in charts/module_XX folder
         standalone_charts = CHARTS_DIR / module_name
@@ -71,7 +98,100 @@ def discover_chart_scripts(module_filter=None):
     return scripts
 
 
-def run_chart_script(script_info, attempt=1):
+# Build-wide matplotlibrc (see --pdf-fonts); None keeps the user's config
+BUILD_MATPLOTLIBRC = None
+
+# Output formats for charts using charts._shared.save_chart (see --formats)
+BUILD_FORMATS = None
+WEB_DIR = BASE_DIR / "docs" / "charts"
+
+# Deterministic output (see charts/_shared/determinism.py and --deterministic)
+BUILD_DETERMINISTIC = False
+DEFAULT_SOURCE_DATE_EPOCH = '1704067200'  # 2024-01-01 UTC, as in determinism.py
+
+
+def chart_env(output_log=None):
+    """Environment for chart subprocesses: project root importable so
+    scripts can use the shared style package (charts._shared)"""
+    env = os.environ.copy()
+    paths = [str(BASE_DIR)] + [p for p in env.get('PYTHONPATH', '').split(os.pathsep) if p]
+    env['PYTHONPATH'] = os.pathsep.join(paths)
+    if BUILD_MATPLOTLIBRC:
+        env['MATPLOTLIBRC'] = str(BUILD_MATPLOTLIBRC)
+    if BUILD_FORMATS:
+        env['CHART_FORMATS'] = ','.join(BUILD_FORMATS)
+        env['CHART_WEB_DIR'] = str(WEB_DIR)
+    if output_log:
+        env['CHART_OUTPUT_LOG'] = str(output_log)
+    if BUILD_DETERMINISTIC:
+        # SOURCE_DATE_EPOCH fixes matplotlib's PDF dates for every script;
+        # CHART_DETERMINISTIC fixes metadata in charts._shared (scripts are
+        # also run under determinism.deterministic_mode, which seeds them)
+        env.setdefault('SOURCE_DATE_EPOCH', DEFAULT_SOURCE_DATE_EPOCH)
+        env['CHART_DETERMINISTIC'] = '1'
+        env['PYTHONHASHSEED'] = '0'
+    return env
+
+
+def read_output_log(output_log):
+    """Per-format bytes and seconds logged by save_chart in a chart process"""
+    outputs = {}
+    if output_log.exists():
+        for line in output_log.read_text(encoding='utf-8').splitlines():
+            entry = json.loads(line)
+            info = outputs.setdefault(entry['format'], {'files': 0, 'bytes': 0, 'seconds': 0.0})
+            info['files'] += 1
+            info['bytes'] += entry['bytes']
+            info['seconds'] += entry['seconds']
+        output_log.unlink()
+    return outputs
+
+
+def configure_fonts(embedding):
+    """Pre-warm the font cache and select a PDF font embedding mode for
+    every chart subprocess. Returns the warm-up time in seconds."""
+    global BUILD_MATPLOTLIBRC
+    from charts._shared.fonts import warm_font_cache, write_build_matplotlibrc
+
+    warm_seconds, resolved = warm_font_cache()
+    if embedding:
+        rc_dir = Path(tempfile.mkdtemp(prefix='chart_rc_'))
+        BUILD_MATPLOTLIBRC = write_build_matplotlibrc(rc_dir / 'matplotlibrc', embedding)
+    return warm_seconds
+
+
+def output_pdf_bytes(script_path, since):
+    """Total size of the PDFs a script wrote into its folder since a time"""
+    total = 0
+    for pdf in script_path.parent.glob("*.pdf"):
+        st = pdf.stat()
+        if st.st_mtime >= since:
+            total += st.st_size
+    return total
+
+
+def parse_import_times(stderr):
+    """Split `python -X importtime` output from a script's stderr.
+
+    Returns (total seconds, {top-level package: seconds}, remaining stderr).
+    """
+    packages = {}
+    other = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            other.append(line)
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue  # header line
+        name = fields[2]
+        if name.startswith('  '):
+            continue  # nested import, already counted in its parent
+        packages[name.strip()] = int(fields[1]) / 1e6
+    return sum(packages.values()), packages, '\n'.join(other)
+
+
+def run_chart_script(script_info, attempt=1, import_times=False):
     """Execute a single chart script"""
     script_path = script_info['script']
 
@@ -88,18 +208,38 @@ def run_chart_script(script_info, attempt=1):
     }
 
     start_time = time.time()
+    output_log = None
+    if BUILD_FORMATS:
+        fd, output_log = tempfile.mkstemp(prefix='chart_output_', suffix='.jsonl')
+        os.close(fd)
+        output_log = Path(output_log)
 
     try:
+        command = [sys.executable, str(script_path)]
+        if BUILD_DETERMINISTIC:
+            command[1:1] = ['-m', 'charts._shared.determinism']
+        if import_times:
+            command[1:1] = ['-X', 'importtime']
         proc = subprocess.run(
-            [sys.executable, str(script_path)],
+            command,
             capture_output=True,
             text=True,
             timeout=TIMEOUT_SECONDS,
-            cwd=script_path.parent
+            cwd=script_path.parent,
+            env=chart_env(output_log)
         )
 
         result['output'] = proc.stdout
         result['duration'] = time.time() - start_time
+        stderr = proc.stderr
+        if import_times:
+            total, packages, stderr = parse_import_times(stderr)
+            result['import_time'] = total
+            result['imports'] = dict(sorted(packages.items(), key=lambda kv: -kv[1])[:5])
+
+        result['pdf_bytes'] = output_pdf_bytes(script_path, start_time - 1)
+        if output_log:
+            result['outputs'] = read_output_log(output_log)
 
         if proc.returncode == 0:
             # Check if PDF was created
@@ -111,7 +251,7 @@ def run_chart_script(script_info, attempt=1):
                 result['success'] = False
                 result['error'] = "Script ran but no PDF created"
         else:
-            result['error'] = proc.stderr[:500] if proc.stderr else "Unknown error"
+            result['error'] = stderr[:500] if stderr else "Unknown error"
 
     except subprocess.TimeoutExpired:
         result['error'] = f"Timeout after {TIMEOUT_SECONDS}s"
@@ -124,32 +264,160 @@ def run_chart_script(script_info, attempt=1):
     return result
 
 
-def run_batch_sequential(scripts, progress_callback=None):
-    """Run all scripts sequentially"""
+def run_spec_batch(spec_infos, attempt=1):
+    """Render chart specs in a single process (charts._shared.specs), so
+    interpreter start-up and matplotlib import are paid once per batch
+    rather than once per chart. Returns one result per spec."""
+    results = {str(info['script']): {
+        'script': str(info['script']),
+        'module': info['module'],
+        'name': info['name'],
+        'success': False,
+        'error': None,
+        'output': None,
+        'duration': 0,
+        'pdf_created': False,
+        'attempt': attempt,
+        'spec': True,
+    } for info in spec_infos}
+
+    start_time = time.time()
+    command = [sys.executable, '-m', 'charts._shared.specs', '--jsonl',
+               *[str(info['script']) for info in spec_infos]]
+    try:
+        proc = subprocess.run(
+            command,
+            capture_output=True,
+            text=True,
+            timeout=TIMEOUT_SECONDS + len(spec_infos),
+            cwd=BASE_DIR,
+            env=chart_env()
+        )
+        for line in proc.stdout.splitlines():
+            if not line.startswith('{'):
+                continue
+            entry = json.loads(line)
+            result = results.get(entry['spec'])
+            if result is None:
+                continue
+            result['duration'] = entry['seconds']
+            result['success'] = result['pdf_created'] = entry['success']
+            result['error'] = entry['error']
+            outputs = {fmt: {'files': 1, 'bytes': info['bytes'], 'seconds': info['seconds']}
+                       for fmt, info in entry['outputs'].items()}
+            if BUILD_FORMATS:
+                result['outputs'] = outputs
+            result['pdf_bytes'] = outputs.get('pdf', {}).get('bytes', 0)
+        missing = [r for r in results.values() if not r['success'] and not r['error']]
+        for result in missing:
+            result['error'] = proc.stderr[-500:] if proc.stderr else "Spec was not rendered"
+    except subprocess.TimeoutExpired:
+        for result in results.values():
+            if not result['success']:
+                result['error'] = f"Timeout after {TIMEOUT_SECONDS + len(spec_infos)}s"
+    except Exception as e:
+        for result in results.values():
+            result['error'] = str(e)
+
+    # Process start-up is shared; spread it evenly over the batch
+    overhead = (time.time() - start_time - sum(r['duration'] for r in results.values()))
+    for result in results.values():
+        result['duration'] += max(0.0, overhead) / len(results)
+    return list(results.values())
+
+
+def hash_outputs(script_path):
+    """SHA-256 of every PDF in a chart's folder"""
+    return {pdf.name: hashlib.sha256(pdf.read_bytes()).hexdigest()
+            for pdf in sorted(script_path.parent.glob("*.pdf"))}
+
+
+def check_determinism(scripts, sample_size):
+    """Build a sample of charts twice in deterministic mode and compare
+    output hashes. Each build runs on a copy of the chart's folder in a
+    temporary directory, so tracked PDFs are left alone. Returns the list of
+    (name, differing files)."""
+    global BUILD_DETERMINISTIC
+    BUILD_DETERMINISTIC = True
+
+    step = max(1, len(scripts) // max(1, sample_size))
+    sample = scripts[::step][:sample_size]
+    mismatches = []
+    with tempfile.TemporaryDirectory(prefix='chart_determinism_') as tmp:
+        for idx, script_info in enumerate(sample, 1):
+            source = script_info['script']
+            hashes = []
+            for build in ('a', 'b'):
+                folder = Path(tmp) / build / source.parent.relative_to(BASE_DIR)
+                shutil.copytree(source.parent, folder,
+                                ignore=shutil.ignore_patterns('*.pdf', '__pycache__'))
+                copy = dict(script_info, script=folder / source.name)
+                if copy.get('spec'):
+                    result = run_spec_batch([copy])[0]
+                else:
+                    result = run_chart_script(copy)
+                if not result['success']:
+                    break
+                hashes.append(hash_outputs(copy['script']))
+            if len(hashes) < 2:
+                status = "SKIP"
+            else:
+                differing = sorted(name for name in hashes[0]
+                                   if hashes[0][name] != hashes[1].get(name))
+                status = "DIFF" if differing else "SAME"
+                if differing:
+                    mismatches.append((script_info['name'], differing))
+            print(f"  [{idx:3d}/{len(sample)}] [{status}] {script_info['name']}")
+    return mismatches
+
+
+def run_batch_sequential(scripts, progress_callback=None, import_times=False):
+    """Run all scripts sequentially, then all specs in one batch"""
     results = []
-    total = len(scripts)
+    specs = [s for s in scripts if s.get('spec')]
+    scripts = [s for s in scripts if not s.get('spec')]
+    total = len(scripts) + len(specs)
 
     for idx, script_info in enumerate(scripts, 1):
         if progress_callback:
             progress_callback(idx, total, script_info['name'])
 
-        result = run_chart_script(script_info)
+        result = run_chart_script(script_info, import_times=import_times)
 
         # Retry on failure
         if not result['success'] and result['attempt'] < MAX_RETRIES:
             print(f"    Retrying {script_info['name']}...")
             time.sleep(1)
-            result = run_chart_script(script_info, attempt=result['attempt'] + 1)
+            result = run_chart_script(script_info, attempt=result['attempt'] + 1,
+                                      import_times=import_times)
 
         results.append(result)
 
         status = "OK" if result['success'] else "FAIL"
         duration = f"{result['duration']:.1f}s"
+        if 'import_time' in result:
+            duration += f", imports {result['import_time']:.2f}s"
         print(f"  [{idx:3d}/{total}] [{status:4s}] {script_info['name'][:40]:<40} ({duration})")
 
         if not result['success'] and result['error']:
             print(f"           Error: {result['error'][:60]}")
 
+    if specs:
+        spec_results = run_spec_batch(specs)
+        retry = [info for info, r in zip(specs, spec_results) if not r['success']]
+        if retry:
+            print(f"    Retrying {len(retry)} specs...")
+            retried = {r['script']: r for r in run_spec_batch(retry, attempt=2)}
+            spec_results = [retried.get(r['script'], r) for r in spec_results]
+
+        for idx, result in enumerate(spec_results, len(scripts) + 1):
+            results.append(result)
+            status = "OK" if result['success'] else "FAIL"
+            print(f"  [{idx:3d}/{total}] [{status:4s}] {result['name'][:40]:<40} "
+                  f"({result['duration']:.1f}s, spec)")
+            if not result['success'] and result['error']:
+                print(f"           Error: {result['error'][:60]}")
+
     return results
 
 
@@ -165,7 +433,7 @@ def verify_outputs(results):
     return verification
 
 
-def generate_report(results, verification, start_time, end_time, module_filter):
+def generate_report(results, verification, start_time, end_time, module_filter, fonts=None):
     """Generate execution report"""
     report = {
         'timestamp': datetime.now().isoformat(),
@@ -178,6 +446,36 @@ def generate_report(results, verification, start_time, end_time, module_filter):
         'errors': verification['errors'][:20]  # Limit error list
     }
 
+    if fonts:
+        report['fonts'] = fonts
+    report['pdf_bytes'] = {
+        'total': sum(r.get('pdf_bytes', 0) for r in results),
+        'charts': {r['name']: r.get('pdf_bytes', 0) for r in results},
+    }
+    formats = {}
+    for r in results:
+        for fmt, info in r.get('outputs', {}).items():
+            total = formats.setdefault(fmt, {'files': 0, 'bytes': 0, 'seconds': 0.0})
+            for key in total:
+                total[key] += info[key]
+    if formats:
+        report['formats'] = {fmt: {**info, 'seconds': round(info['seconds'], 3)}
+                             for fmt, info in formats.items()}
+    report['chart_seconds'] = {
+        'total': round(sum(r['duration'] for r in results), 3),
+        'mean': round(sum(r['duration'] for r in results) / max(1, len(results)), 3),
+    }
+
+    timed = [r for r in results if 'import_time' in r]
+    if timed:
+        report['import_times'] = {
+            'total_seconds': round(sum(r['import_time'] for r in timed), 3),
+            'mean_seconds': round(sum(r['import_time'] for r in timed) / len(timed), 3),
+            'charts': {r['name']: {'seconds': round(r['import_time'], 3),
+                                   'top': {k: round(v, 3) for k, v in r['imports'].items()}}
+                       for r in sorted(timed, key=lambda r: -r['import_time'])},
+        }
+
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     report_path = BASE_DIR / f"chart_generation_report_{timestamp}.json"
     with open(report_path, 'w') as f:
@@ -190,6 +488,17 @@ def main():
     parser = argparse.ArgumentParser(description='Generate Digital Finance charts')
     parser.add_argument('--module', type=str, help='Generate specific module only')
     parser.add_argument('--verify', action='store_true', help='Verify only, no generation')
+    parser.add_argument('--import-times', action='store_true',
+                        help='Run scripts with -X importtime and report import cost per chart')
+    parser.add_argument('--pdf-fonts', choices=['type3', 'type42', 'core14'],
+                        help='PDF font embedding for all charts (default: matplotlib setting)')
+    parser.add_argument('--formats', type=str,
+                        help='Comma-separated output formats for charts using save_chart '
+                             '(pdf, png, webp, svg); web formats go to docs/charts/')
+    parser.add_argument('--deterministic', action='store_true',
+                        help='Fixed dates, metadata and seeds so rebuilds are byte-identical')
+    parser.add_argument('--check-determinism', type=int, metavar='N',
+                        help='Build N sample charts twice (deterministic) and compare hashes')
     args = parser.parse_args()
 
     print("=" * 70)
@@ -205,7 +514,8 @@ def main():
     # Discover scripts
     print("\n[1/3] Discovering chart scripts...")
     scripts = discover_chart_scripts(args.module)
-    print(f"  Found {len(scripts)} chart scripts")
+    n_specs = sum(1 for s in scripts if s.get('spec'))
+    print(f"  Found {len(scripts) - n_specs} chart scripts, {n_specs} chart specs")
 
     # Group by module for display
     modules = {}
@@ -225,9 +535,30 @@ def main():
             print(f"  [{status}] {s['name']}")
         return 0
 
+    if args.check_determinism:
+        print(f"\n[DETERMINISM CHECK] Building {args.check_determinism} charts twice...")
+        mismatches = check_determinism(scripts, args.check_determinism)
+        if mismatches:
+            print(f"\nFAILED: {len(mismatches)} charts are not reproducible")
+            for name, files in mismatches:
+                print(f"  - {name}: {', '.join(files)}")
+            return 1
+        print("\nOK: all rebuilt charts are byte-identical")
+        return 0
+
+    global BUILD_FORMATS, BUILD_DETERMINISTIC
+    BUILD_DETERMINISTIC = args.deterministic
+    if args.formats:
+        BUILD_FORMATS = [f.strip() for f in args.formats.split(',') if f.strip()]
+
+    # Fonts: build the font cache once, before any chart process needs it
+    warm_seconds = configure_fonts(args.pdf_fonts)
+    fonts = {'embedding': args.pdf_fonts or 'default', 'warm_seconds': round(warm_seconds, 3)}
+    print(f"  Font cache warm ({warm_seconds:.2f}s), embedding: {fonts['embedding']}")
+
     # Execute
     print("\n[2/3] Generating charts (sequential mode)...")
-    results = run_batch_sequential(scripts)
+    results = run_batch_sequential(scripts, import_times=args.import_times)
 
     # Verify
     print("\n[3/3] Verification...")
@@ -244,8 +575,18 @@ def main():
     print(f"Failed:        {verification['failed']}")
     print(f"Success rate:  {verification['success']/max(1,verification['total'])*100:.1f}%")
     print(f"Duration:      {(end_time - start_time).total_seconds():.1f} seconds")
-
-    report, report_path = generate_report(results, verification, start_time, end_time, args.module)
+    timed = [r for r in results if 'import_time' in r]
+    if timed:
+        print(f"Import time:   {sum(r['import_time'] for r in timed):.1f} seconds "
+              f"({sum(r['import_time'] for r in timed) / len(timed):.2f} s per chart)")
+
+    print(f"PDF output:    {sum(r.get('pdf_bytes', 0) for r in results) / 1024 / 1024:.1f} MB")
+
+    report, report_path = generate_report(results, verification, start_time, end_time, args.module,
+                                          fonts)
+    for fmt, info in report.get('formats', {}).items():
+        print(f"  {fmt:5s} {info['files']:4d} files, {info['bytes'] / 1024:9.0f} KB, "
+              f"{info['seconds']:6.1f} s")
     print(f"\nReport saved: {report_path}")
 
     if verification['failed'] > 0:
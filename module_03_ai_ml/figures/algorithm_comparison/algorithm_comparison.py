@@ -8,6 +8,8 @@ Lesson: 29 - Algorithmic Trading Concepts
 """
 
 from pathlib import Path
+
+from charts._shared import cell_labels
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -68,12 +70,9 @@ def create_chart():
     ax2.set_xticklabels(use_cases, fontsize=9, rotation=30, ha='right')
     ax2.set_yticklabels([a.replace('\n', ' ') for a in algorithms], fontsize=9)
 
-    # Add text annotations
-    for i in range(len(algorithms)):
-        for j in range(len(use_cases)):
-            text_color = 'white' if suitability[i, j] < 50 or suitability[i, j] > 80 else 'black'
-            ax2.text(j, i, f'{suitability[i, j]}', ha='center', va='center',
-                    color=text_color, fontsize=9, fontweight='bold')
+    # Add text annotations (white outside the 50-80 band)
+    cell_labels(ax2, suitability, fmt='{}', colors=('white', 'black'), threshold=(50, 80),
+                fontsize=9, fontweight='bold')
 
     ax2.set_title('Algorithm Suitability by Use Case', fontsize=12, fontweight='bold')
 
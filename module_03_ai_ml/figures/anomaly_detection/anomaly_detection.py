@@ -8,6 +8,8 @@ Lesson: 31 - Fraud Detection
 """
 
 from pathlib import Path
+
+from charts._shared.data import transaction_stream
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -23,19 +25,14 @@ plt.rcParams.update({'font.size': 10, 'axes.labelsize': 10})
 def create_chart():
     fig, axes = plt.subplots(1, 2, figsize=(14, 6))
 
-    np.random.seed(42)
-
     # Scatter plot of transactions
     ax1 = axes[0]
 
-    # Normal transactions
-    normal_amount = np.random.lognormal(4, 0.8, 500)
-    normal_freq = np.random.poisson(5, 500)
-    normal_amount = np.clip(normal_amount, 0, 1000)
-
-    # Anomalous transactions
-    anomaly_amount = np.random.uniform(500, 2000, 20)
-    anomaly_freq = np.random.uniform(15, 30, 20)
+    # Normal (lognormal amounts) and anomalous transactions
+    tx = transaction_stream(n_normal=500, n_anomalies=20)
+    anomaly = tx['is_anomaly']
+    normal_amount, anomaly_amount = tx['amount'][~anomaly], tx['amount'][anomaly]
+    normal_freq, anomaly_freq = tx['frequency'][~anomaly], tx['frequency'][anomaly]
 
     ax1.scatter(normal_freq, normal_amount, c='#4A90E2', alpha=0.5, s=30, label='Normal')
     ax1.scatter(anomaly_freq, anomaly_amount, c='#D62728', alpha=0.8, s=100,
@@ -57,9 +54,10 @@ def create_chart():
     # Isolation Forest Score Distribution
     ax2 = axes[1]
 
-    # Generate anomaly scores
-    normal_scores = np.random.beta(2, 5, 1000) * 0.5
-    fraud_scores = np.random.beta(5, 2, 50) * 0.5 + 0.5
+    # Anomaly scores of a larger sample
+    scored = transaction_stream(n_normal=1000, n_anomalies=50)
+    normal_scores = scored['score'][~scored['is_anomaly']]
+    fraud_scores = scored['score'][scored['is_anomaly']]
 
     ax2.hist(normal_scores, bins=30, alpha=0.7, color='#4A90E2', label='Normal', density=True)
     ax2.hist(fraud_scores, bins=15, alpha=0.7, color='#D62728', label='Fraud', density=True)
@@ -1,6 +1,7 @@
 """
 Market Making and Bid-Ask Spread
-Visualization of market maker strategy
+Visualization of market maker strategy, with the quotes of an
+Avellaneda-Stoikov market maker backtested on simulated order flow
 
 Output: market_making_spread.pdf
 Module: module_03_ai_ml
@@ -8,6 +9,8 @@ Lesson: 29 - Algorithmic Trading Concepts
 """
 
 from pathlib import Path
+
+from charts._shared.data import market_making_backtest
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -23,15 +26,14 @@ plt.rcParams.update({'font.size': 10, 'axes.labelsize': 10})
 def create_chart():
     fig, axes = plt.subplots(1, 2, figsize=(14, 6))
 
-    np.random.seed(42)
-
-    # Bid-Ask Spread Visualization
+    # Bid-Ask Spread Visualization: 50 seconds of backtested quotes
     ax1 = axes[0]
+    session = market_making_backtest(gamma=0.01, half_spread=1.0, hours=6.5)
+    window = slice(3600, 3650)
     time = np.arange(50)
-    mid_price = 100 + np.cumsum(np.random.randn(50) * 0.2)
-    spread = 0.5 + np.abs(np.random.randn(50) * 0.1)
-    bid = mid_price - spread/2
-    ask = mid_price + spread/2
+    mid_price = session['mid'][window]
+    bid = session['bid'][window]
+    ask = session['ask'][window]
 
     ax1.fill_between(time, bid, ask, alpha=0.3, color='#4A90E2', label='Spread')
     ax1.plot(time, mid_price, 'k-', linewidth=2, label='Mid Price')
@@ -39,10 +41,10 @@ def create_chart():
     ax1.plot(time, ask, 'r-', linewidth=1.5, label='Ask (Sell)')
 
     ax1.annotate('Profit = Spread', xy=(25, mid_price[25]),
-                xytext=(30, mid_price[25]+1.5), fontsize=10, fontweight='bold',
+                xytext=(30, ask.max()), fontsize=10, fontweight='bold',
                 arrowprops=dict(arrowstyle='->', color='black'))
 
-    ax1.set_xlabel('Time', fontsize=11)
+    ax1.set_xlabel('Time (seconds)', fontsize=11)
     ax1.set_ylabel('Price ($)', fontsize=11)
     ax1.set_title('Bid-Ask Spread: Market Maker Profit Zone', fontsize=12, fontweight='bold')
     ax1.legend(loc='upper left', fontsize=9)
@@ -76,7 +78,7 @@ def create_chart():
                 arrowprops=dict(arrowstyle='->', color='#4A90E2'))
 
     fig.suptitle('Market Making Strategy: Capturing the Spread', fontsize=14, fontweight='bold', y=1.02)
-    fig.text(0.98, 0.02, '[SYNTHETIC DATA]', fontsize=7, color='#999999', ha='right', style='italic')
+    fig.text(0.98, 0.02, '[SYNTHETIC DATA - quotes from Avellaneda-Stoikov backtest]', fontsize=7, color='#999999', ha='right', style='italic')
     plt.tight_layout()
 
     output_path = Path(__file__).parent / 'market_making_spread.pdf'
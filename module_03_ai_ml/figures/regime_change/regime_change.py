@@ -8,6 +8,8 @@ Lesson: 34 - Prediction Limitations
 """
 
 from pathlib import Path
+
+from charts._shared.data import regime_switching_returns
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -23,39 +25,27 @@ plt.rcParams.update({'font.size': 10, 'axes.labelsize': 10})
 def create_chart():
     fig, axes = plt.subplots(2, 1, figsize=(14, 8), height_ratios=[1.5, 1])
 
-    np.random.seed(42)
-
     # Market regimes
     ax1 = axes[0]
 
     days = np.arange(0, 500)
 
-    # Generate price with different regimes
-    price = [100]
-    regimes = []
-    for i in range(1, 500):
-        if i < 150:  # Bull market
-            ret = np.random.normal(0.001, 0.01)
-            regimes.append('Bull')
-        elif i < 250:  # High volatility
-            ret = np.random.normal(0, 0.025)
-            regimes.append('Crisis')
-        elif i < 400:  # Range-bound
-            ret = np.random.normal(0, 0.008)
-            regimes.append('Sideways')
-        else:  # Recovery
-            ret = np.random.normal(0.0008, 0.012)
-            regimes.append('Recovery')
-        price.append(price[-1] * (1 + ret))
-    regimes.insert(0, 'Bull')
+    # Generate price with different regimes: (days, mean return, volatility)
+    market = regime_switching_returns([
+        (150, 0.001, 0.01),    # Bull market
+        (100, 0, 0.025),       # High volatility
+        (150, 0, 0.008),       # Range-bound
+        (99, 0.0008, 0.012),   # Recovery
+    ])
+    price = market['prices']
+    regimes = np.concatenate([[0], market['regime']])
 
     ax1.plot(days, price, 'k-', linewidth=1.5)
 
     # Color regimes
     regime_colors = {'Bull': '#44A044', 'Crisis': '#D62728', 'Sideways': '#888888', 'Recovery': '#4A90E2'}
-    for regime, color in regime_colors.items():
-        mask = np.array(regimes) == regime
-        ax1.fill_between(days, min(price)*0.9, max(price)*1.1, where=mask,
+    for idx, (regime, color) in enumerate(regime_colors.items()):
+        ax1.fill_between(days, price.min()*0.9, price.max()*1.1, where=regimes == idx,
                         alpha=0.2, color=color, label=regime)
 
     ax1.set_ylabel('Price', fontsize=11)
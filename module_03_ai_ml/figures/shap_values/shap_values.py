@@ -8,6 +8,8 @@ Lesson: 35 - Explainability
 """
 
 from pathlib import Path
+
+from charts._shared.data import credit_portfolio
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -23,8 +25,6 @@ plt.rcParams.update({'font.size': 10, 'axes.labelsize': 10})
 def create_chart():
     fig, axes = plt.subplots(1, 2, figsize=(14, 7))
 
-    np.random.seed(42)
-
     # SHAP Summary Plot (simulated)
     ax1 = axes[0]
 
@@ -32,20 +32,16 @@ def create_chart():
                 'Account Age', 'Number of Inquiries', 'Annual Income',
                 'Employment Length', 'Loan Amount']
 
-    # Generate SHAP-like values for each feature
+    # Logistic credit model: exact SHAP values per borrower and feature
     n_samples = 100
-    shap_data = {}
-    feature_values = {}
-
-    for feat in features:
-        shap_data[feat] = np.random.randn(n_samples) * np.random.uniform(0.1, 0.5)
-        feature_values[feat] = np.random.uniform(0, 1, n_samples)
+    portfolio = credit_portfolio(n_borrowers=n_samples, n_features=len(features),
+                                 coef_range=(0.3, 1.5))
 
     # Plot as beeswarm-like
-    for i, feat in enumerate(features):
-        y = np.ones(n_samples) * i + np.random.randn(n_samples) * 0.15
-        colors = plt.cm.RdYlBu_r(feature_values[feat])
-        ax1.scatter(shap_data[feat], y, c=colors, s=15, alpha=0.6)
+    jitter = np.random.default_rng(42).standard_normal((n_samples, len(features))) * 0.15
+    y = np.arange(len(features)) + jitter
+    colors = plt.cm.RdYlBu_r(portfolio['features'].ravel())
+    ax1.scatter(portfolio['shap'].ravel(), y.ravel(), c=colors, s=15, alpha=0.6)
 
     ax1.axvline(x=0, color='gray', linewidth=1)
     ax1.set_yticks(range(len(features)))
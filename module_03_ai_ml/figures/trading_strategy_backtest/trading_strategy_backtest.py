@@ -8,6 +8,8 @@ Lesson: 29 - Algorithmic Trading Concepts
 """
 
 from pathlib import Path
+
+from charts._shared.data import cumulative_returns
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -23,14 +25,18 @@ plt.rcParams.update({'font.size': 10, 'axes.labelsize': 10})
 def create_chart():
     fig, axes = plt.subplots(1, 2, figsize=(14, 6))
 
-    np.random.seed(42)
     days = np.arange(252)  # One trading year
 
-    # Cumulative returns
+    # Performance metrics (the paths below realize these annual returns)
+    strategies = ['Benchmark', 'ML Strategy', 'Momentum']
+    sharpe = [0.95, 1.45, 1.15]
+    max_dd = [-0.18, -0.12, -0.15]
+    annual_ret = [0.12, 0.18, 0.14]
+
+    # Cumulative returns: ML ahead of momentum ahead of the benchmark by drift
     ax1 = axes[0]
-    benchmark = np.cumsum(np.random.randn(252) * 0.01)
-    ml_strategy = np.cumsum(np.random.randn(252) * 0.012 + 0.0005)
-    momentum = np.cumsum(np.random.randn(252) * 0.011 + 0.0003)
+    benchmark, ml_strategy, momentum = cumulative_returns(
+        252, drift=np.array(annual_ret) / 252, vol=[0.01, 0.012, 0.011], exact_drift=True).T
 
     ax1.plot(days, benchmark * 100, 'k-', linewidth=2, label='S&P 500 Benchmark')
     ax1.plot(days, ml_strategy * 100, 'b-', linewidth=2, label='ML Strategy')
@@ -45,11 +51,6 @@ def create_chart():
 
     # Performance metrics
     ax2 = axes[1]
-    strategies = ['Benchmark', 'ML Strategy', 'Momentum']
-    sharpe = [0.95, 1.45, 1.15]
-    max_dd = [-0.18, -0.12, -0.15]
-    annual_ret = [0.12, 0.18, 0.14]
-
     x = np.arange(len(strategies))
     width = 0.25
 
@@ -0,0 +1,83 @@
+"""
+Latency Race by Speed Tier
+Why microseconds matter: how often each speed tier wins the race to pick off
+stale quotes after news, and how often its own quotes get picked off
+
+Output: latency_race_tiers.pdf
+Module: module_04_traditional
+Lesson: 40 - Electronic Trading
+"""
+
+from pathlib import Path
+
+from charts._shared.data import latency_race
+import matplotlib.pyplot as plt
+import numpy as np
+
+plt.rcParams.update({
+    'font.size': 10,
+    'axes.labelsize': 10,
+    'axes.titlesize': 11,
+    'xtick.labelsize': 9,
+    'ytick.labelsize': 9,
+    'legend.fontsize': 9,
+    'figure.figsize': (10, 6),
+    'figure.dpi': 150
+})
+
+MLPURPLE = '#3333B2'
+MLBLUE = '#0066CC'
+MLORANGE = '#FF7F0E'
+MLGREEN = '#2CA02C'
+MLRED = '#D62728'
+
+def create_chart():
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    # Latency race Monte Carlo: firms race to pick off stale quotes after news
+    race = latency_race(n_runs=20, duration=600.0)
+    labels = []
+    for tier, latency in zip(race['tier'], race['latency'][0]):
+        speed = f'{latency * 1e6:.0f}μs' if latency < 1e-3 else f'{latency * 1e3:.0f}ms'
+        labels.append(f'{tier.capitalize()}\n{speed}')
+    fill_rate = np.nanmean(race['snipe_fill_rate'], axis=0) * 100
+    sniped = np.nanmean(race['sniped_share'], axis=0) * 100
+    x = np.arange(len(labels))
+    width = 0.38
+
+    ax.bar(x - width / 2, fill_rate, width, color=MLGREEN,
+           label='Snipe fill rate (own IOC orders)')
+    ax.bar(x + width / 2, sniped, width, color=MLRED,
+           label='Own quotes picked off (% of passive fills)')
+    for xi, value in zip(x, fill_rate):
+        ax.text(xi - width / 2, value + 1.5, f'{value:.0f}%', ha='center', fontsize=9)
+    for xi, value in zip(x, sniped):
+        ax.text(xi + width / 2, value + 1.5, f'{value:.0f}%', ha='center', fontsize=9)
+
+    ax.set_xticks(x)
+    ax.set_xticklabels(labels)
+    ax.set_xlabel('Speed tier (one-way latency)', fontsize=11)
+    ax.set_ylabel('Share (%)', fontsize=11)
+    ax.set_ylim(0, 115)
+    ax.set_title('Simulated Latency Race by Speed Tier', fontsize=14,
+                 fontweight='bold', color=MLPURPLE, pad=10)
+    ax.legend(loc='upper left', framealpha=0.9)
+    ax.grid(True, alpha=0.3, axis='y')
+
+    # Remove top and right spines
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+
+    fig.text(0.98, 0.02, '[SYNTHETIC DATA - Simulated latency race]',
+             fontsize=7, color='#999999', ha='right', style='italic')
+
+    plt.tight_layout()
+
+    output_path = Path(__file__).parent / 'latency_race_tiers.pdf'
+    plt.savefig(output_path, format='pdf', dpi=300, bbox_inches='tight')
+    plt.close()
+    print(f"Chart saved to: {output_path}")
+    return output_path
+
+if __name__ == '__main__':
+    create_chart()
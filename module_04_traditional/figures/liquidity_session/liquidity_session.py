@@ -0,0 +1,77 @@
+"""
+Rolling Liquidity in a Simulated Session
+How quoted spread, depth, Kyle's lambda and Amihud illiquidity move within a
+simulated trading session, each indexed to its session average
+
+Output: liquidity_session.pdf
+Module: module_04_traditional
+Lesson: 41 - Market Microstructure
+"""
+
+from pathlib import Path
+
+from charts._shared.data import session_liquidity
+import matplotlib.pyplot as plt
+import numpy as np
+
+plt.rcParams.update({
+    'font.size': 10,
+    'axes.labelsize': 10,
+    'axes.titlesize': 11,
+    'xtick.labelsize': 9,
+    'ytick.labelsize': 9,
+    'legend.fontsize': 9,
+    'figure.figsize': (10, 6),
+    'figure.dpi': 150
+})
+
+MLPURPLE = '#3333B2'
+MLBLUE = '#0066CC'
+MLORANGE = '#FF7F0E'
+MLGREEN = '#2CA02C'
+MLRED = '#D62728'
+
+def create_chart():
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    # 5-minute rolling metrics, one point per 10 s, indexed to their
+    # session average (= 100)
+    session = session_liquidity(hours=1.0, window=300.0, every=10.0)
+    warm = session['time'] >= 300.0
+    minutes = session['time'][warm] / 60
+    metrics = [
+        ('quoted_spread', 'Quoted spread', MLBLUE),
+        ('depth', 'Depth within 10 bps', MLORANGE),
+        ("kyle_lambda", "Kyle's lambda (price impact)", MLGREEN),
+        ('amihud', 'Amihud illiquidity', MLRED),
+    ]
+    for field, label, color in metrics:
+        values = session[field][warm]
+        ax.plot(minutes, values / np.nanmean(values) * 100, color=color, linewidth=1.8,
+                label=label)
+    ax.axhline(y=100, color='gray', linewidth=0.8, linestyle=':')
+
+    ax.set_xlabel('Minutes into session', fontsize=11)
+    ax.set_ylabel('Index (session average = 100)', fontsize=11)
+    ax.set_title('Rolling Liquidity in a Simulated Session', fontsize=14,
+                 fontweight='bold', color=MLPURPLE, pad=10)
+    ax.legend(loc='upper right', framealpha=0.9)
+    ax.grid(True, alpha=0.3)
+
+    # Remove top and right spines
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+
+    fig.text(0.98, 0.02, '[SYNTHETIC DATA - Simulated order flow]',
+             fontsize=7, color='#999999', ha='right', style='italic')
+
+    plt.tight_layout()
+
+    output_path = Path(__file__).parent / 'liquidity_session.pdf'
+    plt.savefig(output_path, format='pdf', dpi=300, bbox_inches='tight')
+    plt.close()
+    print(f"Chart saved to: {output_path}")
+    return output_path
+
+if __name__ == '__main__':
+    create_chart()
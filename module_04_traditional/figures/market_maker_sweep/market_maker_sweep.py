@@ -0,0 +1,67 @@
+"""
+Market Maker Parameter Sweep
+How risk aversion and the quoted spread trade off for an Avellaneda-Stoikov
+market maker: Sharpe ratio per session over a grid of both, backtested on
+simulated order flow
+
+Output: market_maker_sweep.pdf
+Module: module_04_traditional
+Lesson: 40 - Electronic Trading
+"""
+
+from pathlib import Path
+
+from charts._shared.data import market_making_sweep
+import matplotlib.pyplot as plt
+import numpy as np
+
+plt.rcParams.update({
+    'font.size': 10,
+    'axes.labelsize': 10,
+    'axes.titlesize': 11,
+    'xtick.labelsize': 9,
+    'ytick.labelsize': 9,
+    'legend.fontsize': 9,
+    'figure.figsize': (10, 6),
+    'figure.dpi': 150
+})
+
+MLPURPLE = '#3333B2'
+MLBLUE = '#0066CC'
+MLORANGE = '#FF7F0E'
+MLGREEN = '#2CA02C'
+MLRED = '#D62728'
+
+def create_chart():
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    # Parameter sweep: Sharpe ratio per session, averaged over sessions
+    sweep = market_making_sweep()
+    sharpe = np.nanmean(sweep['sharpe'], axis=0)
+    image = ax.imshow(sharpe, cmap='Greens', aspect='auto', origin='lower')
+    for (i, j), value in np.ndenumerate(sharpe):
+        ax.text(j, i, f'{value:.1f}', ha='center', va='center', fontsize=10,
+                color='white' if value > 0.6 * np.nanmax(sharpe) else 'black')
+    ax.set_xticks(range(len(sweep['half_spread'])))
+    ax.set_xticklabels([f'{h:g}' for h in sweep['half_spread']])
+    ax.set_yticks(range(len(sweep['gamma'])))
+    ax.set_yticklabels([f'{g:g}' for g in sweep['gamma']])
+    ax.set_xlabel('Extra Half-Spread (ticks)', fontsize=11)
+    ax.set_ylabel('Risk Aversion (gamma)', fontsize=11)
+    ax.set_title('Sharpe Ratio by Risk Aversion and Spread', fontsize=14,
+                 fontweight='bold', color=MLPURPLE, pad=10)
+    fig.colorbar(image, ax=ax, label='Sharpe Ratio per Session')
+
+    fig.text(0.98, 0.02, '[SYNTHETIC DATA - Avellaneda-Stoikov backtest on simulated order flow]',
+             fontsize=7, color='#999999', ha='right', style='italic')
+
+    plt.tight_layout()
+
+    output_path = Path(__file__).parent / 'market_maker_sweep.pdf'
+    plt.savefig(output_path, format='pdf', dpi=300, bbox_inches='tight')
+    plt.close()
+    print(f"Chart saved to: {output_path}")
+    return output_path
+
+if __name__ == '__main__':
+    create_chart()
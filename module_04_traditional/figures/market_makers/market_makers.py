@@ -1,6 +1,7 @@
 """
 Market Maker Economics
-Shows bid-ask spread profit and inventory risk
+Shows bid-ask spread profit and inventory risk of an Avellaneda-Stoikov
+market maker backtested on simulated order flow
 
 Output: market_makers.pdf
 Module: module_04_traditional
@@ -8,8 +9,9 @@ Lesson: 41 - Market Microstructure
 """
 
 from pathlib import Path
+
+from charts._shared.data import market_making_backtest
 import matplotlib.pyplot as plt
-import numpy as np
 
 plt.rcParams.update({
     'font.size': 10,
@@ -31,15 +33,14 @@ MLRED = '#D62728'
 def create_chart():
     fig, ax = plt.subplots(figsize=(10, 6))
 
-    np.random.seed(42)
-
-    # Simulated market maker P&L over a trading day (minutes)
-    minutes = np.arange(0, 390)  # 6.5 hours
+    # Backtested market maker P&L over a simulated trading day, per minute
+    session = market_making_backtest(gamma=0.01, half_spread=1.0, hours=6.5)
+    minutes = session['time'][::60] / 60  # 6.5 hours
 
-    # Spread capture (positive) vs inventory risk (volatile)
-    spread_pnl = np.cumsum(np.random.uniform(0.5, 1.5, len(minutes)))  # Consistent small gains
-    inventory_pnl = np.cumsum(np.random.normal(0, 5, len(minutes)))  # Volatile
-    total_pnl = spread_pnl + inventory_pnl
+    # Spread capture (steady gains) vs inventory P&L (volatile)
+    spread_pnl = session['spread_pnl'][::60]
+    inventory_pnl = session['inventory_pnl'][::60]
+    total_pnl = session['pnl'][::60]
 
     ax.plot(minutes, spread_pnl, color=MLGREEN, linewidth=2, label='Spread Capture')
     ax.plot(minutes, inventory_pnl, color=MLRED, linewidth=2, alpha=0.7, label='Inventory P&L')
@@ -58,10 +59,11 @@ def create_chart():
     ax.set_xticks([0, 60, 120, 180, 240, 300, 360])
     ax.set_xticklabels(['9:30', '10:30', '11:30', '12:30', '13:30', '14:30', '15:30'])
 
+    # Remove top and right spines
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
 
-    fig.text(0.98, 0.02, '[SYNTHETIC DATA - Monte Carlo simulation]',
+    fig.text(0.98, 0.02, '[SYNTHETIC DATA - Avellaneda-Stoikov backtest on simulated order flow]',
              fontsize=7, color='#999999', ha='right', style='italic')
 
     plt.tight_layout()
@@ -8,26 +8,14 @@ Lesson: 45 - Derivatives Technology
 """
 
 from pathlib import Path
+
+from charts._shared import (MLPURPLE, MLBLUE, MLORANGE, MLGREEN, chart_style, save_chart,
+                            distribution)
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.stats import norm
-
-plt.rcParams.update({
-    'font.size': 10,
-    'axes.labelsize': 10,
-    'axes.titlesize': 11,
-    'xtick.labelsize': 9,
-    'ytick.labelsize': 9,
-    'legend.fontsize': 9,
-    'figure.figsize': (10, 6),
-    'figure.dpi': 150
-})
-
-MLPURPLE = '#3333B2'
-MLBLUE = '#0066CC'
-MLORANGE = '#FF7F0E'
-MLGREEN = '#2CA02C'
 
+
+@chart_style('lesson')
 def create_chart():
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 5))
 
@@ -43,6 +31,7 @@ def create_chart():
     d1 = (np.log(S/K) + (r + 0.5*sigma**2)*T) / (sigma*np.sqrt(T))
 
     # Delta for call option
+    norm = distribution('norm')
     delta_call = norm.cdf(d1)
 
     # Gamma (same for call and put)
@@ -81,8 +70,8 @@ def create_chart():
     plt.tight_layout()
 
     output_path = Path(__file__).parent / 'option_greeks.pdf'
-    plt.savefig(output_path, format='pdf', dpi=300, bbox_inches='tight')
-    plt.close()
+    save_chart(fig, output_path)
+    plt.close(fig)
     print(f"Chart saved to: {output_path}")
     return output_path
 
@@ -1,6 +1,7 @@
 """
 Order Book Visualization
-Shows bid and ask orders in a limit order book
+Shows bid and ask orders in a limit order book: the closing snapshot of a
+simulated session and the range of depth over its 1-minute snapshots
 
 Output: order_book.pdf
 Module: module_04_traditional
@@ -8,6 +9,8 @@ Lesson: 40 - Electronic Trading
 """
 
 from pathlib import Path
+
+from charts._shared.data import book_depth
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -31,30 +34,36 @@ MLRED = '#D62728'
 def create_chart():
     fig, ax = plt.subplots(figsize=(10, 6))
 
-    # Simulated order book for a stock at ~$100
-    bid_prices = [99.95, 99.90, 99.85, 99.80, 99.75, 99.70, 99.65, 99.60]
-    bid_volumes = [500, 1200, 800, 2500, 1800, 3200, 1500, 2000]
-
-    ask_prices = [100.00, 100.05, 100.10, 100.15, 100.20, 100.25, 100.30, 100.35]
-    ask_volumes = [400, 900, 1500, 2100, 1200, 2800, 1900, 2500]
+    # Simulated session of a stock at ~$100, one book snapshot per minute
+    book = book_depth(hours=1.0, every=60.0)
+    bid_prices = book['bid_prices'][-1]
+    ask_prices = book['ask_prices'][-1]
 
-    # Cumulative volumes for depth chart
-    bid_cumulative = np.cumsum(bid_volumes)
-    ask_cumulative = np.cumsum(ask_volumes)
+    # Cumulative volumes for depth chart: closing snapshot, and the 10th-90th
+    # percentile of each level's cumulative volume over the session
+    bid_cumulative = np.cumsum(book['bid_sizes'][-1])
+    ask_cumulative = np.cumsum(book['ask_sizes'][-1])
+    bid_low, bid_high = np.percentile(np.cumsum(book['bid_sizes'], axis=1), [10, 90], axis=0)
+    ask_low, ask_high = np.percentile(np.cumsum(book['ask_sizes'], axis=1), [10, 90], axis=0)
 
     # Plot bid side (green, left)
     ax.fill_betweenx(bid_prices, 0, bid_cumulative, color=MLGREEN, alpha=0.4, step='post')
+    ax.fill_betweenx(bid_prices, bid_low, bid_high, color=MLGREEN, alpha=0.15, step='post',
+                     label='Bid depth range (10th-90th pct)')
     ax.step(bid_cumulative, bid_prices, where='post', color=MLGREEN, linewidth=2, label='Bids')
 
     # Plot ask side (red, right)
-    ax.fill_betweenx(ask_prices, 0, -np.array(ask_cumulative), color=MLRED, alpha=0.4, step='post')
-    ax.step(-np.array(ask_cumulative), ask_prices, where='post', color=MLRED, linewidth=2, label='Asks')
+    ax.fill_betweenx(ask_prices, 0, -ask_cumulative, color=MLRED, alpha=0.4, step='post')
+    ax.fill_betweenx(ask_prices, -ask_low, -ask_high, color=MLRED, alpha=0.15, step='post',
+                     label='Ask depth range (10th-90th pct)')
+    ax.step(-ask_cumulative, ask_prices, where='post', color=MLRED, linewidth=2, label='Asks')
 
     # Add spread annotation
     spread = ask_prices[0] - bid_prices[0]
     ax.axhline(y=bid_prices[0], color=MLGREEN, linestyle='--', alpha=0.5)
     ax.axhline(y=ask_prices[0], color=MLRED, linestyle='--', alpha=0.5)
-    ax.annotate(f'Spread: ${spread:.2f}', xy=(0, 99.975), fontsize=10, ha='center',
+    ax.annotate(f'Spread: ${spread:.2f}', xy=(0, (bid_prices[0] + ask_prices[0]) / 2),
+                fontsize=10, ha='center',
                 bbox=dict(boxstyle='round', facecolor='white', edgecolor='gray'))
 
     ax.set_xlabel('Cumulative Volume (shares)', fontsize=11)
@@ -62,15 +71,16 @@ def create_chart():
     ax.set_title('Limit Order Book Depth', fontsize=14, fontweight='bold',
                  color=MLPURPLE, pad=10)
 
-    ax.legend(loc='lower right', framealpha=0.9)
+    ax.legend(loc='upper right', framealpha=0.9)
     ax.axvline(x=0, color='gray', linewidth=0.5)
-    ax.set_xlim(-15000, 15000)
+    limit = max(bid_high[-1], ask_high[-1]) * 1.1
+    ax.set_xlim(-limit, limit)
 
     # Remove top and right spines
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
 
-    fig.text(0.98, 0.02, '[SYNTHETIC DATA - Illustrative order book]',
+    fig.text(0.98, 0.02, '[SYNTHETIC DATA - Simulated order flow]',
              fontsize=7, color='#999999', ha='right', style='italic')
 
     plt.tight_layout()
@@ -0,0 +1,80 @@
+"""
+Smart Order Routing: Lit vs Dark
+What routing part of each parent order to a midpoint dark pool saves in a
+simulated market, and how much of it actually fills in the dark
+
+Output: smart_order_routing.pdf
+Module: module_04_traditional
+Lesson: 37 - Financial Markets
+"""
+
+from pathlib import Path
+
+from charts._shared.data import dark_routing
+import matplotlib.pyplot as plt
+import numpy as np
+
+plt.rcParams.update({
+    'font.size': 10,
+    'axes.labelsize': 10,
+    'axes.titlesize': 11,
+    'xtick.labelsize': 9,
+    'ytick.labelsize': 9,
+    'legend.fontsize': 9,
+    'figure.figsize': (10, 6),
+    'figure.dpi': 150
+})
+
+MLPURPLE = '#3333B2'
+MLBLUE = '#0066CC'
+MLORANGE = '#FF7F0E'
+MLGREEN = '#2CA02C'
+MLRED = '#D62728'
+
+def create_chart():
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    # Smart order routing: share of each parent order offered to the dark pool
+    routing = dark_routing(n_parents=1000)
+    fractions = routing['dark_fraction'] * 100
+    x = np.arange(len(fractions))
+    bars = ax.bar(x, routing['cost_bps'], 0.6, color=MLBLUE,
+                  label='Execution cost vs arrival mid')
+    for bar, cost in zip(bars, routing['cost_bps']):
+        ax.text(bar.get_x() + bar.get_width() / 2, cost + 0.05, f'{cost:.2f}',
+                ha='center', fontsize=9)
+    ax.set_xticks(x)
+    ax.set_xticklabels([f'{f:.0f}%' for f in fractions])
+    ax.set_xlabel('Share of Parent Order Offered to Dark Pool', fontsize=11)
+    ax.set_ylabel('Execution Cost (basis points)', fontsize=11)
+    ax.set_ylim(0, routing['cost_bps'].max() * 1.25)
+
+    ax2 = ax.twinx()
+    ax2.plot(x, routing['dark_share'] * 100, 'o-', color=MLORANGE, linewidth=2,
+             markersize=7, label='Filled in dark pool')
+    ax2.set_ylabel('Filled in Dark Pool (%)', fontsize=11, color=MLORANGE)
+    ax2.set_ylim(0, 100)
+    ax2.spines['top'].set_visible(False)
+
+    handles = ax.get_legend_handles_labels()[0] + ax2.get_legend_handles_labels()[0]
+    ax.legend(handles, [h.get_label() for h in handles], loc='upper right', framealpha=0.9)
+    ax.set_title('Smart Order Routing: Lit vs Dark (Simulated)', fontsize=14,
+                 fontweight='bold', color=MLPURPLE, pad=10)
+    ax.grid(True, alpha=0.3, axis='y')
+
+    # Remove top spine
+    ax.spines['top'].set_visible(False)
+
+    fig.text(0.98, 0.02, '[SYNTHETIC DATA - Simulated order flow]',
+             fontsize=7, color='#999999', ha='right', style='italic')
+
+    plt.tight_layout()
+
+    output_path = Path(__file__).parent / 'smart_order_routing.pdf'
+    plt.savefig(output_path, format='pdf', dpi=300, bbox_inches='tight')
+    plt.close()
+    print(f"Chart saved to: {output_path}")
+    return output_path
+
+if __name__ == '__main__':
+    create_chart()
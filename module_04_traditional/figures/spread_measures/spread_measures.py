@@ -0,0 +1,74 @@
+"""
+Spread Measures in a Simulated Session
+Quoted, effective and realized spread of a simulated trading session, with
+the price impact between effective and realized spread
+
+Output: spread_measures.pdf
+Module: module_04_traditional
+Lesson: 41 - Market Microstructure
+"""
+
+from pathlib import Path
+
+from charts._shared.data import session_liquidity
+import matplotlib.pyplot as plt
+
+plt.rcParams.update({
+    'font.size': 10,
+    'axes.labelsize': 10,
+    'axes.titlesize': 11,
+    'xtick.labelsize': 9,
+    'ytick.labelsize': 9,
+    'legend.fontsize': 9,
+    'figure.figsize': (10, 6),
+    'figure.dpi': 150
+})
+
+MLPURPLE = '#3333B2'
+MLBLUE = '#0066CC'
+MLORANGE = '#FF7F0E'
+MLGREEN = '#2CA02C'
+MLRED = '#D62728'
+
+def create_chart():
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    # 5-minute rolling spread measures, one point per 10 s of the session
+    session = session_liquidity(hours=1.0, window=300.0, every=10.0)
+    warm = session['time'] >= 300.0
+    minutes = session['time'][warm] / 60
+    ax.plot(minutes, session['quoted_spread'][warm], color=MLBLUE, linewidth=2,
+            label='Quoted spread')
+    ax.plot(minutes, session['effective_spread'][warm], color=MLORANGE, linewidth=2,
+            label='Effective spread')
+    ax.plot(minutes, session['realized_spread'][warm], color=MLGREEN, linewidth=2,
+            linestyle='--', label='Realized spread (5 s)')
+    ax.fill_between(minutes, session['realized_spread'][warm],
+                    session['effective_spread'][warm], color=MLRED, alpha=0.12,
+                    label='Price impact')
+
+    ax.set_xlabel('Minutes into session', fontsize=11)
+    ax.set_ylabel('Spread (basis points, 5-min rolling)', fontsize=11)
+    ax.set_title('Spread Measures in a Simulated Session', fontsize=14,
+                 fontweight='bold', color=MLPURPLE, pad=10)
+    ax.set_ylim(bottom=0)
+    ax.legend(loc='lower right', framealpha=0.9)
+    ax.grid(True, alpha=0.3)
+
+    # Remove top and right spines
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+
+    fig.text(0.98, 0.02, '[SYNTHETIC DATA - Simulated order flow]',
+             fontsize=7, color='#999999', ha='right', style='italic')
+
+    plt.tight_layout()
+
+    output_path = Path(__file__).parent / 'spread_measures.pdf'
+    plt.savefig(output_path, format='pdf', dpi=300, bbox_inches='tight')
+    plt.close()
+    print(f"Chart saved to: {output_path}")
+    return output_path
+
+if __name__ == '__main__':
+    create_chart()
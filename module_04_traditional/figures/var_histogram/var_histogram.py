@@ -8,27 +8,14 @@ Lesson: 42 - Risk Management
 """
 
 from pathlib import Path
+
+from charts._shared import (MLPURPLE, MLBLUE, MLORANGE, MLGREEN, MLRED, chart_style, save_chart,
+                            distribution)
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy import stats
-
-plt.rcParams.update({
-    'font.size': 10,
-    'axes.labelsize': 10,
-    'axes.titlesize': 11,
-    'xtick.labelsize': 9,
-    'ytick.labelsize': 9,
-    'legend.fontsize': 9,
-    'figure.figsize': (10, 6),
-    'figure.dpi': 150
-})
-
-MLPURPLE = '#3333B2'
-MLBLUE = '#0066CC'
-MLORANGE = '#FF7F0E'
-MLGREEN = '#2CA02C'
-MLRED = '#D62728'
 
+
+@chart_style('lesson')
 def create_chart():
     fig, ax = plt.subplots(figsize=(10, 6))
 
@@ -59,7 +46,7 @@ def create_chart():
 
     # Add normal distribution overlay
     x = np.linspace(-6, 6, 100)
-    ax.plot(x, stats.norm.pdf(x, 0.05, 1.5), color=MLPURPLE, linewidth=2,
+    ax.plot(x, distribution('norm', 0.05, 1.5).pdf(x), color=MLPURPLE, linewidth=2,
             linestyle=':', label='Normal Distribution')
 
     ax.set_xlabel('Daily Return (%)', fontsize=11)
@@ -84,8 +71,8 @@ def create_chart():
     plt.tight_layout()
 
     output_path = Path(__file__).parent / 'var_histogram.pdf'
-    plt.savefig(output_path, format='pdf', dpi=300, bbox_inches='tight')
-    plt.close()
+    save_chart(fig, output_path)
+    plt.close(fig)
     print(f"Chart saved to: {output_path}")
     return output_path
 
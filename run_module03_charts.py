@@ -2,6 +2,7 @@
 Run all Module 03 chart scripts to generate PDFs
 """
 
+import os
 import subprocess
 import sys
 from pathlib import Path
@@ -18,6 +19,11 @@ def run_all_charts():
     print(f"Found {len(chart_folders)} chart folders in module_03_ai_ml")
     print("=" * 60)
 
+    # Charts import the charts package from the repository root
+    env = os.environ.copy()
+    env['PYTHONPATH'] = os.pathsep.join(
+        [str(Path(__file__).parent)] + [p for p in env.get('PYTHONPATH', '').split(os.pathsep) if p])
+
     success = 0
     failed = 0
 
@@ -31,7 +37,8 @@ def run_all_charts():
                     capture_output=True,
                     text=True,
                     timeout=60,
-                    cwd=str(folder)
+                    cwd=str(folder),
+                    env=env
                 )
                 if result.returncode == 0:
                     print("OK")